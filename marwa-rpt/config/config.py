@@ -21,12 +21,17 @@ Read settings out of strings files and return dictionary objects.
         2.3.0.1 - 01/27/2020 - Added production variable.
         2.4.0.0 - 02/13/2020 - Moved system settings to unified .env file.
         2.4.0.1 - 03/09/2020 - Updated to database-driven configuration format.
+        2.4.1.0 - 10/17/2026 - Added optional maximum queue check interval used when the queues are idle.
+        2.4.2.0 - 10/17/2026 - Added optional minimum worker count and worker memory limit.
+        2.4.3.0 - 10/17/2026 - Added optional base job timeout.
+        2.4.4.0 - 10/17/2026 - Added optional record cache size limit.
+        2.4.4.1 - 10/17/2026 - Default check frequency is a time interval, like the value read from the file.
 
 """
 
 __author__ = "John Dorian for Sai Systems Technologies"
 __copyright__ = "Copyright 2018"
-__version__ = "2.4.0.1"
+__version__ = "2.4.4.1"
 
 # Built-in
 import os
@@ -65,8 +70,18 @@ def get_azure_credentials(prod: bool):
                             credentials['key'] = val.strip().ljust(88, '=')
                         elif key == "REPORT_CHECK_FREQUENCY":
                             settings.frequency = timedelta(seconds=int(val.strip()))
+                        elif key == "REPORT_CHECK_MAX_INTERVAL":
+                            settings.max_interval = timedelta(seconds=int(val.strip()))
                         elif key == "REPORT_WORKERS":
                             settings.processes = int(val.strip())
+                        elif key == "REPORT_WORKERS_MIN":
+                            settings.min_processes = int(val.strip())
+                        elif key == "REPORT_MEMORY_LIMIT":
+                            settings.memory_limit = int(val.strip())
+                        elif key == "REPORT_JOB_TIMEOUT":
+                            settings.job_timeout = timedelta(seconds=int(val.strip()))
+                        elif key == "REPORT_CACHE_LIMIT":
+                            settings.cache_limit = int(val.strip())
                         elif key == "REPORT_CLEANUP_HOUR":
                             settings.cleanup_hour = int(val.strip())
                 except Exception as e:
@@ -90,6 +105,11 @@ def get_azure_credentials(prod: bool):
 class Settings:
     """Object used for storing timeouts for facility/CMS/monitor."""
     def __init__(self):
-        self.frequency = 1
+        self.frequency = timedelta(seconds=1)
+        self.max_interval = timedelta(seconds=30)
         self.processes = 2
+        self.min_processes = 1
+        self.memory_limit = None
+        self.job_timeout = timedelta(minutes=15)
+        self.cache_limit = 2048
         self.cleanup_hour = 14
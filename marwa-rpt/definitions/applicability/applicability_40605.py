@@ -6,17 +6,44 @@ Applicability logic definitions.
         1) Make a copy of this file.
         2) Rename it with the precise VOCSN software version, excluding '.' characters from the name.
         3) Modify the logic here as needed.
+        4) List any parameter with applicability that depends on a dependee value under that value in "dependees".
 
 """
 
 # VOCSN modules
 from modules.models.vocsn_enum import Models
-from modules.processing.applicability import ApplicabilityStack
+from modules.processing.applicability import ApplicabilityStack, DependencyIndex
 
 
 class ApplicabilityTracker:
     """ Provides temporary state indexing to accelerate applicability determination for parameters. """
 
+    # Parameter IDs with applicability that depends on each dependee value
+    # Parameters not listed here only depend on model applicability
+    dependees = {
+        # Ventilation mode (24)
+        "mode": {"25", "26", "28", "30", "32", "33", "34", "35", "36", "37", "38", "39", "40", "42", "45", "58", "59",
+                 "60", "61", "63", "64", "65", "66", "67", "68", "70", "95", "96", "98", "100", "101", "9402", "9403",
+                 "9404", "9405", "9406", "9407", "9408", "9409", "9410", "9411", "12065", "14508"},
+        # Circuit type (13)
+        "circuit_type": {"14", "25", "30", "39", "40", "60", "65", "98", "9406", "9407", "9409"},
+        # Oxygen delivery mode (87)
+        "oxygen_mode": {"41", "45", "61", "66", "9411", "9412", "12065"},
+        # Oxygen source (88)
+        "oxygen_source": {"12065"},
+        # FiO2 monitor (72)
+        "fio2_monitor": {"61", "66", "9411", "12063"},
+        # Pressure control flow termination (35)
+        "pres_cont_flow_term": {"36"},
+        # Cough therapy calendar
+        "cough_active": {"46", "47", "48", "49", "50", "51", "52", "53", "54", "9401", "12023", "12024", "12025",
+                         "12026"},
+        # Suction therapy calendar
+        "suction_active": {"54", "55"},
+        # Nebulizer therapy calendar
+        "nebulizer_active": {"57"}
+    }
+
     def __init__(self):
         """ Initialize. """
 
@@ -27,6 +54,9 @@ class ApplicabilityTracker:
         # Processing flag - reset when new events are created
         self.up_to_date = False
 
+        # Dependee values from the previous update
+        self.index = DependencyIndex(self.dependees)
+
         # Dependee values
         self.mode = None
         self.circuit_type = None
@@ -161,20 +191,28 @@ class ApplicabilityTracker:
         self.up_to_date = True
 
     def update_all(self):
-        """ Update all settings, monitors, and alarms with current applicability. """
+        """ Update settings, monitors, and alarms affected by changed dependee values with current applicability. """
         from modules.processing.settings import Setting
         from modules.models.vocsn_data import MonitorChannel
 
         # Variables
         changed = False
+        settings = self.data.settings_all
+        monitors = self.data.monitors_all
+
+        # Find parameters affected by changed dependee values
+        self._index_dependees()
+        p_ids = self.index.changed(self, (len(settings), len(monitors)))
 
         # Settings and Alarms
-        for _, setting in self.data.settings_all.items():
+        for key in settings if p_ids is None else p_ids:
+            setting = settings.get(key)
             if type(setting) is Setting:
                 changed = self._check_applicability(setting) or changed
 
         # Monitors
-        for _, monitor in self.data.monitors_all.items():
+        for key in monitors if p_ids is None else p_ids:
+            monitor = monitors.get(key)
             if type(monitor) is MonitorChannel:
                 changed = self._check_applicability(monitor) or changed
 
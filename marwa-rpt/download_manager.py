@@ -13,12 +13,16 @@ job, downloads the requested reports, bundles them into a ZIP file, uploads it t
         1.1.0.0 - 01/24/2020 - Moved queue retrieval to daemon.
         1.1.1.0 - 01/30/2020 - Added database log upload.
         1.1.2.0 - 02/13/2020 - Moved report generator settings to .env file.
+        1.1.3.0 - 10/17/2026 - Log lines are queued in the upload outbox for the daemon to upload.
+        1.1.4.0 - 10/17/2026 - Stores the session log and exits when the daemon cancels the job.
+        1.1.4.1 - 10/17/2026 - Queue status is written with safe write and request date read with safe read, since Int64
+                               fields are plain integers.
 
 """
 
 __author__ = "John Dorian for Sai Systems Technologies"
 __copyright__ = "Copyright 2018"
-__version__ = "1.1.2.0"
+__version__ = "1.1.4.1"
 
 # Built-in
 import os
@@ -27,6 +31,7 @@ import json
 import shutil
 import string
 import random
+import signal
 import zipfile
 from datetime import datetime
 
@@ -35,6 +40,8 @@ from config import config
 from modules.models import vocsn_enum as ve
 from modules.models.errors import ErrorManager
 from modules.shared import status as status_script
+from modules.shared.scheduler import CANCELLED_EXIT
+from modules.processing.utilities import safe_read, safe_write
 
 # Azure library
 from azure.cosmosdb.table import TableService, Entity
@@ -70,6 +77,7 @@ def build_batch(queue_item: Entity, prod: bool, diag: bool):
     # ------ Setup ------ #
 
     DIAG = diag
+    table_service = None
     batch_id = queue_item.RowKey
     temp_dir = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
     em = ErrorManager("Download Manager", "B" + temp_dir, diag)
@@ -78,6 +86,21 @@ def build_batch(queue_item: Entity, prod: bool, diag: bool):
     status = status_script.StatusMonitorTracker()
     status.start_time = datetime.now()
 
+    # Store session log and exit if the daemon cancels this job. The daemon records the batch error.
+    def cancel(signum, frame):
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        message = "Batch exceeded its deadline and was cancelled"
+        try:
+            em.log_error(ve.Programs.FILE_MAN, ve.ErrorCat.PROCESS_ERROR, ve.ErrorSubCat.INTERNAL_ERROR, message,
+                         TimeoutError(message), error_level=ve.ErrorLevel.CRITICAL)
+        except TimeoutError:
+            pass  # Raised in diagnostic mode
+        if os.path.exists(temp_dir):
+            clean_vm(em, temp_dir)
+        store_log(em, table_service, batch_id)
+        sys.exit(CANCELLED_EXIT)
+    signal.signal(signal.SIGTERM, cancel)
+
     # Diagnostic output
     d_print("-----------------------")
     d_print("-   Download Manager  -")
@@ -168,8 +191,8 @@ def store_log(em: ErrorManager, table_service: TableService, batch_id: str):
     # Write log to file
     em.write_log()
 
-    # Write log to database
-    em.upload_log(table_service, "BatchLog", batch_id)
+    # Queue log for upload to database
+    em.upload_log("BatchLog", batch_id)
 
 
 def set_error(em: ErrorManager, table_service: TableService, batch_ent: Entity, queue_ent: Entity):
@@ -258,7 +281,7 @@ def reserve_batch(em: ErrorManager, queue_item: Entity, table_service: TableServ
     # Abort processing if record cannot be locked
     try:
         d_print("  Reserving batch queue item.")
-        queue_item.Status.value = ve.ProcessingState.PROCESSING.value
+        safe_write(queue_item, "Status", ve.ProcessingState.PROCESSING.value)
         queue_item.StartDT = datetime.utcnow().timestamp()
         etag = queue_item.etag
         table_service.update_entity(table, queue_item, if_match=etag)
@@ -437,7 +460,7 @@ def upload_zip(em: ErrorManager, table_service: TableService, file_service: File
 
         # Create directory for file
         share = "vocsn-batches"
-        batch_dt = datetime.fromtimestamp(batch_ent.RequestDT.value)
+        batch_dt = datetime.fromtimestamp(safe_read(batch_ent.RequestDT))
         source_path = os.path.join(temp_dir, zip_file)
         paths = [batch_dt.year, "{:02d}".format(batch_dt.month), "{:02d}".format(batch_dt.day)]
         directory = ""
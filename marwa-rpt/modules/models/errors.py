@@ -22,29 +22,45 @@ Error tracking and management logic for processing VOCSN data.
         1.0.4.4 - 04/08/2020 - Moved CSV line interpreter to vocsn-combined-log project.
         1.0.4.5 - 04/13/2020 - Improved data structures for combined log.
         1.0.4.6 - 04/13/2020 - Improved combined log string output.
+        1.0.5.0 - 10/17/2026 - Duplicate errors and warnings are found with a hashed index. Stored records are capped,
+                               with records beyond the cap counted.
+        1.0.6.0 - 10/17/2026 - Log lines are written to the upload outbox instead of being committed to the database
+                               by the worker.
+        1.0.6.1 - 10/17/2026 - Errors and warnings logged after a checkpoint can be collected and replayed, so that
+                               cached TAR reads report the same log as the first read.
+        1.0.6.2 - 10/17/2026 - Uploaded logs include an info line with counts of records not stored after the limit.
 
 """
 
 __author__ = "John Dorian for Sai Systems Technologies"
 __copyright__ = "Copyright 2019"
-__version__ = "1.0.4.6"
+__version__ = "1.0.6.2"
 
 # Built-in modules
 import os
 import sys
+import copy
 import socket
 from datetime import datetime
 
 # VOCSN modules
 from modules.models import vocsn_enum as ve
+from modules.shared.log_upload import spill_log
 
 # Azure modules
-from azure.cosmosdb.table import TableService, TableBatch, Entity
+from azure.cosmosdb.table import Entity
 
 # Globals
 LINE = None
 FILE = None
 
+# Maximum number of stored errors and of stored warnings, records beyond these limits are only counted
+MAX_RECORDS = 5000
+
+# Counters carried between checkpoints and replays
+COUNTERS = ["lost_event", "lost_config", "lost_monitor", "lost_general", "lost_unknown", "errors_dropped",
+            "warnings_dropped"]
+
 
 def error_info():
     """
@@ -248,6 +264,10 @@ class ErrorManager:
         self.errors = []            # List[EventError] - Errors encountered while loading
         self.warnings = []          # List[EventWarning] - Warnings encountered while loading
         self.unique_messages = []   # List[str] = Unique message identifiers to prevent duplicates
+        self.error_index = {}       # dict[tuple: EventError] - Stored errors by duplicate key
+        self.warning_index = {}     # dict[tuple: EventWarning] - Stored warnings by duplicate key
+        self.errors_dropped = 0     # Errors not stored after reaching the record limit
+        self.warnings_dropped = 0   # Warnings not stored after reaching the record limit
 
     def enable_tracking(self):
         """ Disable tracking when processing records out of range. """
@@ -318,26 +338,20 @@ class ErrorManager:
         if line:
             LINE = line
 
-        # Create error record
-        error = VOCSNError(prog, cat, sub_cat, message, e=e, p_id=p_id, r_id=r_id, val=val)
-
-        # Store all errors in diagnostic mode
-        if self.diag:
-            self.errors.append(error)
-
         # Only store unique errors with counts in normal operation
+        key = (cat, sub_cat, message, LINE[4] if LINE else None)
+        existing = self.error_index.get(key) if not self.diag else None
+        if existing:
+            existing.count += 1
+
+        # Store new errors, or all errors in diagnostic mode, up to the record limit
+        elif len(self.errors) < MAX_RECORDS:
+            error = VOCSNError(prog, cat, sub_cat, message, e=e, p_id=p_id, r_id=r_id, val=val)
+            self.errors.append(error)
+            if not self.diag:
+                self.error_index[key] = error
         else:
-            found = False
-            for existing in self.errors:
-                if existing.category == error.category and \
-                        existing.subcategory == error.subcategory and \
-                        existing.message == error.message and \
-                        existing.message_id == error.message_id:
-                    existing.count += 1
-                    found = True
-                    break
-            if not found:
-                self.errors.append(error)
+            self.errors_dropped += 1
 
         # Observe level override
         if error_level is not None:
@@ -354,7 +368,7 @@ class ErrorManager:
             else:
 
                 # Update record error counters
-                if error.category == ve.ErrorCat.RECORD_ERROR:
+                if cat == ve.ErrorCat.RECORD_ERROR:
                     if rec_type == ve.RecordType.EVENT:
                         self.lost_event += 1
                     elif rec_type == ve.RecordType.SETTINGS:
@@ -367,15 +381,15 @@ class ErrorManager:
                         self.lost_unknown += 1
 
                 # Check for critical error conditions
-                if self.check_error_level(error, "critical"):
+                if self.check_error_level(cat, "critical"):
                     self.status = ve.ErrorLevel.CRITICAL
 
                 # Check for section error conditions
-                elif self.check_error_level(error, "section"):
+                elif self.check_error_level(cat, "section"):
                     self.status = ve.ErrorLevel.SECTION
 
                 # Check for advisory error conditions
-                elif self.check_error_level(error, "advisory"):
+                elif self.check_error_level(cat, "advisory"):
                     self.status = ve.ErrorLevel.ADVISORY
 
                 # Any error constitutes at least a minor error condition
@@ -416,26 +430,20 @@ class ErrorManager:
         if line:
             LINE = line
 
-        # Construct and store warning
-        warning = VOCSNWarning(message, p_id, ref_id, val)
+        # Only store unique warnings with counts in normal operation
+        key = (message, LINE[4] if LINE else None)
+        existing = self.warning_index.get(key) if not self.diag else None
+        if existing:
+            existing.count += 1
 
-        # Store all warnings in diagnostic mode
-        if self.diag:
+        # Construct and store new warnings, or all warnings in diagnostic mode, up to the record limit
+        elif len(self.warnings) < MAX_RECORDS:
+            warning = VOCSNWarning(message, p_id, ref_id, val)
             self.warnings.append(warning)
-
-        # Only store unique errors with counts in normal operation
+            if not self.diag:
+                self.warning_index[key] = warning
         else:
-            found = False
-            for existing in self.warnings:
-                if existing.category == warning.category and \
-                        existing.subcategory == warning.subcategory and \
-                        existing.message == warning.message and \
-                        existing.message_id == warning.message_id:
-                    existing.count += 1
-                    found = True
-                    break
-            if not found:
-                self.warnings.append(warning)
+            self.warnings_dropped += 1
 
         # Escalate error level if appropriate
         if self.status == ve.ErrorLevel.NO_ERRORS:
@@ -445,10 +453,73 @@ class ErrorManager:
         if line:
             LINE = old_line
 
-    def check_error_level(self, error: VOCSNError, level: str):
+    def checkpoint(self) -> tuple:
+        """
+        Mark the current log state, so that errors and warnings logged after it can be collected.
+        :return: Checkpoint for changes().
+        """
+        counts = {id(item): item.count for item in self.errors + self.warnings}
+        return counts, self.status, [getattr(self, name) for name in COUNTERS]
+
+    def changes(self, checkpoint: tuple) -> dict:
+        """
+        Collect errors and warnings logged after a checkpoint.
+        :param checkpoint: Checkpoint from checkpoint().
+        :return: Log changes for replay(), with counts of new occurrences only.
+        """
+        counts, status, counters = checkpoint
+
+        def added(items: list):
+            result = []
+            for item in items:
+                count = item.count - counts.get(id(item), 0)
+                if count > 0:
+                    item = copy.copy(item)
+                    item.count = count
+                    result.append(item)
+            return result
+
+        return {
+            "errors": added(self.errors),
+            "warnings": added(self.warnings),
+            "status": self.status if self.status != status else None,
+            "counters": [getattr(self, name) - value for name, value in zip(COUNTERS, counters)]
+        }
+
+    def replay(self, changes: dict):
+        """
+        Log errors and warnings collected by changes() again, merging duplicates with stored records.
+        :param changes: Log changes.
+        """
+
+        # Merge records
+        for kind, index in (("errors", self.error_index), ("warnings", self.warning_index)):
+            stored = getattr(self, kind)
+            for item in changes[kind]:
+                if type(item) is VOCSNWarning:
+                    key = (item.message, item.message_id)
+                else:
+                    key = (item.category, item.subcategory, item.message, item.message_id)
+                existing = index.get(key) if not self.diag else None
+                if existing:
+                    existing.count += item.count
+                elif len(stored) < MAX_RECORDS:
+                    stored.append(item)
+                    if not self.diag:
+                        index[key] = item
+                else:
+                    setattr(self, kind + "_dropped", getattr(self, kind + "_dropped") + item.count)
+
+        # Counters and status
+        for name, value in zip(COUNTERS, changes["counters"]):
+            setattr(self, name, getattr(self, name) + value)
+        if changes["status"] is not None:
+            self.status = changes["status"]
+
+    def check_error_level(self, category: ve.ErrorCat, level: str):
         """
         Check for critical error conditions.
-        :param error: VOCSN error container.
+        :param category: Error category.
         :param level: Severity level.
         :return: Are severity level criteria met.
         """
@@ -458,7 +529,7 @@ class ErrorManager:
         thresholds = getattr(self, level) if hasattr(self, level) else None
 
         # Categorical conditions
-        if error.category in cat_list:
+        if category in cat_list:
             return True
         
         # Threshold-based conditions
@@ -508,6 +579,8 @@ class ErrorManager:
                           s(warn.value)[:8]))
         if len(self.warnings) > max_print:
             print("    ...")
+        if self.warnings_dropped:
+            print("    Not stored after limit: {}".format(self.warnings_dropped))
         print("  Errors: {}".format(len(self.errors)))
         if len(self.errors) > 0:
             print("    {0:<5} {1:<14} {2:<16} {3:<40} {4:<6} {5:<4} {6:<5} {7:<6} {8:<14} {9:<4} {10:<16} {11:<44}"
@@ -530,6 +603,8 @@ class ErrorManager:
                           s(error.detail)[:44]))
         if len(self.errors) > max_print:
             print("    ...")
+        if self.errors_dropped:
+            print("    Not stored after limit: {}".format(self.errors_dropped))
         print("  Run Time: " + str(self.run_time))
         print("")
 
@@ -587,6 +662,10 @@ class ErrorManager:
                 write_line(f, line)
                 line = ["Info", "Errors: " + str(len(self.errors)), "Warnings: " + str(len(self.warnings))]
                 write_line(f, line)
+                if self.errors_dropped or self.warnings_dropped:
+                    line = ["Info", "Errors not stored: " + str(self.errors_dropped),
+                            "Warnings not stored: " + str(self.warnings_dropped)]
+                    write_line(f, line)
                 line = ["Info", "Start: " + str(self.start)]
                 write_line(f, line)
                 line = ["Info", "Run time: " + str(rt)]
@@ -669,13 +748,14 @@ class ErrorManager:
         # Print message to console
         self.print_status()
 
-    def upload_log(self, table_service: TableService, table: str, record_id: str):
+    def upload_log(self, table: str, record_id: str):
         """
-        Write warning and error lines to Azure database.
-        :param table_service: Azure TableService instance with credentials.
+        Queue warning and error lines for upload to Azure database. Lines are written to the upload outbox and
+        committed by the daemon, so workers don't wait on the database.
         :param table: Destination table name.
         :param record_id: Report or batch ID.
         """
+        from modules.processing.utilities import dt_to_ts
 
         def s(string: str):
             """ Safe-format strings. """
@@ -693,6 +773,21 @@ class ErrorManager:
         # Lookup system name
         sys_name = socket.gethostname()
 
+        # Count records not stored after the limit
+        if self.errors_dropped or self.warnings_dropped:
+            rec_num += 1
+            ent = Entity()
+            ent.PartitionKey = s(record_id)
+            ent.RowKey = "{:06d}".format(rec_num)
+            ent.SystemName = sys_name
+            ent.Program = s(self.program)
+            ent.ProcessedDT = s(round(dt_to_ts(datetime.utcnow())))
+            ent.Type = "Info"
+            ent.Count = s(self.errors_dropped + self.warnings_dropped)
+            ent.Description = "Errors not stored: {}, Warnings not stored: {}".format(self.errors_dropped,
+                                                                                      self.warnings_dropped)
+            lines.append(ent)
+
         # Populate warnings
         for w in self.warnings:
             rec_num += 1
@@ -745,15 +840,6 @@ class ErrorManager:
             ent.ErrorMessage = s(e.detail)
             lines.append(ent)
 
-        # Upload in batches
-        count = 0
-        batch = TableBatch()
-        for line in lines:
-            batch.insert_entity(line)
-            count += 1
-            if count >= 100:
-                table_service.commit_batch(table, batch)
-                batch = TableBatch()
-                count = 0
-        if count > 0:
-            table_service.commit_batch(table, batch)
+        # Queue for upload
+        if lines:
+            spill_log(table, record_id, lines)
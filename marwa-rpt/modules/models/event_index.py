@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""
+Time-sorted index of VOCSN events. Report sections use it to fetch the events in a time range, or the events with a
+given ID, without scanning the full event list. Results are always returned in original event list order.
+
+    Version Notes:
+        1.0.0.0 - 10/17/2026 - Created file with EventIndex class.
+
+"""
+
+__author__ = "John Dorian for Sai Systems Technologies"
+__copyright__ = "Copyright 2026"
+__version__ = "1.0.0.0"
+
+# Built-in modules
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+
+class EventIndex:
+    """ Event positions grouped by event ID and sorted by synthetic time. """
+
+    def __init__(self, events: list):
+        """
+        Build index.
+        :param events: Events in original order.
+        """
+
+        # Variables
+        self.events = events
+        self.size = len(events)
+        self.by_id = {}
+        self.id_order = {}
+
+        # Sort positions by time, ignoring events without a time
+        timed = [x for x in range(0, self.size) if isinstance(events[x].syn_time, datetime)]
+        timed.sort(key=lambda x: events[x].syn_time)
+        self.order = timed
+        self.times = [events[x].syn_time for x in timed]
+
+        # Sub-indexes for each event ID, in original order and in time order
+        for x in range(0, self.size):
+            self.by_id.setdefault(events[x].id, []).append(x)
+        for x in timed:
+            self.id_order.setdefault(events[x].id, []).append(x)
+        self.id_times = {e_id: [events[x].syn_time for x in order] for e_id, order in self.id_order.items()}
+
+    def range(self, start: datetime, end: datetime, event_id: str = None):
+        """
+        Get events with start <= syn_time <= end.
+        :param start: Range start.
+        :param end: Range end.
+        :param event_id: Optional event ID filter.
+        :return: Events in original order.
+        """
+
+        # Select sorted positions
+        if event_id is None:
+            order, times = self.order, self.times
+        else:
+            order, times = self.id_order.get(event_id, []), self.id_times.get(event_id, [])
+
+        # Slice matching time span, restoring original order
+        positions = sorted(order[bisect_left(times, start):bisect_right(times, end)])
+        return [self.events[x] for x in positions]
+
+    def with_id(self, event_id: str):
+        """
+        Get all events with an event ID.
+        :param event_id: Event ID.
+        :return: Events in original order.
+        """
+        return [self.events[x] for x in self.by_id.get(event_id, [])]
@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+"""
+Columnar store for batch file records. Raw record lines are kept in one byte buffer, with commonly used fields held in
+NumPy columns so that time scans and range filters can work on whole exports at once.
+
+    Version Notes:
+        1.0.0.0 - 10/17/2026 - Created file with RecordStore class.
+        1.0.0.1 - 10/17/2026 - Record buffer is kept as built instead of copied when columns are finished.
+        1.0.1.0 - 10/17/2026 - Added export and import of finished columns for the record cache.
+
+"""
+
+__author__ = "John Dorian for Sai Systems Technologies"
+__copyright__ = "Copyright 2026"
+__version__ = "1.0.1.0"
+
+# Built-in modules
+from array import array
+
+# 3rd party modules
+import numpy as np
+
+# Value used for fields that could not be read
+INVALID = np.iinfo(np.int64).min
+
+# Record flags
+VALID = 0x01            # Record passed parsing and CRC checks
+REPLAY = 0x02           # Record is returned on passes after the first
+DECODED = 0x04          # Record bytes decode to text
+CRC_PASS = 0x08         # "PASS" is appended to record parts
+CRC_FAIL = 0x10         # "FAIL" is appended to record parts
+NEXT_7203 = 0x20        # Next record is a therapy state record
+SYN_TIME = 0x40         # Synthetic time has been calculated
+SYN_FLOAT = 0x80        # Synthetic time was calculated with a float offset
+
+# Columns built from appended records
+COLUMNS = ["offsets", "sequence", "raw_time", "type_code", "message_id", "width", "file_idx", "flags"]
+
+
+class RecordStore:
+    """ Columnar container for all batch records of a TAR file. """
+
+    def __init__(self):
+        """ Create an empty store. Records are appended, then frozen into columns with finish(). """
+
+        # Raw data
+        self.buffer = bytearray()
+        self.offsets = array('q', [0])
+
+        # Columns
+        self.sequence = array('q')
+        self.raw_time = array('q')
+        self.type_code = array('B')
+        self.message_id = array('q')
+        self.width = array('H')
+        self.file_idx = array('i')
+        self.flags = array('B')
+        self.syn_time = None
+
+        # Errors raised while calculating synthetic time, by record index
+        self.time_errors = {}
+
+    def __len__(self):
+        """ Number of records. """
+        return len(self.sequence)
+
+    def append(self, line: bytes, parts: list, file_idx: int, flags: int):
+        """
+        Add a record.
+        :param line: Cleaned record line.
+        :param parts: Split record values, before any CRC result is appended.
+        :param file_idx: Index of source batch file.
+        :param flags: Record flags.
+        """
+
+        # Store raw line
+        self.buffer += line
+        self.offsets.append(len(self.buffer))
+
+        # Store common fields
+        self.sequence.append(_read_int(parts, 0))
+        self.raw_time.append(_read_int(parts, 1))
+        self.type_code.append(ord(parts[2]) if len(parts) > 2 and len(parts[2]) == 1 else 0)
+        self.message_id.append(_read_int(parts, 3))
+        self.width.append(len(parts))
+        self.file_idx.append(file_idx)
+        self.flags.append(flags)
+
+    def finish(self):
+        """ Convert columns to NumPy arrays and set therapy state lookahead. """
+
+        # Convert columns
+        for name in COLUMNS:
+            setattr(self, name, np.array(getattr(self, name)))
+        self.syn_time = np.full(len(self), INVALID, dtype=np.int64)
+
+        # Lookahead for therapy state records
+        if len(self) > 1:
+            next_7203 = self.message_id[1:] == 7203
+            self.flags[:-1][next_7203] |= NEXT_7203
+
+    def columns(self):
+        """
+        Get record buffer and finished columns, before any synthetic times are stored.
+        :return: Dictionary of column arrays and raw record bytes.
+        """
+        columns = {name: getattr(self, name) for name in COLUMNS}
+        columns["buffer"] = bytes(self.buffer)
+        return columns
+
+    @classmethod
+    def from_columns(cls, columns: dict):
+        """
+        Create a finished store from exported columns.
+        :param columns: Dictionary from columns().
+        :return: Record store.
+        """
+        store = cls()
+        store.buffer = columns["buffer"]
+        for name in COLUMNS:
+            setattr(store, name, columns[name])
+        store.syn_time = np.full(len(store), INVALID, dtype=np.int64)
+        return store
+
+    def parts(self, idx: int):
+        """
+        Decode and split a record.
+        :param idx: Record index.
+        :return: Record values as a new list.
+        """
+        flags = self.flags[idx]
+        if not flags & DECODED:
+            return []
+        parts = self.buffer[self.offsets[idx]:self.offsets[idx + 1]].decode('utf-8').split(',')
+        if flags & CRC_PASS:
+            parts.append("PASS")
+        elif flags & CRC_FAIL:
+            parts.append("FAIL")
+        return parts
+
+    def offset_syn_time(self, offset):
+        """
+        Add an offset to all stored synthetic times.
+        :param offset: Time offset.
+        """
+        stored = self.has(SYN_TIME)
+        self.syn_time[stored] += int(offset)
+        if isinstance(offset, float):
+            self.flags[stored] |= SYN_FLOAT
+
+    def syn_value(self, idx: int):
+        """
+        Get synthetic time of a record in the numeric type it was calculated with.
+        :param idx: Record index.
+        :return: Synthetic timestamp.
+        """
+        syn_time = int(self.syn_time[idx])
+        return float(syn_time) if self.flags[idx] & SYN_FLOAT else syn_time
+
+    def has(self, flag: int):
+        """
+        Get mask of records with a flag set.
+        :param flag: Record flag.
+        :return: Boolean array.
+        """
+        return (self.flags & flag) != 0
+
+
+def _read_int(parts: list, idx: int):
+    """ Read integer field, or return invalid marker. """
+    try:
+        return int(parts[idx])
+    except (IndexError, ValueError):
+        return INVALID
@@ -39,22 +39,36 @@ format that can be consumed by the report modules.
         1.0.2.7  - 03/30/2020 - Added monitor records for combined log.
         1.0.2.8  - 04/06/2020 - Added an integer form of the VOCSN software version.
         1.0.2.9  - 04/13/2020 - Added last batch record time.
+        1.0.3.0  - 10/17/2026 - Monitor records and graph samples are stored in typed arrays and read as views.
+        1.0.3.1  - 10/17/2026 - Added time-sorted event index with range and event ID queries.
 
 """
 
 __author__ = "John Dorian for Sai Systems Technologies"
 __copyright__ = "Copyright 2019"
-__version__ = "1.0.2.8"
+__version__ = "1.0.3.1"
 
 # Built-in modules
-from datetime import datetime
+import math
+from array import array
+from datetime import datetime, timedelta
 
 # VOCSN modules
 from modules.models import vocsn_enum as ve
 from modules.models.errors import ErrorManager
+from modules.models.event_index import EventIndex
 from modules.processing.values import de_norm_val
 from modules.models.vocsn_enum import Therapies, RecordCompleteState as rState
 
+# Monitor record times are stored as microseconds since epoch
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+# Monitor record value type codes
+VAL_FLOAT = 0
+VAL_NONE = 1
+VAL_INT = 2
+
 
 class VOCSNData:
     """Data container for VOCSN log data"""
@@ -103,6 +117,7 @@ class VOCSNData:
         self.events_system = []            # list[Event] - References to system events (most 6000 messages)
         self.events_therapy = []           # list[Event] - References to therapy events
         self.events_tracker = None         # Usage statistics tracker
+        self.events_index = None           # EventIndex - Time-sorted index of all events
 
         # Utilization (therapy sessions)
         self.utilization_all = []          # list[Session]   - All therapy sessions
@@ -289,6 +304,33 @@ class VOCSNData:
         # Settings data
         self.settings_tracker.process_events()
 
+        # Event index
+        self.index_events()
+
+    def index_events(self):
+        """ Build time-sorted event index, if events have been added since the last build. """
+        if self.events_index is None or self.events_index.size != len(self.events_all):
+            self.events_index = EventIndex(self.events_all)
+        return self.events_index
+
+    def events_in_range(self, start: datetime, end: datetime, event_id: str = None):
+        """
+        Get events with start <= syn_time <= end, in original order.
+        :param start: Range start.
+        :param end: Range end.
+        :param event_id: Optional event ID filter.
+        :return: List of events.
+        """
+        return self.index_events().range(start, end, event_id)
+
+    def events_with_id(self, event_id: str):
+        """
+        Get all events with an event ID, in original order.
+        :param event_id: Event ID.
+        :return: List of events.
+        """
+        return self.index_events().with_id(event_id)
+
 
 class MonitorChannel:
     """ Monitored trend data channel. """
@@ -318,8 +360,8 @@ class MonitorChannel:
 
         # Data
         self.data = data
-        self.records = []
-        self.graph_samples = []
+        self.records = MonitorRecordStore(self)
+        self.graph_samples = MonitorRecordStore(self)
         self.average = None
         self.trend = None
         self.pre_trend = None
@@ -360,9 +402,7 @@ class MonitorChannel:
 
         # Add new record
         fill = fill if fill is not None else 1
-        record = self.MonitorRecord(self, seq, ts, fill, val1, val2, val3)
-        self.records.append(record)
-        return record
+        self.records.append(seq, ts, fill, val1, val2, val3, True, self.uses_percentiles)
 
     def add_graph_sample(self, seq: int, ts: int, val1, val2=None, val3=None, has_data: bool = True):
         """
@@ -376,8 +416,7 @@ class MonitorChannel:
         """
 
         # Add new record
-        record = self.MonitorRecord(self, seq, ts, 1.0, val1, val2, val3, has_data)
-        self.graph_samples.append(record)
+        self.graph_samples.append(seq, ts, 1.0, val1, val2, val3, has_data, self.uses_percentiles)
 
     def process_channel(self):
         """ Handle average calculations for individual monitor channel. """
@@ -396,39 +435,31 @@ class MonitorChannel:
             self.trend_delta, self.trend_percent = calc_trend(self.pre_trend, self.trend)
 
     class MonitorRecord:
-        """ Monitor data record """
+        """ Monitor data record, read from channel record storage. """
 
-        def __init__(self, channel, seq, ts, fill, val1, val2=None, val3=None, has_data=True):
+        def __init__(self, store, idx: int):
             """
-            Add a record to a monitor channel.
-            :param channel: Reference to parent monitor channel.
-            :param seq: Sequence number.
-            :param ts: Timestamp number.
-            :param fill: Samples represent five minutes. This is the percentage full for each sample.
-            :param val1: First value.
-            :param val2: Second value. (Optional)
-            :param val3: Third Value. (Optional)
-            :param has_data: Indicates record contains data. Graph summary record only.
+            Read a record from a monitor channel.
+            :param store: Record storage of parent monitor channel.
+            :param idx: Record index.
             """
 
             # References
-            self.channel = channel
+            self.channel = store.channel
 
             # Descriptors
-            self.sequence = int(seq)
-            if type(ts) == datetime:
-                self.time = ts
-            else:
-                self.time = datetime.utcfromtimestamp(float(ts))
+            self.sequence = store.sequence[idx]
+            self.time = EPOCH + timedelta(microseconds=store.time[idx])
 
             # Data values
-            self.fill = fill
-            self.val1 = float(val1) if has_data else None
-            self.val2 = float(val2) if val2 else val2
-            self.val3 = float(val3) if val3 else val3
+            types = store.types[idx]
+            self.fill = _unpack(store.fill[idx], types & 3)
+            self.val1 = _unpack(store.val1[idx], (types >> 2) & 3)
+            self.val2 = _unpack(store.val2[idx], (types >> 4) & 3)
+            self.val3 = _unpack(store.val3[idx], (types >> 6) & 3)
 
             # Data flag - Used in graph samples to denote summary samples with no data
-            self.has_data = has_data
+            self.has_data = bool(store.has_data[idx])
 
         def __str__(self):
             """
@@ -454,6 +485,100 @@ class MonitorChannel:
             return "{}, {}, {}".format(m_format(self.val1), m_format(self.val2), m_format(self.val3))
 
 
+
+class MonitorRecordStore:
+    """ Growable typed-array storage for monitor records or graph samples, read back as MonitorRecord views. """
+
+    def __init__(self, channel):
+        """
+        Instantiate
+        :param channel: Parent monitor channel.
+        """
+
+        # References
+        self.channel = channel
+
+        # Columns
+        self.sequence = array('q')
+        self.time = array('q')              # Microseconds since epoch
+        self.fill = array('d')
+        self.val1 = array('d')
+        self.val2 = array('d')
+        self.val3 = array('d')
+        self.types = array('B')             # Value type codes for fill, val1, val2, val3 - two bits each
+        self.has_data = array('B')
+        self.percentile = array('B')        # Channel used percentiles when record was added
+
+    def __len__(self):
+        """ Number of records. """
+        return len(self.sequence)
+
+    def __iter__(self):
+        """ Step through records as views. """
+        for idx in range(0, len(self.sequence)):
+            yield MonitorChannel.MonitorRecord(self, idx)
+
+    def __getitem__(self, idx):
+        """ Read a record view, or a list of views for a slice. """
+        if isinstance(idx, slice):
+            return [MonitorChannel.MonitorRecord(self, x) for x in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("Monitor record index out of range")
+        return MonitorChannel.MonitorRecord(self, idx)
+
+    def append(self, seq, ts, fill, val1, val2, val3, has_data: bool, percentile: bool):
+        """
+        Add a record.
+        :param seq: Sequence number.
+        :param ts: Timestamp number or datetime.
+        :param fill: Percentage full for the sample.
+        :param val1: First value.
+        :param val2: Second value.
+        :param val3: Third value.
+        :param has_data: Indicates record contains data. Graph summary record only.
+        :param percentile: Channel uses percentiles.
+        """
+
+        # Descriptors
+        if type(ts) != datetime:
+            ts = datetime.utcfromtimestamp(float(ts))
+        self.sequence.append(int(seq))
+        self.time.append((ts - EPOCH) // MICROSECOND)
+
+        # Data values
+        fill, fill_type = _pack(fill)
+        val1, val1_type = _pack(float(val1) if has_data else None)
+        val2, val2_type = _pack(float(val2) if val2 else val2)
+        val3, val3_type = _pack(float(val3) if val3 else val3)
+        self.fill.append(fill)
+        self.val1.append(val1)
+        self.val2.append(val2)
+        self.val3.append(val3)
+        self.types.append(fill_type | val1_type << 2 | val2_type << 4 | val3_type << 6)
+        self.has_data.append(has_data)
+        self.percentile.append(percentile)
+
+
+def _pack(val):
+    """ Split a value into a float and a type code. """
+    if val is None:
+        return math.nan, VAL_NONE
+    if type(val) is int:
+        return float(val), VAL_INT
+    return val, VAL_FLOAT
+
+
+def _unpack(val: float, val_type: int):
+    """ Restore a value from a float and a type code. """
+    if val_type == VAL_NONE:
+        return None
+    if val_type == VAL_INT:
+        return int(val)
+    return val
+
+
 class Session:
     """ Therapy session. Expresses utilization. """
 
@@ -22,23 +22,29 @@ Classes and functions used for tracking alarm events and processing statistics.
         1.0.3.0 - 01/18/2020 - Implemented pre-trend average calculations.
         1.0.3.1 - 02/27/2020 - Corrected the record length for the synthetic alarm start/stop.
         1.0.3.2 - 04/06/2020 - Adjusted date comparators.
+        1.0.4.0 - 10/17/2026 - Alarms are kept in start order as they complete. Calendar, global, and therapy statistics
+                               are calculated for all alarms at once with array operations.
 
 """
 
 __author__ = "John Dorian for Sai Systems Technologies"
 __copyright__ = "Copyright 2019"
-__version__ = "1.0.3.2"
+__version__ = "1.0.4.0"
 
 # Built-in
 import calendar
+from bisect import bisect_right
 from datetime import timedelta
 
+# 3rd party modules
+import numpy as np
+
 # VOCSN data modules
 from modules.models.report import Report
 from modules.models import vocsn_enum as ve
 from modules.models.report import ReportRange
 from modules.models.errors import ErrorManager
-from modules.models.vocsn_data import VOCSNData
+from modules.models.vocsn_data import VOCSNData, EPOCH, MICROSECOND
 from modules.processing.utilities import dt_to_ts
 from modules.processing.utilities import calc_trend
 from modules.models.event_types import EventValParam
@@ -63,10 +69,11 @@ class AlarmTracker:
         self.range = r_range
 
         # Active alarm tracker for tracking individual alarm starts/stops to construct complete alarms
-        self.event_tracker = AlarmEventTracker(em, data, r_range)
+        self.event_tracker = AlarmEventTracker(em, data, r_range, self)
 
         # Trackers using different categorization of complete alarms
         self.all_alarms = data.alarms_all = []
+        self.start_times = []
         self.calendar = AlarmCalendar()
         self.stats = AlarmStats(r_range)
         self.therapy_man = TherapyManager(em, settings)
@@ -80,45 +87,36 @@ class AlarmTracker:
 
         # Track completed alarm
         if alarm:
-            self.all_alarms.append(alarm)
+            self.insert_alarm(alarm)
+
+    def insert_alarm(self, alarm):
+        """
+        Insert a completed alarm in start time order. Alarms complete in end time order, so most are inserted near the
+        end of the list. Alarms with equal start times stay in completion order.
+        :param alarm: Completed alarm.
+        """
+        idx = bisect_right(self.start_times, alarm.start_syn)
+        self.start_times.insert(idx, alarm.start_syn)
+        self.all_alarms.insert(idx, alarm)
 
     def process_events(self):
         """ Calculate alarm statistics. To be run after adding all events. """
 
         # End any active alarms at the end of the report
-        tracker = self.event_tracker
-        last = True
-        while len(tracker.alarms) > 0:
-            for alarm_type, start in tracker.alarms.items():
-                tracker.force_end(alarm_type, last)
-                break
-
-        # Alarm tracking process results in alarms sorted by end time.
-        # Sort by start time
-        self.all_alarms.sort(key=lambda a: a.start_syn)
-
-        # Process statistics for each alarm
-        for alarm in self.all_alarms:
+        self.event_tracker.end_all(last=True)
 
-            # Track calendar statistics
-            self.calendar.track_alarm(alarm)
-
-            # Track global statistics
-            self.stats.track_alarm(alarm)
-
-            # Add to bucket statistics
-            self.therapy_man.route_alarm(alarm)
+        # Calculate statistics for all alarms at once
+        sweep = AlarmSweep(self.all_alarms)
+        self.calendar.track_alarms(sweep)
+        self.stats.track_alarms(sweep)
+        self.therapy_man.route_alarms(sweep)
 
         # Calculate final statistics
         self.stats.finish_calcs()
 
     def stop_all(self, ref_e):
         """ Stop all active alarms. Used at power down. """
-        tracker = self.event_tracker
-        while len(tracker.alarms) > 0:
-            for alarm_type, start in tracker.alarms.items():
-                tracker.force_end(alarm_type, ref_e=ref_e)
-                break
+        self.event_tracker.end_all(ref_e=ref_e)
 
 
 class Alarm:
@@ -149,6 +147,51 @@ class Alarm:
         self.severity = start.alarm_priority
 
 
+class AlarmSweep:
+    """ Array form of completed alarms, used to calculate statistics for all alarms at once. """
+
+    def __init__(self, alarms: list):
+        """
+        Initialize.
+        :param alarms: Completed alarms in start order.
+        """
+
+        # Alarms
+        self.alarms = alarms
+        self.count = len(alarms)
+
+        # Start times (since epoch) and durations in microseconds
+        self.starts = np.fromiter(((a.start_syn - EPOCH) // MICROSECOND for a in alarms), np.int64, self.count)
+        self.durations = np.fromiter((a.duration // MICROSECOND for a in alarms), np.int64, self.count)
+
+        # Calendar positions (1970-01-01 was a Thursday)
+        day = timedelta(days=1) // MICROSECOND
+        hour = timedelta(hours=1) // MICROSECOND
+        self.weekdays = (self.starts // day + 3) % 7
+        self.hours = (self.starts % day) // hour
+
+    def starts_between(self, start, end, end_inclusive: bool = True):
+        """
+        Get mask of alarms starting in a time range.
+        :param start: Range start, inclusive.
+        :param end: Range end.
+        :param end_inclusive: Include alarms starting at range end.
+        :return: Boolean array.
+        """
+        start = (start - EPOCH) // MICROSECOND
+        end = (end - EPOCH) // MICROSECOND
+        return (start <= self.starts) & ((self.starts <= end) if end_inclusive else (self.starts < end))
+
+    def total_duration(self, mask: np.ndarray = None):
+        """
+        Sum alarm durations.
+        :param mask: Optional alarm selection.
+        :return: Total duration.
+        """
+        durations = self.durations if mask is None else self.durations[mask]
+        return timedelta(microseconds=int(durations.sum()))
+
+
 class AlarmCalendar:
     """ Container for time-based alarm tracking. """
 
@@ -169,16 +212,21 @@ class AlarmCalendar:
             self.times.append(AlarmTimeBucket(hour))
             hour += 3
 
-    def track_alarm(self, alarm: Alarm):
-        """ Track alarm in time-based buckets. """
+    def track_alarms(self, sweep):
+        """
+        Count alarms in time-based buckets.
+        :param sweep: Alarm arrays.
+        """
 
         # Track day of week
-        day = alarm.start_syn.weekday()
-        self.days[day].count_alarm()
+        counts = np.bincount(sweep.weekdays, minlength=7)
+        for day in range(0, 7):
+            self.days[day].count += int(counts[day])
 
         # Track time of day
-        index = alarm.start_syn.hour // 3
-        self.times[index].count_alarm()
+        counts = np.bincount(sweep.hours // 3, minlength=8)
+        for index in range(0, 8):
+            self.times[index].count += int(counts[index])
 
 
 class AlarmDayBucket:
@@ -194,10 +242,6 @@ class AlarmDayBucket:
         # Bucket-level statistics
         self.count = 0
 
-    def count_alarm(self):
-        """ Count alarm in this bucket if it is within the bucket duration range. """
-        self.count += 1
-
 
 class AlarmTimeBucket:
     """ Alarm duration bucket. """
@@ -213,21 +257,18 @@ class AlarmTimeBucket:
         # Bucket-level statistics
         self.count = 0
 
-    def count_alarm(self):
-        """ Count alarm in this time range bucket. """
-        self.count += 1
-
 
 class AlarmEventTracker:
     """ Track alarm starts and stops. """
 
-    def __init__(self, em: ErrorManager, data: VOCSNData, r_range: ReportRange):
+    def __init__(self, em: ErrorManager, data: VOCSNData, r_range: ReportRange, parent: AlarmTracker):
         """ Initialize. """
         
         # References
         self.em = em
         self.data = data
         self.r_range = r_range
+        self.parent = parent
 
         # Active alarm records
         self.alarms = {}
@@ -320,12 +361,21 @@ class AlarmEventTracker:
             old_e.complete = rState.MISSING_END
         alarm = self._stop_alarm(new_e, alarm_type)
         if alarm:
-            self.data.alarms_all.append(alarm)
+            self.parent.insert_alarm(alarm)
 
         # Log missing record
         if not last:
             self.em.log_warning("Encountered alarm start without a stop")
 
+    def end_all(self, last: bool = False, ref_e=None):
+        """
+        Force all active alarms to end, in the order they were started.
+        :param last: Indicates last alarms. Will be extended to end of the report.
+        :param ref_e: Reference event. Use times from this.
+        """
+        for alarm_type in list(self.alarms.keys()):
+            self.force_end(alarm_type, last, ref_e)
+
     def _start_alarm(self, e: EventValParam, alarm_type: str):
         """ Start an alarm. """
         started = self.alarm_type_starts
@@ -412,21 +462,31 @@ class AlarmStats:
         self.trend_duration_percentage = None
         self.trend_occurrence_percentage = None
 
-    def track_alarm(self, alarm: Alarm):
-        """ Track alarm in statistics. """
-        if self.total_duration is None:
-            self.total_duration = timedelta(seconds=0)
-            self.trend_duration = timedelta(seconds=0)
-            self.pre_trend_duration = timedelta(seconds=0)
-        self.total_count += 1
-        self.total_duration += alarm.duration
+    def track_alarms(self, sweep):
+        """
+        Track alarms in statistics.
+        :param sweep: Alarm arrays.
+        """
+
+        # No alarms
+        if sweep.count == 0:
+            return
+
+        # Totals
+        self.total_count = sweep.count
+        self.total_duration = sweep.total_duration()
+        self.trend_duration = timedelta(seconds=0)
+        self.pre_trend_duration = timedelta(seconds=0)
+
+        # Trend periods
         if self.range.use_trend:
-            if self.range.data_start <= alarm.start_syn < self.range.trend_start:
-                self.pre_trend_count += 1
-                self.pre_trend_duration += alarm.duration
-            if self.range.trend_start <= alarm.start_syn <= self.range.data_end:
-                self.trend_count += 1
-                self.trend_duration += alarm.duration
+            r = self.range
+            pre_trend = sweep.starts_between(r.data_start, r.trend_start, end_inclusive=False)
+            trend = sweep.starts_between(r.trend_start, r.data_end)
+            self.pre_trend_count = int(np.count_nonzero(pre_trend))
+            self.pre_trend_duration = sweep.total_duration(pre_trend)
+            self.trend_count = int(np.count_nonzero(trend))
+            self.trend_duration = sweep.total_duration(trend)
             
     def finish_calcs(self):
         """ Calculate statistics once all events are processed. """
@@ -462,10 +522,37 @@ class TherapyManager:
             name = therapy.name.lower()
             self.therapies[name] = AlarmTherapy(em, settings, name)
 
-    def route_alarm(self, alarm: Alarm):
-        therapy = alarm.therapy.name.lower()
-        if therapy in self.therapies:
-            self.therapies[therapy].add_alarm(alarm)
+    def route_alarms(self, sweep):
+        """
+        Calculate therapy and alarm type statistics.
+        :param sweep: Alarm arrays.
+        """
+
+        # Group alarms by therapy and alarm type, in order of first occurrence
+        groups = {}
+        first = []
+        codes = [-1] * sweep.count
+        for idx, alarm in enumerate(sweep.alarms):
+            key = (alarm.therapy, alarm.alarm_id)
+            code = groups.get(key)
+            if code is None:
+                if alarm.therapy.name.lower() not in self.therapies:
+                    continue
+                code = groups[key] = len(first)
+                first.append(alarm)
+            codes[idx] = code
+        codes = np.array(codes, dtype=np.int64)
+
+        # Split durations by group, keeping start order within each group
+        routed = codes >= 0
+        codes = codes[routed]
+        order = np.argsort(codes, kind="stable")
+        bounds = np.cumsum(np.bincount(codes, minlength=len(first)))[:-1]
+        durations = np.split(sweep.durations[routed][order], bounds) if first else []
+
+        # Populate therapy and alarm type trackers
+        for (therapy, _), code in groups.items():
+            self.therapies[therapy.name.lower()].add_type(first[code], durations[code])
 
 
 class AlarmTherapy:
@@ -488,22 +575,21 @@ class AlarmTherapy:
         # Alarm types
         self.alarm_types = {}
 
-    def add_alarm(self, alarm: Alarm):
-        """ Add alarm, creating new alarm type if needed. """
-
-        # Check if alarm type already exists
-        if alarm.alarm_id in self.alarm_types.keys():
-            alarm_type = self.alarm_types[alarm.alarm_id]
+    def add_type(self, alarm: Alarm, durations: np.ndarray):
+        """
+        Add statistics for all alarms of one type.
+        :param alarm: First alarm of this type, used to derive type.
+        :param durations: Alarm durations in microseconds.
+        """
 
-        # Create new alarm type
-        else:
-            alarm_type = self.alarm_types[alarm.alarm_id] = AlarmType(self.settings, alarm)
+        # Create alarm type
+        alarm_type = self.alarm_types[alarm.alarm_id] = AlarmType(self.settings, alarm)
 
         # Count statistics
-        self.count += 1
-        self.total_duration += alarm.duration
+        self.count += len(durations)
+        self.total_duration += timedelta(microseconds=int(durations.sum()))
         self.avg_duration = self.total_duration / self.count
-        alarm_type.add_alarm(alarm)
+        alarm_type.add_alarms(durations)
 
 
 class AlarmType:
@@ -522,10 +608,14 @@ class AlarmType:
             # Bucket-level statistics
             self.count = 0
 
-        def count_if_in_range(self, alarm: Alarm):
-            """ Count alarm in this bucket if it is within the bucket duration range. """
-            if self.low <= alarm.duration < self.high:
-                self.count += 1
+        def count_in_range(self, durations: np.ndarray):
+            """
+            Count alarms within the bucket duration range.
+            :param durations: Alarm durations in microseconds.
+            """
+            low = self.low // MICROSECOND
+            high = self.high // MICROSECOND
+            self.count += int(np.count_nonzero((low <= durations) & (durations < high)))
 
     def __init__(self, settings: dict, alarm: Alarm):
         """ Initialize using a reference alarm to derive type. """
@@ -546,13 +636,17 @@ class AlarmType:
         for bucket in bucket_defs:
             self.buckets.append(self.Bucket(bucket['low'], bucket['high']))
 
-    def add_alarm(self, alarm: Alarm):
+    def add_alarms(self, durations: np.ndarray):
+        """
+        Add alarms of this type.
+        :param durations: Alarm durations in microseconds.
+        """
 
         # Add to statistics
-        self.count += 1
+        self.count += len(durations)
         self.total_duration = timedelta(seconds=0)
         self.avg_duration = timedelta(seconds=0)
 
         # Add to buckets
         for bucket in self.buckets:
-            bucket.count_if_in_range(alarm)
+            bucket.count_in_range(durations)
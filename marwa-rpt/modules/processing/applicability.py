@@ -8,12 +8,22 @@ Applicability logic determines if a setting, alarm, or monitor are applicable at
         1.0.2.0 - 01/19/2020 - Moved logic to separate applicability modules and created a loader function.
         1.0.2.1 - 01/24/2020 - Moved to generalized version number.
         1.0.2.2 - 02/05/2020 - Created setup function to access data container directly after exec command.
+        1.0.3.0 - 10/17/2026 - Applicability classes are imported once per version and held in the process-wide
+                               definition cache.
+        1.0.4.0 - 10/17/2026 - Added dependency index so that only parameters with changed dependee values are
+                               re-evaluated.
 
 """
 
 __author__ = "John Dorian for Sai Systems Technologies"
 __copyright__ = "Copyright 2019"
-__version__ = "1.0.2.2"
+__version__ = "1.0.4.0"
+
+# Built-in modules
+import importlib
+
+# VOCSN modules
+from modules.readers.definitions import applicability_cache
 
 
 def lookup_applicability(data, new_ver: str = None):
@@ -24,17 +34,67 @@ def lookup_applicability(data, new_ver: str = None):
     :return: ApplicabilityTracker
     """
 
-    # Dynamically import applicability definitions
+    # Create tracker from cached applicability definitions
     ver = new_ver if new_ver else data.gen_version
-    command = "from definitions.applicability.applicability_{} import ApplicabilityTracker as DEFS; defs = DEFS()" \
-        .format(ver)
-    _locals = locals()
-    exec(command, globals(), _locals)
-    applicability = _locals["defs"]
+    applicability = get_applicability_class(ver)()
     applicability.setup(data)
     return applicability
 
 
+def get_applicability_class(ver):
+    """
+    Lookup applicability tracker class for a VOCSN software version, importing it on first use.
+    :param ver: VOCSN software version.
+    :return: ApplicabilityTracker class.
+    """
+    key = str(ver)
+    tracker_class = applicability_cache.get(key)
+    if tracker_class is None:
+        module = importlib.import_module("definitions.applicability.applicability_{}".format(key))
+        tracker_class = applicability_cache.put(key, module.ApplicabilityTracker)
+    return tracker_class
+
+
+class DependencyIndex:
+    """ Track dependee values between updates to find parameters with applicability that may have changed. """
+
+    def __init__(self, dependees: dict):
+        """
+        Initialize.
+        :param dependees: Set of affected parameter IDs for each dependee value, by tracker attribute name.
+        """
+        self.dependees = dependees
+        self.values = None
+        self.sizes = None
+
+    def changed(self, tracker, sizes: tuple):
+        """
+        Compare indexed dependee values with values from the previous update.
+        :param tracker: Applicability tracker with current dependee values.
+        :param sizes: Parameter collection sizes. Any change requires all parameters to be re-evaluated.
+        :return: Set of parameter IDs to re-evaluate, or None if all parameters must be re-evaluated.
+        """
+
+        # Read current dependee values
+        values = [getattr(tracker, name) for name in self.dependees]
+
+        # First update or new parameters
+        if self.values is None or sizes != self.sizes:
+            p_ids = None
+
+        # Parameters affected by changed values
+        else:
+            p_ids = set()
+            for name, old, new in zip(self.dependees, self.values, values):
+                if old != new:
+                    p_ids |= self.dependees[name]
+
+        # Store values for next update
+        self.values = values
+        self.sizes = sizes
+        return p_ids
+
+
 class ApplicabilityItem:
     """ This placeholder is used to track objects that need applicability updates after batch processing. """
 
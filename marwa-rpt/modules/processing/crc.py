@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""
+Batch CRC verification for batch file records.
+
+    Version Notes:
+        1.0.0.0 - 10/17/2026 - Created file with a table-driven CRC16 (XMODEM) check over all records of a batch file.
+        1.0.0.1 - 10/17/2026 - Records may be memoryviews of a mapped TAR file; only the trailing field is copied.
+
+"""
+
+__author__ = "John Dorian for Sai Systems Technologies"
+__copyright__ = "Copyright 2026"
+__version__ = "1.0.0.1"
+
+# 3rd party modules
+import numpy as np
+
+# CRC16 XMODEM polynomial and initial value used by VOCSN batch records
+CRC_POLY = 0x1021
+CRC_INIT = 0xffff
+CRC_DIGITS = 5
+TAIL_BYTES = 16     # Bytes copied when reading the trailing field, longer fields fall back to the whole line
+
+
+def _build_table():
+    """ Build CRC16 lookup table for each leading byte value. """
+    table = np.zeros(256, dtype=np.uint32)
+    for i in range(0, 256):
+        crc = i << 8
+        for _ in range(0, 8):
+            crc = (crc << 1) ^ CRC_POLY if crc & 0x8000 else crc << 1
+        table[i] = crc & 0xffff
+    return table
+
+
+CRC_TABLE = _build_table()
+
+
+def crc16_lines(spans: list):
+    """
+    Calculate CRC16 (XMODEM) of many byte strings at once. Each byte position is processed for all strings together.
+    :param spans: Byte strings to check.
+    :return: CRC values array.
+    """
+
+    # Variables
+    count = len(spans)
+    crc = np.full(count, CRC_INIT, dtype=np.uint32)
+    if count == 0:
+        return crc
+
+    # Arrange spans as rows of a zero padded byte matrix
+    lengths = np.fromiter((len(span) for span in spans), dtype=np.int64, count=count)
+    width = int(lengths.max())
+    matrix = np.zeros((count, width), dtype=np.uint8)
+    flat = np.frombuffer(b''.join(spans), dtype=np.uint8)
+    rows = np.repeat(np.arange(count), lengths)
+    starts = np.cumsum(lengths) - lengths
+    cols = np.arange(len(flat)) - np.repeat(starts, lengths)
+    matrix[rows, cols] = flat
+
+    # Step through byte columns, only advancing rows that are long enough
+    for col in range(0, width):
+        new_crc = ((crc << 8) & 0xffff) ^ CRC_TABLE[((crc >> 8) ^ matrix[:, col]) & 0xff]
+        crc = np.where(col < lengths, new_crc, crc)
+    return crc
+
+
+def check_crc(lines: list):
+    """
+    Verify the trailing CRC field of all records in a batch file with one call.
+    :param lines: Cleaned record lines, without line endings or trailing commas.
+    :return: Pass/fail bitmap, count of records that failed.
+    """
+
+    # Read expected values from trailing field, treating unreadable fields as failed
+    expected = np.full(len(lines), -1, dtype=np.int64)
+    for idx, line in enumerate(lines):
+        tail = bytes(line[-TAIL_BYTES:])
+        if b',' not in tail:
+            tail = bytes(line)
+        try:
+            expected[idx] = int(tail[tail.rfind(b',') + 1:])
+        except ValueError:
+            pass
+
+    # Compare with calculated values
+    calculated = crc16_lines([line[:-CRC_DIGITS] for line in lines])
+    passed = expected == calculated
+    return passed, int(len(lines) - np.count_nonzero(passed))
@@ -57,12 +57,13 @@ Classes and functions used for processing statistics from monitored data channel
         1.0.4.6  - 04/10/2020 - Removed handling for insp. hold events. (data type changed) Added routing for
                                 INST_HOLD events to session tracker with new non-session event handling.
         1.0.4.7  - 04/13/2020 - Added filename tracking.
+        1.0.4.8  - 10/17/2026 - Therapy start/stop and preset label changes mark settings for the next history update.
 
 """
 
 __author__ = "John Dorian for Sai Systems Technologies"
 __copyright__ = "Copyright 2019"
-__version__ = "1.0.4.7"
+__version__ = "1.0.4.8"
 
 # Built-in
 from datetime import datetime, timedelta
@@ -212,6 +213,11 @@ class Calendar:
         t.trend_active_time = self.trend_active_time
         t.pre_trend_active_time = self.pre_trend_active_time
 
+    def _mark_settings(self):
+        """ Mark settings of this therapy for the next settings history update after an active state change. """
+        if self.data.settings_tracker:
+            self.data.settings_tracker.mark_therapy(self.tracker)
+
     def start_therapy(self, start_e):
         """ Start a new therapy. """
 
@@ -221,6 +227,7 @@ class Calendar:
         self.preset_start = start_e.syn_time
         self.active = True
         self.ever_active = True
+        self._mark_settings()
 
         # Track start values
         self._track_session_vals(start_e)
@@ -326,6 +333,7 @@ class Calendar:
         self.preset_start = None
         self.last_start = None
         self.active = False
+        self._mark_settings()
 
         # Terminate other therapies if this is vent
         if self.therapy == ve.Therapies.VENTILATOR:
@@ -607,6 +615,7 @@ class Calendar:
                 preset_label_id = current_preset_id(event.therapy)
                 preset_val = EventValue(preset_label_id, "Preset Label", None, preset_label)
                 preset_group[preset_label_id].current[preset] = preset_val
+                preset_group[preset_label_id].mark_dirty()
 
         # Nebulizer duration
         elif event.therapy == ve.Therapies.NEBULIZER:
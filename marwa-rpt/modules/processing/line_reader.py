@@ -35,12 +35,15 @@ appropriate modules.
                                 exception in therapy start/stop handling to ignore insp. hold records.
         1.0.2.14 - 04/10/2020 - Removed Insp. hold handling. (data type changed)
         1.0.3.0  - 04/13/2020 - Added support for modifications needed for combined log.
+        1.0.3.1  - 10/17/2026 - Use synthetic times stored during time scan.
+        1.0.3.2  - 10/17/2026 - Applicability dependees are indexed by the tracker on update instead of on every line.
+        1.0.3.3  - 10/17/2026 - Preset label resets mark label settings for the next settings history update.
 
 """
 
 __author__ = "John Dorian for Sai Systems Technologies"
 __copyright__ = "Copyright 2019"
-__version__ = "1.0.3.0"
+__version__ = "1.0.3.3"
 
 # Built-in modules
 from datetime import datetime
@@ -169,19 +172,10 @@ def read_data_lines(em: ErrorManager, data: VOCSNData, report: Report, tar: TarM
             rec_type = get_record_type(line[2], line[3])
             try:
 
-                # Mark applicability as out of date
-                data.applicability_tracker.up_to_date = False
+                # ----- Insert synthetic timestamps ----- #
 
-                # ----- Generate synthetic timestamps ----- #
-
-                # Check for user time change
-                tm.check_user_time_change(line)
-
-                # Check for power failure/device reset
-                tm.check_power_loss_reset(line)
-
-                # Use current time offset to determine synthetic sequence time
-                tm.set_synthetic_time(line)
+                # Use synthetic time calculated during time scan
+                tm.insert_synthetic_time(line, tar.record_idx)
                 em.set_line(line, filename)
 
                 # Track last event time in case therapies must be stopped at end of available data
@@ -301,6 +295,7 @@ def read_data_lines(em: ErrorManager, data: VOCSNData, report: Report, tar: TarM
                             for preset_label_id in {"14502", "14503", "14504"}:
                                 preset_val = EventValue(preset_label_id, "Preset Label", None, "Preset {}".format(x))
                                 data.settings_all[preset_label_id].current[str(x)] = preset_val
+                                data.settings_all[preset_label_id].mark_dirty()
                         et = data.events_tracker
                         et.ventilator.settings_events = []
                         et.oxygen.settings_events = []
@@ -33,17 +33,24 @@ Classes and functions used for processing statistics from monitored data channel
         1.0.4.1  - 04/13/2020 - Added flag for combined log processing and crc result handling, updated combined log
                                 data container.
         1.0.4.2  - 04/13/2020 - Fixed line splitting error.
+        1.0.5.0  - 10/17/2026 - Monitor records are queued per channel and re-sampled together with NumPy binning when
+                                the channel is finished.
+        1.0.5.1  - 10/17/2026 - Re-sample directly from channel record arrays. Combined log monitor records are only
+                                built when reading for the combined log.
 
 """
 
 __author__ = "John Dorian for Sai Systems Technologies"
 __copyright__ = "Copyright 2019"
-__version__ = "1.0.4.2"
+__version__ = "1.0.5.1"
 
 # Built-in modules
 import math
 from datetime import datetime, timedelta
 
+# 3rd party modules
+import numpy as np
+
 # VOCSN data modules
 from modules.models.report import Report
 from modules.models import vocsn_enum as ve
@@ -51,13 +58,13 @@ from modules.models.errors import ErrorManager
 from modules.processing.values import get_vals
 from modules.models.vocsn_data import VOCSNData
 from modules.processing.utilities import ts_to_log
-from modules.models.vocsn_data import MonitorChannel
+from modules.models.vocsn_data import MonitorChannel, EPOCH, MICROSECOND
 from modules.processing.values import norm_val, de_norm_val
 from modules.processing.graph_range import auto_calc_graph_ticks
 
 
 class MonitorTracker:
-    """ Monitored data re-sampling tracker. """
+    """ Monitored data re-sampling tracker. Channel records are re-sampled together once all are read. """
 
     def __init__(self, report: Report, channel: MonitorChannel):
         """ Instantiate """
@@ -78,16 +85,8 @@ class MonitorTracker:
         self.default_sample_start = r_range.data_start
         self.default_sample_end = r_range.data_start + self.sample_duration
 
-        # Running counters
+        # Data flag
         self.has_data = False
-        self.total_count = 0
-        self.sample_count = 0
-        self.val_max = None
-        self.val_avg_total = 0
-        self.val_avg_count = 0
-        self.val_min = None
-        self.sample_start = self.default_sample_start
-        self.sample_end = self.default_sample_end
 
         # Values for calculating monitor graph Y-axis range
         self.avg_5th_count = 0
@@ -98,13 +97,6 @@ class MonitorTracker:
         self.avg_95th_max = None
         self.ticks_y = None
 
-    def _reset_val_counters(self):
-        """ Reset value counters. """
-        self.val_max = None
-        self.val_avg_total = 0.0
-        self.val_avg_count = 0.0
-        self.val_min = None
-
     def _reset_avg_counters(self):
         self.avg_5th_count = 0
         self.avg_5th_total = 0
@@ -114,110 +106,141 @@ class MonitorTracker:
         self.avg_95th_max = None
         self.ticks_y = None
 
-    def _count_sample(self, record: MonitorChannel.MonitorRecord):
-        """ Count values from monitor record into graph sample values. """
-
-        # Add to count of data samples
-        self.sample_count += 1
-
-        # Single sample
-        if not self.channel.uses_percentiles:
-            self.val_avg_total += norm_val(record.val1, self.ratio) * record.fill
-            self.val_avg_count += record.fill
-
-        # Three-part sample
-        # Min/Max values default as None so that default values never influence the min/max comparison
-        else:
-            self.val_avg_total += norm_val(record.val2, self.ratio) * record.fill
-            self.val_avg_count += record.fill
-            val1 = norm_val(record.val1, self.ratio)
-            val3 = norm_val(record.val3, self.ratio)
-            if self.val_max is not None:
-                self.val_max = max(self.val_max, val3)
-            else:
-                self.val_max = val3
-            if self.val_min is not None:
-                self.val_min = min(self.val_min, val1)
-            else:
-                self.val_min = val1
-
-    def add_sample(self, record: MonitorChannel.MonitorRecord):
+    def _resample(self):
         """
-        Count the values from a monitor record into re-sampled channel samples.
-        :param record: Monitor channel data record.
+        Assign channel records to graph samples and reduce each sample. Records are assigned exactly as a record-by-record
+        tracker would: the current sample only moves forward, records older than the current sample are dropped, and a
+        record on the end boundary of the current sample is counted in that sample.
+        :return: Per-sample lists of record count, average total, average count, min value, max value, and percentile
+                 flag of the record that moved past the sample (None if no record did).
         """
 
-        # Ignore records for previous patient
-        if record.time < self.range.data_start:
-            return
-
-        # Old record - ignore
-        if record.time < self.sample_start:
-            return
-
-        # Record in range - add to new sample
-        if self.sample_start <= record.time < self.sample_end:
-            self._count_sample(record)
+        # Variables
+        store = self.channel.records
+        samples = self.total_samples
+        duration = self.sample_duration // MICROSECOND
+        data_start = (self.default_sample_start - EPOCH) // MICROSECOND
+        data_end = (self.range.data_end - self.default_sample_start) // MICROSECOND
 
-        # Record is newer - catch up with newer sample
-        else:
-
-            # Advance sample until record is in range
-            while self.sample_end < record.time and self.total_count < self.total_samples and \
-                    self.sample_start < self.range.data_end:
-                self._advance_sample()
-
-            # Count sample
-            if record.time < self.range.data_end:
-                self._count_sample(record)
-
-    def _advance_sample(self):
-        """ Finalize current sample and reset for the next. """
-
-        # Finalize current sample
-        avg = de_norm_val(self.val_avg_total / self.val_avg_count if self.val_avg_count else 0, self.ratio)
-        if self.val_min is None:
-            self.val_min = 0
-        if self.val_max is None:
-            self.val_max = 0
-        v_min = de_norm_val(self.val_min, self.ratio)
-        v_max = de_norm_val(self.val_max, self.ratio)
-        has_data = self.sample_count > 0
+        # Ignore records for previous patient
+        times = np.frombuffer(store.time, dtype=np.int64) - data_start
+        keep = times >= 0
+        times = times[keep]
+        flags = np.frombuffer(store.percentile, dtype=np.uint8)[keep]
+        if len(times) == 0:
+            empty = [0] * samples
+            return empty, empty, empty, [None] * samples, [None] * samples, [None] * samples
+
+        # Samples stop advancing at the sample count, or at the first sample that starts at or after the data end
+        limit = min(samples, max(0, -(-data_end // duration)))
+
+        # Current sample before and after each record
+        target = np.minimum(-(-times // duration) - 1, limit)
+        after = np.maximum(np.maximum.accumulate(target), 0)
+        before = np.concatenate(([0], after[:-1]))
+
+        # Select counted records
+        start = before * duration
+        in_sample = (times >= start) & (times < start + duration)
+        counted = (times >= start) & (in_sample | (times < data_end)) & (after < samples)
+        idx = after[counted]
+        fills = np.frombuffer(store.fill, dtype=np.float64)[keep][counted]
+        percentile = flags[counted].astype(bool)
+        val1 = self._norm(np.frombuffer(store.val1, dtype=np.float64)[keep][counted])
+        val2 = self._norm(np.frombuffer(store.val2, dtype=np.float64)[keep][counted])
+        val3 = self._norm(np.frombuffer(store.val3, dtype=np.float64)[keep][counted])
+
+        # Sample counts and averages, summed in record order
+        count = np.bincount(idx, minlength=samples)
+        avg_total = np.bincount(idx, weights=np.where(percentile, val2, val1) * fills, minlength=samples)
+        avg_count = np.bincount(idx, weights=fills, minlength=samples)
+
+        # Min/max of three-part records
+        v_min = self._extreme(idx[percentile], val1[percentile], np.minimum, np.inf, samples)
+        v_max = self._extreme(idx[percentile], val3[percentile], np.maximum, -np.inf, samples)
+
+        # Percentile flag of the record that moved past each sample
+        trigger = np.searchsorted(after, np.arange(samples), side='right')
+        moved = [bool(flags[t]) if t < len(after) else None for t in trigger.tolist()]
+
+        return count.tolist(), avg_total.tolist(), avg_count.tolist(), v_min, v_max, moved
+
+    def _norm(self, vals: np.ndarray):
+        """ Normalize ratio values in bulk, matching norm_val. """
+        if not self.ratio:
+            return vals
+        return np.where(vals > 1, vals - 1, np.where(vals < -1, vals + 1, 0.0))
+
+    def _extreme(self, idx: np.ndarray, vals: np.ndarray, func, initial: float, samples: int):
+        """
+        Find the extreme value in each sample.
+        :param idx: Sample index of each value.
+        :param vals: Normalized values.
+        :param func: np.minimum or np.maximum.
+        :param initial: Identity value of func.
+        :param samples: Number of samples.
+        :return: Extreme values, None for samples without values.
+        """
+        extreme = np.full(samples, initial)
+        func.at(extreme, idx, vals)
+        present = np.bincount(idx, minlength=samples) > 0
+
+        # Normalized ratio values near 1:1 are integer 0 in norm_val
+        result = []
+        for val, has_val in zip(extreme.tolist(), present.tolist()):
+            if not has_val:
+                result.append(None)
+            elif self.ratio and val == 0:
+                result.append(0)
+            else:
+                result.append(val)
+        return result
+
+    def _finish_sample(self, sample: int, count: int, avg_total: float, avg_count: float, val_min, val_max,
+                       uses_percentiles: bool):
+        """ Store a re-sampled graph sample and update graph range values. """
+
+        # Finalize sample
+        avg = de_norm_val(avg_total / avg_count if avg_count else 0, self.ratio)
+        if val_min is None:
+            val_min = 0
+        if val_max is None:
+            val_max = 0
+        v_min = de_norm_val(val_min, self.ratio)
+        v_max = de_norm_val(val_max, self.ratio)
+        has_data = count > 0
 
         # Add graph sample
-        if self.channel.uses_percentiles:
-            self.channel.add_graph_sample(self.total_count, self.sample_start, v_min, avg, v_max, has_data)
+        sample_start = self.default_sample_start + sample * self.sample_duration
+        if uses_percentiles:
+            self.channel.add_graph_sample(sample, sample_start, v_min, avg, v_max, has_data)
         else:
-            self.channel.add_graph_sample(self.total_count, self.sample_start, avg, has_data=has_data)
+            self.channel.add_graph_sample(sample, sample_start, avg, has_data=has_data)
 
         # Update monitor graph range calculation values
-        if self.sample_count > 0 and has_data:
+        if has_data:
             self.avg_5th_count += 1
-            self.avg_5th_total += self.val_min
+            self.avg_5th_total += val_min
             if self.avg_5th_min is not None:
-                self.avg_5th_min = min(self.avg_5th_min, self.val_min)
+                self.avg_5th_min = min(self.avg_5th_min, val_min)
             else:
-                self.avg_5th_min = self.val_min
+                self.avg_5th_min = val_min
             self.avg_95th_count += 1
-            self.avg_95th_total += self.val_max
+            self.avg_95th_total += val_max
             if self.avg_95th_max is not None:
-                self.avg_95th_max = max(self.avg_95th_max, self.val_max)
+                self.avg_95th_max = max(self.avg_95th_max, val_max)
             else:
-                self.avg_95th_max = self.val_max
-
-        # Reset for next sample
-        self.sample_start = self.sample_end
-        self.sample_end += self.sample_duration
-        self.total_count += 1
-        self.sample_count = 0
-        self._reset_val_counters()
+                self.avg_95th_max = val_max
 
     def finish_channel(self):
-        """ In case there is partial data, fill in the rest of the samples for a channel to complete its records. """
+        """ Re-sample all queued records, filling in samples without data to complete the records of a channel. """
 
-        # Advance sample until record is in range
-        while self.total_count < self.total_samples:
-            self._advance_sample()
+        # Store each sample
+        results = zip(*self._resample())
+        for sample, (count, avg_total, avg_count, val_min, val_max, uses_percentiles) in enumerate(results):
+            if uses_percentiles is None:
+                uses_percentiles = self.channel.uses_percentiles
+            self._finish_sample(sample, count, avg_total, avg_count, val_min, val_max, uses_percentiles)
 
         # Calculate final monitor graph Y-axis range
         avg_5th = de_norm_val(self.avg_5th_total / self.avg_5th_count if self.avg_5th_count > 0 else 0, self.ratio)
@@ -284,7 +307,6 @@ def track_monitor_record(em: ErrorManager, data: VOCSNData, report: Report, line
         key = full_key.split('_')[0]
         val_def = param_defs[key]
         c = mon_trackers[key]
-        tracker = c.tracker
         percentile = "_" in full_key
         c.uses_percentiles = percentile
 
@@ -346,17 +368,15 @@ def track_monitor_record(em: ErrorManager, data: VOCSNData, report: Report, line
             if c.uses_percentiles and (val2 is None or val2 in na or val3 is None or val3 in na):
                 continue
 
-            # Create monitor data record
-            rec = c.add_record(seq, dt, fill, val1, val2, val3)
+            # Create monitor data record, re-sampled for graph when channel is finished
+            c.add_record(seq, dt, fill, val1, val2, val3)
 
             # Process records
+            fill = fill if fill is not None else 1
             if c.uses_percentiles:
-                val = norm_val(rec.val2, c.ratio) * rec.fill
+                val = norm_val(float(val2), c.ratio) * fill
             else:
-                val = norm_val(rec.val1, c.ratio)
-
-            # Re-sample for graph
-            tracker.add_sample(rec)
+                val = norm_val(float(val1), c.ratio)
 
             # # After updating graph, do not include 21% for FiO2 in average/trend calculation
             # if key in ["9411", "9412"] and (val1 == val2 == val3 == 21.0):
@@ -367,16 +387,16 @@ def track_monitor_record(em: ErrorManager, data: VOCSNData, report: Report, line
 
             # Track main average
             if in_range:
-                c.avg_count += rec.fill
+                c.avg_count += fill
                 c.avg_total += val
 
             # Track trend averages
             if r_range.use_trend:
                 if in_pre_trend:
-                    c.pre_trend_count += rec.fill
+                    c.pre_trend_count += fill
                     c.pre_trend_total += val
                 if in_trend:
-                    c.trend_count += rec.fill
+                    c.trend_count += fill
                     c.trend_total += val
 
         # Handle monitor errors
@@ -396,9 +416,10 @@ def track_monitor_record(em: ErrorManager, data: VOCSNData, report: Report, line
                 message = "Error while reading monitor message"
                 em.log_error(ve.Programs.REPORTING, ve.ErrorCat.LOW_ERROR, ve.ErrorSubCat.INTERNAL_ERROR, message, e)
 
-    # Construct log record
-    data.monitors_log.append(MonitorLogRecord(line, m_def['MsgName'], raw_dt, dt, log_details, crc_result=crc_result,
-                                              filename=filename))
+    # Construct log record, only kept when reading for the combined log
+    if data.tar_manager.combo_log:
+        data.monitors_log.append(MonitorLogRecord(line, m_def['MsgName'], raw_dt, dt, log_details,
+                                                  crc_result=crc_result, filename=filename))
 
 
 class MonitorLogRecord:
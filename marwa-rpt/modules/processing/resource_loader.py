@@ -4,12 +4,13 @@ This module contains functions to load common resources.
 
     Version Notes:
         1.0.0.0 - 07/28/2019 - Created file with load_font function.
+        1.0.1.0 - 10/17/2026 - Fonts are only registered once per process. Added image preloader for worker startup.
 
 """
 
 __author__ = "John Dorian for Sai Systems Technologies"
 __copyright__ = "Copyright 2019"
-__version__ = "1.0.0.0"
+__version__ = "1.0.1.0"
 
 
 # Built-in libraries
@@ -17,17 +18,25 @@ import os
 
 # ReportLab libraries
 from reportlab.pdfbase import pdfmetrics
+from reportlab.lib.utils import ImageReader
 from reportlab.pdfbase.ttfonts import TTFont
 
+# Font files already registered in this process
+loaded_fonts = set()
+
 
 def load_fonts(directory: str):
     """
-    Load common fonts.
+    Load common fonts. Fonts registered earlier in this process, or in a parent process before forking, are reused.
     :param directory: Environment directory.
     """
 
-    # Avenir family
+    # Skip if already registered
     avenir_path = os.path.join(directory, "resources", "fonts", "Avenir.ttc")
+    if os.path.abspath(avenir_path) in loaded_fonts:
+        return
+
+    # Avenir family
     pdfmetrics.registerFont(TTFont("Avenir-Light", avenir_path, subfontIndex=6))
     pdfmetrics.registerFont(TTFont("Avenir-RegLight", avenir_path, subfontIndex=0))
     pdfmetrics.registerFont(TTFont("Avenir-Regular", avenir_path, subfontIndex=11))
@@ -40,3 +49,19 @@ def load_fonts(directory: str):
     pdfmetrics.registerFont(TTFont("Avenir-Medium-I", avenir_path, subfontIndex=9))
     pdfmetrics.registerFont(TTFont("Avenir-Heavy-I", avenir_path, subfontIndex=5))
     pdfmetrics.registerFont(TTFont("Avenir-ExtraHeavy-I", avenir_path, subfontIndex=3))
+    loaded_fonts.add(os.path.abspath(avenir_path))
+
+
+def preload_images(directory: str):
+    """
+    Read and decode report images so that image libraries and file contents are loaded before workers are forked.
+    :param directory: Environment directory.
+    :return: Number of images loaded.
+    """
+    count = 0
+    for root, _, files in os.walk(os.path.join(directory, "resources", "images")):
+        for filename in files:
+            if filename.lower().endswith(".png"):
+                ImageReader(os.path.join(root, filename)).getSize()
+                count += 1
+    return count
@@ -47,23 +47,29 @@ Classes and functions for tracking settings for tracking settings and recording
         1.1.1.2  - 03/29/2020 - Use "was" preset values on ventilation preset change ensuring self-consistency.
         1.1.2.0  - 04/05/2020 - Added volume-targeted mode override.
         1.1.2.1  - 04/06/2020 - Constrained volume targeted mode overrids to v4.06.05 and up.
+        1.1.3.0  - 10/17/2026 - Settings history updates only check settings marked as changed since the last update.
+        1.1.4.0  - 10/17/2026 - Report and trend range averages are calculated together from history arrays. Trends
+                                are calculated once per numeric setting.
 
 """
 
 __author__ = "John Dorian for Sai Systems Technologies"
 __copyright__ = "Copyright 2019"
-__version__ = "1.1.2.1"
+__version__ = "1.1.4.0"
 
 # Built-in modules
 from datetime import datetime, timedelta
 
+# 3rd party modules
+import numpy as np
+
 # VOCSN modules
 from modules.models.report import Report
 from modules.models import vocsn_enum as ve
 from modules.models.report import ReportRange
 from modules.models.errors import ErrorManager
 from modules.processing import utilities as ut
-from modules.models.vocsn_data import VOCSNData
+from modules.models.vocsn_data import VOCSNData, EPOCH, MICROSECOND
 from modules.processing.values import EventValue
 from modules.models import event_types as e_types
 from modules.processing.utilities import calc_trend
@@ -188,6 +194,16 @@ class SettingsTracker:
             setting.preset_group = {"current_preset": "0", "last_change": None}
             data.settings_all[param] = setting
 
+        # Queue all settings for the first history update and index settings by therapy tracker
+        self.dirty = set()
+        self.therapy_settings = {}
+        for _, setting in data.settings_all.items():
+            if type(setting) is Setting:
+                setting.dirty = self.dirty
+                self.dirty.add(setting)
+                if setting.tracker:
+                    self.therapy_settings.setdefault(setting.tracker, []).append(setting)
+
     def update_setting(self, setting_id: str, preset: str, time: datetime, value: e_types.EventValue,
                        state: e_types.EventValue, was_val: bool = False, update_preset: bool = True,
                        preset_label: str = None):
@@ -250,9 +266,18 @@ class SettingsTracker:
             # Process changes to all included settings
             for key, setting in preset_group.items():
                 if type(setting) == Setting:
+                    setting.mark_dirty()
                     setting.update(preset_idx, setting.current[preset_idx], time, setting.states[preset_idx],
                                    update_preset=False, old_preset=last_preset_idx)
 
+    def mark_therapy(self, tracker: TherapyTracker):
+        """
+        Queue settings of a therapy for the next history update after its active state changes.
+        :param tracker: Therapy tracker.
+        """
+        for setting in self.therapy_settings.get(tracker, []):
+            self.dirty.add(setting)
+
     def process_events(self):
         """ Calculate trends for all settings. """
 
@@ -273,11 +298,8 @@ class SettingsTracker:
                     del setting.history[idx - offset]
                     offset += 1
 
-                # Only process numeric values - Exclude preset setting IDs
+                # Only process numeric values
                 s_type = setting.definition["displayType"]
-                if s_type == "NumericSetting":
-                    if "ActivePreset" not in setting.definition["tagName"]:
-                        setting.calc_trends()
                 if "numeric" in s_type.lower():
                     setting.calc_trends()
 
@@ -388,7 +410,7 @@ class SettingsTracker:
                                     preset_label=label)
 
     def update_history(self, time):
-        """ Enter initial value for all settings. """
+        """ Enter initial value for all settings, checking only settings marked as changed since the last update. """
 
         def are_equal(c_1, c_2):
             e = c_1.value == c_2.value
@@ -401,20 +423,20 @@ class SettingsTracker:
             return e
 
         # Settings history
-        for _, setting in self.data.settings_all.items():
-            if type(setting) is Setting:
-                app = setting.applicable
-                val = setting.current_value()
-                state = setting.current_state()
-                active = setting.tracker.calendar.active if setting.tracker else True
-                if val is not None:
-                    changed = True
-                    change = SettingsChange(val, time, active, state, applicable=app)
-                    if len(setting.history) > 0:
-                        last_change = setting.history[-1]
-                        changed = not are_equal(change, last_change)
-                    if changed:
-                        setting.history.append(change)
+        for setting in self.dirty:
+            app = setting.applicable
+            val = setting.current_value()
+            state = setting.current_state()
+            active = setting.tracker.calendar.active if setting.tracker else True
+            if val is not None:
+                changed = True
+                change = SettingsChange(val, time, active, state, applicable=app)
+                if len(setting.history) > 0:
+                    last_change = setting.history[-1]
+                    changed = not are_equal(change, last_change)
+                if changed:
+                    setting.history.append(change)
+        self.dirty.clear()
 
         # Preset History
         t = ve.Therapies
@@ -460,8 +482,11 @@ class Setting:
         # Group association
         self.preset_group = preset_group
 
+        # Settings awaiting a history update, shared with the settings tracker
+        self.dirty = None
+
         # Applicability
-        self.applicable = True
+        self._applicable = True
         self.model_applicability = True
 
         # Values
@@ -658,6 +683,7 @@ class Setting:
         self.current[new_preset] = event_val
         self.states[new_preset] = new_state
         self.active = new_active
+        self.mark_dirty()
 
         # Stop tracking after report range
         if time > self.range.end:
@@ -669,6 +695,7 @@ class Setting:
             if label_id in self.preset_group:
                 preset_val = EventValue(label_id, "Preset Label", None, new_label)
                 self.preset_group[label_id].current[new_preset] = preset_val
+                self.preset_group[label_id].mark_dirty()
 
         # Update preset
         if update_preset and new_preset is not None:
@@ -691,6 +718,23 @@ class Setting:
             # Update O2 mode durations
             self.tracker.track_o2_mode(time, event_val)
 
+    @property
+    def applicable(self):
+        """ Current applicability. """
+        return self._applicable
+
+    @applicable.setter
+    def applicable(self, applicable: bool):
+        """ Set applicability, marking setting for a history update on change. """
+        if applicable != self._applicable:
+            self._applicable = applicable
+            self.mark_dirty()
+
+    def mark_dirty(self):
+        """ Queue setting for the next settings history update. """
+        if self.dirty is not None:
+            self.dirty.add(self)
+
     def current_value(self):
         """ Get current value in context of event processing sequence. """
         preset = self.preset_group["current_preset"] if self.preset_group else None
@@ -733,91 +777,23 @@ class Setting:
     def calc_trends(self):
         """ Calculate trend statistics. """
 
-        def _add_to_average(set_change: SettingsChange, avg: SettingAverage):
-            """ Add time preceding setting change to average calculations. """
-
-            # Variables
-            ct = set_change.time
-            cv = float(set_change.value) if set_change.value is not None else None
-            ca = set_change.active
-            ce = set_change.enabled
-            cap = set_change.applicable
-
-            # Skip invalid types
-            if cv is None:
-                return
-
-            # Constrain time to range
-            if ct is not None and avg.start <= ct and avg.last_time is not None and avg.last_time <= avg.end:
-
-                # First numerical record in range - initialize values so field shows on report
-                if avg.total_val is None:
-                    avg.total_val = 0
-                    avg.total_time = timedelta(seconds=0)
-                    avg.average = 0
-
-                # Add to average time
-                start_time = min(max(avg.last_time, avg.start), avg.end)
-                end_time = ct = max(min(ct, avg.end), avg.start)
-                time = end_time - start_time
-
-                # Only add to average when setting is enabled and applicable, and therapy is in use
-                if time.total_seconds() > 0 and avg.last_enabled and avg.last_active and avg.last_applicable:
-                    avg.total_time += time
-                    avg.total_val += time.total_seconds() * avg.last_value
-
-            # Update last values
-            avg.last_time = ct
-            if cv is not None:
-                avg.last_value = cv
-            avg.last_active = ca
-            avg.last_enabled = ce
-            avg.last_applicable = cap
-
-            # Value set
-            if not avg.is_set and avg.total_val is not None and avg.total_val > 0:
-                avg.is_set = True
-
-        # Finish calculations
-        def _finish_average(avg: SettingAverage):
-
-            # Check if final addition is needed
-            if avg.last_time:
-                start_time = min(max(avg.last_time, avg.start), avg.end)
-                time = avg.end - start_time
-                if time.total_seconds() > 0 and avg.last_value is not None and avg.last_enabled and avg.last_active \
-                        and avg.last_applicable:
-
-                    # Initialize if needed
-                    if avg.total_val is None:
-                        avg.total_val = 0
-                        avg.total_time = timedelta(seconds=0)
-                        avg.average = 0
-
-                    # Add time
-                    avg.total_time += time
-                    avg.total_val += time.total_seconds() * avg.last_value
-
         # Catch errors from single event
         try:
 
-            # Process each setting change and update averages
-            # data_list = combined_list if combined_list else self.history
-            for change in self.history:
-
-                # Report range average
-                _add_to_average(change, self.track_avg)
+            # History arrays, skipping changes without a value
+            changes = [change for change in self.history if change.value is not None]
+            count = len(changes)
+            times = np.fromiter(((c.time - EPOCH) // MICROSECOND for c in changes), np.int64, count)
+            values = np.fromiter((float(c.value) for c in changes), np.float64, count)
+            counted = np.fromiter((bool(c.enabled and c.active and c.applicable) for c in changes), bool, count)
 
-                # Trend range average
-                if self.range.use_trend:
-                    _add_to_average(change, self.track_pre_trend)
-                    _add_to_average(change, self.track_trend)
-
-            # Finish calculations
-            _finish_average(self.track_avg)
+            # Report range and trend range averages, calculated together
+            averages = [self.track_avg]
             if self.range.use_trend:
-                _finish_average(self.track_pre_trend)
-                _finish_average(self.track_trend)
+                averages += [self.track_pre_trend, self.track_trend]
+            windows = [((avg.start - EPOCH) // MICROSECOND, (avg.end - EPOCH) // MICROSECOND) for avg in averages]
+            for avg, result in zip(averages, ut.time_weighted_totals(times, values, counted, windows)):
+                avg.set_totals(*result)
 
             # Calculate trend values
             t_avg = self.track_avg
@@ -848,15 +824,23 @@ class SettingAverage:
         self.range = None
         if end and start:
             self.range = end - start
-        self.last_applicable = False
-        self.last_enabled = False
-        self.last_active = False
-        self.last_value = None
-        self.last_time = None
         self.total_time = None
         self.total_val = None
         self.average = None
 
+    def set_totals(self, total_val: float, total_us: int, is_set: bool):
+        """
+        Store time-weighted totals for this range.
+        :param total_val: Value-seconds total, or None if no time is in range.
+        :param total_us: Counted time in microseconds.
+        :param is_set: Indicates a positive total was reached.
+        """
+        self.is_set = is_set
+        self.total_val = total_val
+        if total_val is not None:
+            self.total_time = timedelta(microseconds=total_us)
+            self.average = 0
+
 
 class SettingsChange:
     """ Track the time and value for a setting change. """
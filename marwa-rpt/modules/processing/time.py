@@ -21,15 +21,24 @@ are recorded. Power loss offsets assume reversion to Unix epoch in 1970, allowin
         1.0.2.3 - 02/03/2020 - Added version filter to beginning of last contiguous sequence of valid versions.
         1.0.3.0 - 03/29/2020 - Added raw -> syn time converter to work outside context of reading through batch data.
         1.0.3.1 - 04/13/2020 - Changed read_line to new format.
+        1.0.4.0 - 10/17/2026 - Synthetic times are calculated once and stored in the record store. Time checks use
+                               record store columns instead of another pass over the data.
+        1.0.5.0 - 10/17/2026 - Synthetic time offsets are calculated for the whole export at once. Out of context lookups
+                               use a sorted offset history index.
 
 """
 
 __author__ = "John Dorian for Sai Systems Technologies"
 __copyright__ = "Copyright 2019"
-__version__ = "1.0.3.1"
+__version__ = "1.0.5.0"
 
 # Built-in modules
+from bisect import bisect_left
 from datetime import datetime
+from itertools import accumulate
+
+# 3rd party modules
+import numpy as np
 
 # VOCSN modules
 from modules.models.report import Report
@@ -40,6 +49,7 @@ from modules.models.vocsn_data import VOCSNData
 from modules.processing.utilities import dt_to_ts
 from modules.models.event_types import EventControl
 from modules.readers.settings import check_patient_start
+from modules.models.records import INVALID, REPLAY, DECODED, CRC_PASS, CRC_FAIL, SYN_TIME, SYN_FLOAT
 
 
 class TimeTracker:
@@ -53,15 +63,11 @@ class TimeTracker:
         self.data = data
         self.report = report
 
-        # Times
-        self.last_raw_time = None       # Original time unchanged from data record
-        self.last_syn_time = None       # Synthetic time with offset added
-
         # Offset info
-        self.offset = 0                 # Time offset. Treated cumulatively
         self.initial_offset = 0         # Starting offset to anchor endpoint offset at 0
         self.offset_history = []        # Offset changes used for determining synthetic time out of context.
         self.history_set = False
+        self.history_index = None       # Sorted offset history keys used for out of context lookups
 
         # States
         self.unsafe_time = False
@@ -69,25 +75,20 @@ class TimeTracker:
         self.pre_time_loss_suppression = False
 
     def reset(self):
-        """ Reset for another pass. """
-        self.last_raw_time = None
-        self.last_syn_time = None
-        self.offset = self.initial_offset
+        """ Reset after a scan, anchoring offset history to the initial offset. """
         if not self.history_set:
             self.offset_history.insert(0, [0, self.initial_offset])
             self.history_set = True
+            self.history_index = None
 
-    def check_user_time_change(self, line: list):
+    def _time_change_offset(self, line: list):
         """
-        Check for a user time change event.
+        Calculate time offset from a user time change event.
         :param line: Data record line.
+        :return: Time offset.
         """
 
-        # Check for time change record
-        if (len(line) < 5) or line[3] != "6006" or line[4] not in ve.DataTypes.TIME_CHANGE or "9005" in line:
-            return
-
-        # First pass to read line
+        # Read line
         temp_line = line.copy()
         record_time = line[1]
         temp_line.insert(2, record_time)
@@ -104,50 +105,97 @@ class TimeTracker:
         after = int(line[1])
         if before is None or after is None:
             raise Exception("Time can't interpret time change.")
-        self.offset += before - after
-        if not self.history_set:
-            self.offset_history.append([int(record_time), self.offset])
+        return before - after
 
-    def check_power_loss_reset(self, line: list, evaluate: bool = False):
+    def calc_synthetic_times(self, tar: TarManager):
         """
-        Check for the signature of a power reset.
-        :param line: Data record line.
-        :param evaluate: Evaluate the last power reset event.
+        Calculate synthetic times for all batch records at once and store them in the record store. Offsets from user
+        time changes and power loss resets are accumulated over the whole export in one pass.
+        :param tar: TAR manager.
+        :return: Indices of records with synthetic times.
         """
 
-        # Check if time moves backward, indicating a time loss
-        record_time = int(line[1])
-        if self.last_raw_time is None:
-            self.last_raw_time = record_time
-        reference = self.last_raw_time - 10
-        if (len(line) < 5) or line[3] != "6006" or line[4] not in ve.DataTypes.TIME_CHANGE:
-            if record_time < reference:
-
-                # Mark beginning of unset time
-                # Synthetic time must be calculated later
-                if evaluate:
-                    self.unsafe_time_sequence_num = int(line[0])
-
-                # Calculate time offset based on last time recorded if available
-                self.offset += self.last_raw_time - record_time
-                if not self.history_set:
-                    self.offset_history.append([record_time, self.offset])
+        # References
+        em = self.em
+        store = tar.records
+        count = len(store)
+        width = store.width + store.has(CRC_PASS | CRC_FAIL)
+        rows = store.has(REPLAY) & store.has(DECODED)
+        increment = np.zeros(count, dtype=np.float64)
+        float_change = np.zeros(count, dtype=bool)
+        time_change = np.zeros(count, dtype=bool)
+        applied = np.zeros(count, dtype=bool)
+        errors = np.zeros(count, dtype=bool)
+
+        # Interpret user time changes, following version changes so the matching metadata is used
+        candidates = rows & (width >= 5) & (store.message_id == 6006)
+        for idx in np.flatnonzero(candidates | (store.message_id == 7000)):
+            line, _, _ = tar.read_record(em, idx)
+            if not candidates[idx] or line[4] not in ve.DataTypes.TIME_CHANGE:
+                continue
+            time_change[idx] = True
+            if "9005" in line:
+                continue
+            try:
+                change = self._time_change_offset(line)
+                increment[idx] = change
+                float_change[idx] = isinstance(change, float)
+                applied[idx] = True
+            except Exception as e:
+                e.ignore = True
+                store.time_errors[idx] = e
+                errors[idx] = True
 
-        # Save last records
-        self.last_raw_time = record_time
+        # Records without readable times
+        for idx in np.flatnonzero(rows & ~errors & (store.raw_time == INVALID)):
+            try:
+                int(store.parts(idx)[1])
+            except Exception as e:
+                e.ignore = True
+                store.time_errors[idx] = e
+                errors[idx] = True
+
+        # Detect power loss resets where time moves backward
+        chain = np.flatnonzero(rows & ~errors)
+        if len(chain) == 0:
+            return chain
+        raw = store.raw_time[chain]
+        last_raw = np.concatenate((raw[:1], raw[:-1]))
+        reset = ~time_change[chain] & (raw < last_raw - 10)
+        increment[chain[reset]] = (last_raw - raw)[reset]
+        applied[chain[reset]] = True
+
+        # Mark beginning of unset time at the last power loss reset
+        # Synthetic time must be calculated later
+        reset_seq = store.sequence[chain[reset]]
+        reset_seq = reset_seq[reset_seq != INVALID]
+        if len(reset_seq):
+            self.unsafe_time_sequence_num = int(reset_seq[-1])
+
+        # Accumulate offsets and store synthetic times
+        offset = np.cumsum(increment[chain])
+        is_float = np.logical_or.accumulate(float_change[chain])
+        store.syn_time[chain] = np.rint(raw + offset).astype(np.int64)
+        store.flags[chain] |= SYN_TIME
+        store.flags[chain[is_float]] |= SYN_FLOAT
+
+        # Record offset changes for out of context lookups
+        if not self.history_set:
+            for pos in np.flatnonzero(applied[chain]):
+                change_offset = float(offset[pos]) if is_float[pos] else int(offset[pos])
+                self.offset_history.append([int(raw[pos]), change_offset])
+        return chain
 
-    def set_synthetic_time(self, line: list):
+    def insert_synthetic_time(self, line: list, idx: int):
         """
-        Apply time offsets to record an insert. To be used only while reading batch data.
+        Insert synthetic time calculated during the report offset scan. To be used only while reading batch data.
         :param line: Data record line.
+        :param idx: Record index in TAR manager record store.
         """
-
-        # Calculate synthetic time
-        raw_time = int(line[1])
-        syn_time = raw_time + self.offset
-
-        # Store in record line
-        line.insert(2, syn_time)
+        store = self.data.tar_manager.records
+        if not store.flags[idx] & SYN_TIME:
+            raise store.time_errors.get(idx, Exception("No synthetic time for record"))
+        line.insert(2, store.syn_value(idx))
 
     def get_synthetic_time(self, ts):
         """
@@ -155,11 +203,18 @@ class TimeTracker:
         :param ts: Raw timestamp
         :return: Synthetic timestamp
         """
-        raw_ts = float(ts)
-        offset = 0
-        for off_change in self.offset_history:
-            if raw_ts > off_change[0]:
-                offset = off_change[1]
+
+        # Index history by raw time, tracking the latest change at or before each key
+        if self.history_index is None:
+            order = sorted(range(0, len(self.offset_history)), key=lambda i: self.offset_history[i][0])
+            keys = [self.offset_history[i][0] for i in order]
+            latest = list(accumulate(order, max))
+            self.history_index = keys, latest
+
+        # Use the offset from the latest change recorded before the timestamp
+        keys, latest = self.history_index
+        pos = bisect_left(keys, float(ts))
+        offset = self.offset_history[latest[pos - 1]][1] if pos > 0 else 0
         return ts + offset
 
 
@@ -175,6 +230,7 @@ def set_report_offset(em: ErrorManager, data: VOCSNData, report: Report, tar: Ta
     # Vars and references
     old_time = 1262304000  # 1/1/2010 00:00:00
     tm = data.time_manager = TimeTracker(em, data, report)
+    store = tar.records
     a_time = dt_to_ts(report.export_date)
     # a_time = data.tar_manager.last_accessed  # Time TAR file was accessed
     syn_time = 0
@@ -186,39 +242,20 @@ def set_report_offset(em: ErrorManager, data: VOCSNData, report: Report, tar: Ta
         # Disable error tracking until patient reset reached
         em.disable_tracking()
 
-        # Get one line at a time from tar archive to assess time changes
-        line = None
-        while tar.more_lines:
-
-            # ----- Read and validate line ----- #
+        # Calculate synthetic times for all records
+        chain = tm.calc_synthetic_times(tar)
 
-            # Read line from file
-            line, _, _ = tar.read_line(em)
+        # Track last event time in case therapies must be stopped at end of available data
+        if len(chain):
+            raw_time = int(store.raw_time[chain[-1]])
+            syn_time = int(store.syn_value(chain[-1]))
 
-            # Ignore blank lines
-            if not line:
-                continue
-
-            # Catch record errors
-            try:
-
-                # Check for user time change
-                tm.check_user_time_change(line)
-
-                # Check for power failure/device reset
-                # Evaluate the final power loss event this pass only
-                tm.check_power_loss_reset(line, evaluate=True)
-
-                # Use current time offset to determine synthetic sequence time
-                tm.set_synthetic_time(line)
-
-                # Track last event time in case therapies must be stopped at end of available data
-                raw_time = int(line[1])
-                syn_time = int(line[2])
-
-            # Ignore individual errors at this state
-            except Exception as e:
-                e.ignore = True
+        # Last record, for reference
+        line = None
+        if len(store) and store.flags[-1] & REPLAY:
+            line = store.parts(len(store) - 1)
+            if store.flags[-1] & SYN_TIME:
+                line.insert(2, store.syn_value(len(store) - 1))
 
         # Restore error tracking
         em.enable_tracking()
@@ -238,6 +275,9 @@ def set_report_offset(em: ErrorManager, data: VOCSNData, report: Report, tar: Ta
         message = "Error while scanning time"
         em.log_error(ve.Programs.REPORTING, ve.ErrorCat.PROCESS_ERROR, ve.ErrorSubCat.INVALID_TAR, message, e)
 
+    # Anchor stored synthetic times to report offset
+    store.offset_syn_time(tm.initial_offset)
+
     # Reset trackers
     tm.reset()
     tar.reset()
@@ -257,56 +297,59 @@ def check_time(em: ErrorManager, data: VOCSNData, report: Report, tar: TarManage
     """
 
     # Vars and references
-    first = True
-    version_start = False
     syn_time = datetime(year=2000, month=1, day=1)
     tm = data.time_manager
+    store = tar.records
 
     # Catch errors
     try:
 
-        # Get one line at a time from tar archive to assess time changes
-        while tar.more_lines:
-
-            # ----- Read and validate line ----- #
-
-            # Read line from file
-            line, _, _ = tar.read_line(em)
-
-            # Ignore blank lines
-            if not line or line == []:
-                continue
+        # Records with synthetic times and sequence numbers
+        usable = store.has(REPLAY) & store.has(DECODED) & store.has(SYN_TIME) & (store.sequence != INVALID)
+        usable_idx = np.flatnonzero(usable)
+
+        # Records long enough to check message ID and version fields
+        width = store.width + store.has(CRC_PASS | CRC_FAIL)
+        checked = usable & (width >= 4) & ~((store.message_id == 7000) & (width < 5))
+        checked_idx = np.flatnonzero(checked)
+
+        # Capture first record and record power-up event times
+        events = set()
+        if len(checked_idx):
+            events.add(checked_idx[0])
+        vent_start = checked & (store.message_id == int(ve.EventIDs.VENT_START))
+        data.power_up_times += [store.syn_value(idx) for idx in np.flatnonzero(vent_start)]
+
+        # Constrain to most recent software version
+        version_idx = None
+        for idx in np.flatnonzero(checked & (store.message_id == 7000)):
+            if store.parts(idx)[4].strip('"') == data.first_version:
+                version_idx = idx
+                events.add(idx)
+                break
+
+        # Found time loss events
+        if tm.unsafe_time_sequence_num is not None:
+            events.update(np.flatnonzero(checked & (store.sequence == tm.unsafe_time_sequence_num)))
+
+        # Apply range constraints in record order
+        for idx in sorted(events):
 
             # Catch errors
             try:
 
                 # Disable error tracking until patient reset reached
                 em.disable_tracking()
-
-                # Check for user time change
-                tm.check_user_time_change(line)
-
-                # Check for power failure/device reset
-                tm.check_power_loss_reset(line)
-
-                # Use current time offset to determine synthetic sequence time
-                seq = int(line[0])
-                tm.set_synthetic_time(line)
-                syn_time = datetime.utcfromtimestamp(line[2])
+                seq = int(store.sequence[idx])
+                event_time = datetime.utcfromtimestamp(int(store.syn_time[idx]))
 
                 # Constrain to most recent software version
-                if line[4] == "7000" and not version_start and line[5].strip('"') == data.first_version:
-                    report.range.set_data_start(syn_time, seq)
-                    version_start = True
+                if idx == version_idx:
+                    report.range.set_data_start(event_time, seq)
 
                 # Capture first record
-                if first:
-                    report.range.set_data_start(syn_time, seq)
-                    first = False
-
-                # Record power-up event times
-                if line[4] == ve.EventIDs.VENT_START:
-                    data.power_up_times.append(line[2])
+                if idx == checked_idx[0]:
+                    report.range.set_data_start(event_time, seq)
 
                 # Restore error tracking
                 em.enable_tracking()
@@ -316,11 +359,13 @@ def check_time(em: ErrorManager, data: VOCSNData, report: Report, tar: TarManage
 
                     # Constrain range to exclude all data from before time loss
                     if not view_old:
-                        report.range.set_data_start(syn_time, seq)
+                        report.range.set_data_start(event_time, seq)
 
                         # Log and mark flags if in report range
-                        if report.range.data_start <= syn_time <= report.range.end:
+                        if report.range.data_start <= event_time <= report.range.end:
                             tm.pre_time_loss_suppression = True
+                            line = store.parts(idx)
+                            line.insert(2, store.syn_value(idx))
                             em.log_warning("Encountered power loss/time reset", line=line)
 
                     # Displaying data anyway for forensics
@@ -336,6 +381,8 @@ def check_time(em: ErrorManager, data: VOCSNData, report: Report, tar: TarManage
         em.enable_tracking()
 
         # Capture last record
+        if len(usable_idx):
+            syn_time = datetime.utcfromtimestamp(int(store.syn_time[usable_idx[-1]]))
         report.range.set_data_end(syn_time)
 
     # Time scan failed
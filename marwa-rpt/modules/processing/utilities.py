@@ -23,18 +23,21 @@ Common utilities.
         1.0.3.1 - 02/17/2020 - Switched from dict conditions to sets for performance.
         1.0.3.2 - 02/27/2020 - Changed current settings data type from str to EventVal.
         1.0.3.3 - 03/30/2020 - Added timestamp interpreter for combined log.
+        1.0.4.0 - 10/17/2026 - Added time-weighted totals over change history arrays.
+        1.0.4.1 - 10/17/2026 - Added a safe write function to match safe read.
 
 """
 
 __author__ = "John Dorian for Sai Systems Technologies"
 __copyright__ = "Copyright 2019"
-__version__ = "1.0.3.3"
+__version__ = "1.0.4.1"
 
 # Built-in modules
 import os
 from datetime import datetime, timedelta, timezone
 
 # 3rd party modules
+import numpy as np
 from reportlab.platypus import Image
 from reportlab.lib.units import inch
 
@@ -93,6 +96,55 @@ def calc_trend(t1: float = None, t2: float = None) -> (float, float):
     return trend, perc
 
 
+def time_weighted_totals(times: np.ndarray, values: np.ndarray, counted: np.ndarray, windows: list):
+    """
+    Calculate time-weighted totals of a stepped value for several time windows. Each value holds from its change time
+    until the next change, or the window end after the last change, and is only counted while its change is counted.
+    :param times: Change times in microseconds since epoch, in change order.
+    :param values: Value set by each change.
+    :param counted: Boolean mask of changes whose value counts toward the totals.
+    :param windows: List of (start, end) window times in microseconds since epoch.
+    :return: List of (value-seconds total, counted microseconds, set flag) for each window. The total is None when no
+             time falls in the window. The set flag indicates the running total was positive at any change.
+    """
+
+    # Variables
+    results = []
+    count = len(times)
+    if count == 0:
+        return [(None, 0, False) for _ in windows]
+
+    # Calculate each window
+    for start, end in windows:
+
+        # Span preceding each change, constrained to window. A span is only added once an earlier change is at or
+        # before the window end.
+        clipped = np.clip(times, start, end)
+        ready = np.logical_or.accumulate(times <= end)
+        in_window = np.zeros(count, dtype=bool)
+        in_window[1:] = (times[1:] >= start) & ready[:-1]
+        spans = np.zeros(count, dtype=np.int64)
+        spans[1:] = clipped[1:] - clipped[:-1]
+        add = in_window & (spans > 0)
+        add[1:] &= counted[:-1]
+
+        # Span after last change
+        last_span = int(end - clipped[-1])
+        add_last = last_span > 0 and counted[-1]
+
+        # Sequential running total keeps the same rounding as adding one span at a time
+        parts = np.where(add, (spans / 1e6) * np.roll(values, 1), 0.0)
+        running = np.cumsum(parts)
+        total = float(running[-1]) + (last_span / 1e6) * float(values[-1]) if add_last else float(running[-1])
+        weighted = int(spans[add].sum()) + (int(last_span) if add_last else 0)
+        is_set = bool((running > 0).any()) or total > 0
+
+        # Store results
+        started = bool(in_window.any()) or add_last
+        results.append((total if started else None, weighted, is_set))
+    return results
+
+
 def flex_float(num: float, places: int):
     """
     Round a floating point number depending on the number of digits to the left of the decimal point.
@@ -134,6 +186,21 @@ def safe_read(value):
     return value
 
 
+def safe_write(entity, field: str, value):
+    """
+    Write a value to an Azure record field safely, keeping the stored type of typed JavaScript values and plain Python
+    values alike.
+    :param entity: Azure record.
+    :param field: Field name.
+    :param value: New value.
+    """
+    current = getattr(entity, field, None)
+    if hasattr(current, "value"):
+        current.value = value
+    else:
+        setattr(entity, field, value)
+
+
 def temp_name(file_type):
     """
     Generate an available temporary file name.
@@ -31,16 +31,29 @@ representation including units.
         1.0.3.0  - 04/05/2020 - Added support for the "volume targeted" overrides.
         1.0.3.1  - 04/06/2020 - Constrained volume targeted mode override to v4.06.05 and up.
         1.0.3.2  - 04/10/2020 - Added override maintenance due value for expired emergency models.
+        1.0.4.0  - 10/17/2026 - Memoized value components and pre-read numeric formats for each parameter.
 
 """
 
 __author__ = "John Dorian for Sai Systems Technologies"
 __copyright__ = "Copyright 2019"
-__version__ = "1.0.3.2"
+__version__ = "1.0.4.0"
 
 # VOCSN modules
 from modules.models import vocsn_enum as ve
 from modules.models.errors import ErrorManager
+from modules.readers.definitions import DefinitionCache
+
+# Maximum number of memoized values and parameter decoders
+VALUE_CACHE_SIZE = 8192
+DECODER_CACHE_SIZE = 2048
+
+# Parameters with values that depend on device model or current settings, never memoized
+STATEFUL_KEYS = {"24", "12004"}
+
+# Memoized value components by parameter definition, key, raw value and display type
+value_cache = DefinitionCache(VALUE_CACHE_SIZE)
+decoder_cache = DefinitionCache(DECODER_CACHE_SIZE)
 
 
 class EventValue:
@@ -53,8 +66,51 @@ class EventValue:
         self.alt_str = alt_str
         self.enum = enum
         self.applicable = True
-        
-        
+
+
+class ParamDecoder:
+    """ Numeric scale and string format read once from a parameter definition. """
+    def __init__(self, defs: dict):
+        self.defs = defs
+
+        # Scale factor, left unset when invalid so that conversion reports the error
+        try:
+            self.scale = float(defs["scaleFactor"])
+        except (KeyError, ValueError, TypeError):
+            self.scale = None
+
+        # String format and units
+        try:
+            self.fmt = "{{0:.{}f}}".format(defs["precision"])
+            units = defs["displayUnits"]
+            if units is None or units == "":
+                self.units = ""
+            elif units == "%":
+                self.units = units
+            else:
+                self.units = " {}".format(units)
+        except KeyError:
+            self.fmt = None
+
+
+def get_decoder(param_def: dict):
+    """
+    Lookup or create the decoder for a parameter definition.
+    :param param_def: Parameter definition.
+    :return: Parameter decoder.
+    """
+    decoder = decoder_cache.get(id(param_def))
+    if decoder is None or decoder.defs is not param_def:
+        decoder = decoder_cache.put(id(param_def), ParamDecoder(param_def))
+    return decoder
+
+
+def clear_value_cache():
+    """ Drop memoized values and decoders, used when metadata definitions are swapped. """
+    value_cache.clear()
+    decoder_cache.clear()
+
+
 def read_ratio(value):
     """ Convert a number to a ratio. """
     
@@ -80,7 +136,63 @@ def read_ratio(value):
 
 def get_vals(em: ErrorManager, data, param_def: dict, key: str, name: str, val_in: str, display_type: str = None,
              val_only: bool = False, allow_blank: bool = False, preset=None):
-    """ Interpret values based on their parameter definitions. """
+    """ Interpret values based on their parameter definitions. Values that decode without errors are memoized. """
+
+    # Require valid input
+    if not val_in:
+        return None
+
+    # Lookup memoized value components
+    parts = None
+    cache_key = None
+    if key not in STATEFUL_KEYS:
+        cache_key = (id(param_def), key, val_in, display_type)
+        entry = value_cache.get(cache_key)
+        if entry is not None and entry[0] is param_def:
+            parts = entry[1]
+
+    # Decode value, only memoizing values that did not log errors
+    if parts is None:
+        parts, clean = _decode_vals(em, data, get_decoder(param_def), key, val_in, display_type, preset)
+        if parts is None:
+            return None
+        if clean and cache_key is not None:
+            value_cache.put(cache_key, (param_def, parts))
+    num, string, enum, alt_string = parts
+
+    # Don't generate blanks
+    if num is None and string == "":
+        if allow_blank:
+            return EventValue(key, name, None, None)
+        else:
+            return None
+
+    # Return value
+    if val_only:
+        return num
+    else:
+        return EventValue(key, name, num, string, enum, alt_string)
+
+
+def _decode_vals(em: ErrorManager, data, decoder: ParamDecoder, key: str, val_in: str, display_type: str = None,
+                 preset=None):
+    """
+    Decode value components based on parameter definitions.
+    :param em: Error manager.
+    :param data: VOCSN data container.
+    :param decoder: Parameter decoder.
+    :param key: Parameter key.
+    :param val_in: Raw value.
+    :param display_type: Optional display type override.
+    :param preset: Preset used for setting overrides.
+    :return: Numeric, string, enum and alternate string values, or None if invalid; true if no errors were logged.
+    """
+    clean = True
+
+    def _log_error(*args, **kwargs):
+        nonlocal clean
+        clean = False
+        em.log_error(*args, **kwargs)
 
     def _get_scaled_num(defs: dict, val: str):
         try:
@@ -88,15 +200,19 @@ def get_vals(em: ErrorManager, data, param_def: dict, key: str, name: str, val_i
                 return None
             if val is not None and val != "":
                 val = float(val)
+                if decoder.scale is not None:
+                    return val * decoder.scale
                 return val * float(defs["scaleFactor"])
         except (ValueError, TypeError) as error:
             m = "Invalid numeric value"
-            em.log_error(ve.Programs.REPORTING, ve.ErrorCat.MID_ERROR, ve.ErrorSubCat.INVALID_REC, m, error,
-                         p_id=defs["tagName"], val=val)
+            _log_error(ve.Programs.REPORTING, ve.ErrorCat.MID_ERROR, ve.ErrorSubCat.INVALID_REC, m, error,
+                     p_id=defs["tagName"], val=val)
         return None
 
     def _get_string(defs: dict, val):
         if val is not None and val != "":
+            if decoder.fmt is not None:
+                return decoder.fmt.format(val) + decoder.units
             val = "{0:.{1}f}".format(val, defs["precision"])
             units = defs["displayUnits"]
             if units is not None and units != "":
@@ -115,15 +231,12 @@ def get_vals(em: ErrorManager, data, param_def: dict, key: str, name: str, val_i
                 return val
         except TypeError as error:
             m = "Invalid ratio value ({}) for parameter: {}".format(val, defs["tagName"])
-            em.log_error(ve.Programs.REPORTING, ve.ErrorCat.MID_ERROR, ve.ErrorSubCat.INVALID_REC, m, error,
-                         p_id=defs["tagName"], val=val)
-        return None
-
-    # Require valid input
-    if not val_in:
+            _log_error(ve.Programs.REPORTING, ve.ErrorCat.MID_ERROR, ve.ErrorSubCat.INVALID_REC, m, error,
+                     p_id=defs["tagName"], val=val)
         return None
 
     # References
+    param_def = decoder.defs
     d = param_def
     d_class = "custom"
     if "data_class" in d:
@@ -165,8 +278,8 @@ def get_vals(em: ErrorManager, data, param_def: dict, key: str, name: str, val_i
             else:
                 message = "Error while processing monitor value"
                 e = Exception("Invalid monitor enum value".format(val_in, key))
-                em.log_error(ve.Programs.REPORTING, ve.ErrorCat.MID_ERROR, ve.ErrorSubCat.INVALID_REC, message, e,
-                             p_id=key, val=val_in)
+                _log_error(ve.Programs.REPORTING, ve.ErrorCat.MID_ERROR, ve.ErrorSubCat.INVALID_REC, message, e,
+                           p_id=key, val=val_in)
                 string = val_in
 
         # Ration monitor
@@ -226,9 +339,9 @@ def get_vals(em: ErrorManager, data, param_def: dict, key: str, name: str, val_i
         else:
             message = "Error while processing alarm value"
             e = Exception("Invalid alarm type")
-            em.log_error(ve.Programs.REPORTING, ve.ErrorCat.MID_ERROR, ve.ErrorSubCat.INVALID_REC, message, e,
-                         rec_type=ve.RecordType.EVENT, r_id=d_type)
-            return None
+            _log_error(ve.Programs.REPORTING, ve.ErrorCat.MID_ERROR, ve.ErrorSubCat.INVALID_REC, message, e,
+                       rec_type=ve.RecordType.EVENT, r_id=d_type)
+            return None, False
 
     # Setting
     elif d_class == "Setting":
@@ -254,8 +367,8 @@ def get_vals(em: ErrorManager, data, param_def: dict, key: str, name: str, val_i
 
                     # Invalid data
                     e = Exception("Invalid setting on/off value")
-                    em.log_error(ve.Programs.REPORTING, ve.ErrorCat.MID_ERROR, ve.ErrorSubCat.INVALID_REC, message, e,
-                                 p_id=key, val=val_in)
+                    _log_error(ve.Programs.REPORTING, ve.ErrorCat.MID_ERROR, ve.ErrorSubCat.INVALID_REC, message, e,
+                               p_id=key, val=val_in)
 
                 # Blank strings mean a value is required to be "ON"
                 if string == "":
@@ -300,8 +413,8 @@ def get_vals(em: ErrorManager, data, param_def: dict, key: str, name: str, val_i
 
                 # Invalid data
                 e = Exception("Invalid setting enum value")
-                em.log_error(ve.Programs.REPORTING, ve.ErrorCat.MID_ERROR, ve.ErrorSubCat.INVALID_REC, message, e,
-                             p_id=key, val=val_in)
+                _log_error(ve.Programs.REPORTING, ve.ErrorCat.MID_ERROR, ve.ErrorSubCat.INVALID_REC, message, e,
+                           p_id=key, val=val_in)
 
             # Special filters
             if val_in == "13002":
@@ -318,8 +431,8 @@ def get_vals(em: ErrorManager, data, param_def: dict, key: str, name: str, val_i
         # Unexpected value type
         else:
             e = Exception("Unknown setting value type")
-            em.log_error(ve.Programs.REPORTING, ve.ErrorCat.MID_ERROR, ve.ErrorSubCat.INVALID_REC, message, e, p_id=key,
-                         val=d_type)
+            _log_error(ve.Programs.REPORTING, ve.ErrorCat.MID_ERROR, ve.ErrorSubCat.INVALID_REC, message, e, p_id=key,
+                       val=d_type)
 
     # Custom definitions found in pre-use test
     elif d_class == "custom":
@@ -338,9 +451,9 @@ def get_vals(em: ErrorManager, data, param_def: dict, key: str, name: str, val_i
         # Unexpected value type
         else:
             e = Exception("Unknown value type")
-            em.log_error(ve.Programs.REPORTING, ve.ErrorCat.MID_ERROR, ve.ErrorSubCat.INVALID_REC, message, e, p_id=key,
-                         val=d_type)
-            return None
+            _log_error(ve.Programs.REPORTING, ve.ErrorCat.MID_ERROR, ve.ErrorSubCat.INVALID_REC, message, e, p_id=key,
+                       val=d_type)
+            return None, False
 
     # Data Type
     elif d_class == "DataType":
@@ -350,22 +463,12 @@ def get_vals(em: ErrorManager, data, param_def: dict, key: str, name: str, val_i
     else:
         message = "Error while reading parameter value"
         e = Exception("Unknown data class")
-        em.log_error(ve.Programs.REPORTING, ve.ErrorCat.MID_ERROR, ve.ErrorSubCat.INVALID_REC, message, e, p_id=key,
-                     val=d_class)
-        return None
+        _log_error(ve.Programs.REPORTING, ve.ErrorCat.MID_ERROR, ve.ErrorSubCat.INVALID_REC, message, e, p_id=key,
+                   val=d_class)
+        return None, False
 
-    # Don't generate blanks
-    if num is None and string == "":
-        if allow_blank:
-            return EventValue(key, name, None, None)
-        else:
-            return None
-
-    # Return value
-    if val_only:
-        return num
-    else:
-        return EventValue(key, name, num, string, enum, alt_string)
+    # Return components
+    return (num, string, enum, alt_string), clean
 
 
 def norm_val(val, ratio):
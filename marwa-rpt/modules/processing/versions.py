@@ -6,18 +6,20 @@ Functions for looking up and selecting version specific definition files.
         1.0.0.0 - 10/05/2019 - Created file with read_metadata.
         1.0.0.1 - 04/07/2020 - Added working directory context.
         1.0.0.2 - 04/10/2020 - Override default version mapping for v4.08.XX until proper metadata is available.
+        1.0.0.3 - 10/17/2026 - Definition directory listing is cached.
 
 """
 
 __author__ = "John Dorian for Sai Systems Technologies"
 __copyright__ = "Copyright 2019"
-__version__ = "1.0.0.2"
+__version__ = "1.0.0.3"
 
 # Built-in modules
 import os
 
 # VOCSN modules
 from modules.models.errors import ErrorManager
+from modules.readers.definitions import list_definitions
 
 
 def check_ver(em: ErrorManager, ver: str, w_dir: str = ""):
@@ -55,7 +57,7 @@ def check_ver(em: ErrorManager, ver: str, w_dir: str = ""):
         # Check for specific version
         # Identify latest available version
         md_path = os.path.join(w_dir, "definitions", "metadata")
-        for filename in os.listdir(md_path):
+        for filename in list_definitions(md_path):
             filename = str(filename)
             if filename.endswith(".json") and "TrendMetaData" in filename:
                 file_ver_name = filename.replace('TrendMetaData_', '').split('.')[0]
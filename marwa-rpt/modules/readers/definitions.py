@@ -0,0 +1,291 @@
+#!/usr/bin/env python
+"""
+Process-wide cache for version definitions. Indexed metadata, label strings, report settings and applicability classes
+are loaded once per version, so a version change while reading records only swaps references. The cache can be warmed
+in a parent process so that forked workers start with all definitions loaded.
+
+Definitions can also be compiled into one pre-indexed bundle per version. Each bundle records a checksum of its source
+files, and a source file that no longer matches is read from JSON instead. Source files are only hashed when their
+size or modification time differs from the one recorded.
+
+    Version Notes:
+        1.0.0.0 - 10/17/2026 - Created file with least-recently-used definition cache and warm-up function.
+        1.0.1.0 - 10/17/2026 - Added compiled definition bundles with source checksums.
+        1.0.1.1 - 10/17/2026 - Source size and modification time are compared before hashing a source file.
+
+"""
+
+__author__ = "John Dorian for Sai Systems Technologies"
+__copyright__ = "Copyright 2026"
+__version__ = "1.0.1.1"
+
+# Built-in modules
+import os
+import json
+import pickle
+import hashlib
+from collections import OrderedDict
+
+# Maximum number of entries held per cache
+CACHE_SIZE = 16
+
+# Compiled bundle format, incremented whenever bundle contents change
+BUNDLE_FORMAT = 1
+BUNDLE_DIR = os.path.join("definitions", "compiled")
+
+
+class DefinitionCache:
+    """ Least-recently-used cache for loaded definitions. """
+
+    def __init__(self, size: int = CACHE_SIZE):
+        """
+        Initialize.
+        :param size: Maximum number of entries.
+        """
+        self.size = size
+        self.entries = OrderedDict()
+
+    def __contains__(self, key):
+        """ Check if key is cached. """
+        return key in self.entries
+
+    def __len__(self):
+        """ Number of cached entries. """
+        return len(self.entries)
+
+    def get(self, key):
+        """
+        Lookup a cached entry and mark it as recently used.
+        :param key: Cache key.
+        :return: Cached entry, or None if not cached.
+        """
+        if key not in self.entries:
+            return None
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def put(self, key, value):
+        """
+        Store an entry, dropping the least recently used entry if full.
+        :param key: Cache key.
+        :param value: Entry to store.
+        :return: Stored entry.
+        """
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        """ Remove all entries. """
+        self.entries.clear()
+
+
+# Process-wide caches
+directory_cache = DefinitionCache()
+metadata_cache = DefinitionCache()
+labels_cache = DefinitionCache()
+settings_cache = DefinitionCache()
+applicability_cache = DefinitionCache()
+bundle_cache = DefinitionCache()
+verified_cache = DefinitionCache()  # Source file stats already matched to a bundle checksum
+
+
+def list_definitions(path: str):
+    """
+    List a definition directory, reusing earlier listings.
+    :param path: Directory path.
+    :return: Sorted file names.
+    """
+    key = os.path.abspath(path)
+    listing = directory_cache.get(key)
+    if listing is None:
+        listing = directory_cache.put(key, tuple(sorted(os.listdir(path))))
+    return listing
+
+
+def clear_definitions():
+    """ Empty all definition caches. """
+    for cache in [directory_cache, metadata_cache, labels_cache, settings_cache, applicability_cache, bundle_cache,
+                  verified_cache]:
+        cache.clear()
+
+
+def warm_definitions(w_dir: str = ""):
+    """
+    Load definitions for every available version into the process-wide caches. Intended to be called before worker
+    processes are forked.
+    :param w_dir: Working directory.
+    :return: Names of versions loaded.
+    """
+
+    # Import here to prevent circular reference
+    from modules.readers.strings import load_label_strings
+    from modules.readers.settings import load_settings_by_ver
+    from modules.readers.metadata import load_metadata_bundle
+    from modules.processing.applicability import get_applicability_class
+
+    # Variables
+    loaded = []
+
+    # Load each version with a local metadata file
+    md_path = os.path.join(w_dir, "definitions", "metadata")
+    for filename in list_definitions(md_path):
+        if not (filename.endswith(".json") and "TrendMetaData" in filename):
+            continue
+        ver = filename.replace('TrendMetaData_', '').split('.')[0]
+
+        # Catch errors so that one bad version does not block the others
+        try:
+            load_metadata_bundle(os.path.join(md_path, filename), ver)
+            load_label_strings(os.path.join(w_dir, "definitions", "strings", "labels_{}.json".format(ver)), ver)
+            load_settings_by_ver(ver)
+            get_applicability_class(ver)
+            loaded.append(ver)
+        except Exception as e:
+            print("Unable to preload definitions for version {}: {}".format(ver, e))
+
+    # Return loaded versions
+    return loaded
+
+
+def source_checksum(fn: str, extra: bytes = b""):
+    """
+    Calculate checksum of a definition source file.
+    :param fn: Source file path.
+    :param extra: Additional content that the compiled form depends on.
+    :return: Hex digest.
+    """
+    checksum = hashlib.sha1(extra)
+    with open(fn, 'rb') as file:
+        checksum.update(file.read())
+    return checksum.hexdigest()
+
+
+def source_stat(fn: str, extra: bytes = b""):
+    """
+    Get values that change whenever a definition source file or its additional content changes, without reading it.
+    :param fn: Source file path.
+    :param extra: Additional content that the compiled form depends on.
+    :return: File size, modification time and checksum of additional content.
+    """
+    stat = os.stat(fn)
+    return [stat.st_size, stat.st_mtime_ns, hashlib.sha1(extra).hexdigest()]
+
+
+def find_bundle(ver: str, w_dir: str = ""):
+    """
+    Construct expected path of a compiled definition bundle.
+    :param ver: VOCSN software version name.
+    :param w_dir: Working directory.
+    :return: Bundle file path.
+    """
+    fn = os.path.join(w_dir, BUNDLE_DIR, "definitions_{}.pickle".format(ver))
+    if not os.path.exists(fn):
+        fn = os.path.join("..", fn)
+    return fn
+
+
+def read_bundle(ver: str):
+    """
+    Read a compiled definition bundle. Unreadable bundles and bundles in another format are ignored.
+    :param ver: VOCSN software version name.
+    :return: Bundle dictionary, or None if not available.
+    """
+
+    # Lookup previous reads, including missing bundles
+    fn = find_bundle(ver)
+    key = os.path.abspath(fn)
+    if key in bundle_cache:
+        return bundle_cache.get(key)
+
+    # Access file
+    bundle = None
+    if os.path.exists(fn):
+        try:
+            with open(fn, 'rb') as file:
+                bundle = pickle.load(file)
+            if type(bundle) is not dict or bundle.get("format") != BUNDLE_FORMAT:
+                bundle = None
+        except Exception as e:
+            print("Ignoring unreadable definition bundle {}: {}".format(fn, e))
+            bundle = None
+    return bundle_cache.put(key, bundle)
+
+
+def load_compiled(ver: str, kind: str, fn: str, extra: bytes = b""):
+    """
+    Lookup compiled definitions for a source file.
+    :param ver: VOCSN software version name.
+    :param kind: Definition kind ("metadata", "labels" or "settings").
+    :param fn: Source file path.
+    :param extra: Additional content that the compiled form depends on.
+    :return: Compiled definitions, or None if no bundle matches the current source file.
+    """
+    bundle = read_bundle(str(ver))
+    if not bundle or kind not in bundle["sources"]:
+        return None
+
+    # Compare size and modification time first, only hashing the source when they differ
+    checksum = bundle["sources"][kind]
+    stat = source_stat(fn, extra)
+    key = (os.path.abspath(fn), checksum)
+    if stat != bundle.get("stats", {}).get(kind) and stat != verified_cache.get(key):
+        if checksum != source_checksum(fn, extra):
+            return None
+        verified_cache.put(key, stat)
+    return bundle[kind]
+
+
+def compile_definitions(w_dir: str = ""):
+    """
+    Compile metadata, label strings and report settings of each version into a single bundle file.
+    :param w_dir: Working directory.
+    :return: Paths of bundles written.
+    """
+
+    # Import here to prevent circular reference
+    from modules.readers.metadata import METADATA_SALT, parse_metadata_file
+
+    # Collect source files of each version
+    sources = {}
+    kinds = [("metadata", os.path.join(w_dir, "definitions", "metadata"), "TrendMetaData_"),
+             ("labels", os.path.join(w_dir, "definitions", "strings"), "labels_"),
+             ("settings", os.path.join(w_dir, "config", "settings"), "settings_")]
+    for kind, path, prefix in kinds:
+        for filename in sorted(os.listdir(path)):
+            if filename.startswith(prefix) and filename.endswith(".json"):
+                ver = filename[len(prefix):-len(".json")]
+                sources.setdefault(ver, {})[kind] = os.path.join(path, filename)
+
+    # Create output directory
+    out_dir = os.path.join(w_dir, BUNDLE_DIR)
+    if not os.path.exists(out_dir):
+        os.makedirs(out_dir)
+
+    # Compile each version
+    written = []
+    for ver, files in sorted(sources.items()):
+        bundle = {"format": BUNDLE_FORMAT, "version": ver, "sources": {}, "stats": {}}
+        for kind, fn in files.items():
+            if kind == "metadata":
+                bundle[kind] = parse_metadata_file(fn)
+                bundle["sources"][kind] = source_checksum(fn, METADATA_SALT)
+                bundle["stats"][kind] = source_stat(fn, METADATA_SALT)
+            else:
+                with open(fn, 'r') as file:
+                    content = json.load(file)
+                bundle[kind] = content["ParameterLabel"] if kind == "labels" else content
+                bundle["sources"][kind] = source_checksum(fn)
+                bundle["stats"][kind] = source_stat(fn)
+
+        # Write to a temporary file first so that readers never see a partial bundle
+        out_fn = os.path.join(out_dir, "definitions_{}.pickle".format(ver))
+        with open(out_fn + ".tmp", 'wb') as file:
+            pickle.dump(bundle, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(out_fn + ".tmp", out_fn)
+        written.append(out_fn)
+
+    # Return bundle paths
+    return written
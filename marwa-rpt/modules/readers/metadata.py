@@ -18,21 +18,165 @@ Process and organize contents of VOCSN metadata file.
         1.0.1.5 - 02/01/2020 - Updated to new log format.
         1.0.1.6 - 02/18/2020 - Updated with faster monitor indexing.
         1.0.2.0 - 03/03/2020 - Adapted to use backward-looking metadata files.
+        1.0.3.0 - 10/17/2026 - Indexed metadata is held in the process-wide definition cache, so repeated version
+                               records only swap references.
+        1.0.3.1 - 10/17/2026 - Read pre-indexed metadata from compiled definition bundles when up to date.
+        1.0.3.2 - 10/17/2026 - Internal metadata is read through load_metadata_bundle.
 
 """
 
 __author__ = "John Dorian for Sai Systems Technologies"
 __copyright__ = "Copyright 2019"
-__version__ = "1.0.2.0"
+__version__ = "1.0.3.2"
 
 # Built-in modules
 import os
 import json
+import hashlib
 
 # VOCSN modules
 from modules.models import vocsn_enum as ve
 from modules.models.errors import ErrorManager
 from modules.models.vocsn_data import VOCSNData
+from modules.readers.definitions import metadata_cache, load_compiled
+
+
+# Sections required in every metadata file
+REQUIRED_SECTIONS = ["Groupings", "METADATA_VERSION", "Messages", "Parameters"]
+
+# Custom definitions are merged into compiled metadata, so they are part of its checksum
+METADATA_SALT = json.dumps(ve.custom_metadata_parameters, sort_keys=True).encode('utf-8')
+
+
+class MetadataBundle:
+    """ Metadata organized for efficient retrieval. Shared between reports, so contents must not be modified. """
+
+    def __init__(self, md: dict):
+        """
+        Organize metadata.
+        :param md: Metadata JSON object, already checked for required sections.
+        """
+
+        # Pre-organized records
+        self.raw = md
+        self.grouping = md['Groupings']
+        self.messages = md['Messages']
+        self.parameters = md['Parameters']
+
+        # Add custom definitions to parameter list
+        for key, val in ve.custom_metadata_parameters.items():
+            self.parameters[key] = val
+
+        # Lookup therapy start, therapy stop and control data type definitions
+        self.t_start = _find_definitions(self.messages[ve.EventIDs.THERAPY_START]["KeyID"], "TherapyStartTypes",
+                                         "therapy start")
+        self.t_stop = _find_definitions(self.messages[ve.EventIDs.THERAPY_END]["KeyID"], "TherapyStopTypes",
+                                        "therapy stop")
+        self.ctrl_types = _find_definitions(self.messages[ve.EventIDs.SETTINGS_CHANGE]["KeyID"],
+                                            "ControlChangeTypes", "control data type")
+
+        # Organize data definitions
+        self.monitors = {}
+        self.settings = {}
+        self.alarms = {}
+        self.synonyms = {}
+        self.unexpected = []
+        for key, defs in self.parameters.items():
+            data_class = defs['data_class']
+            if data_class == "Monitor":
+                self.monitors[key] = defs
+            elif data_class in ["Setting", "Alarm"]:
+                self.settings[key] = defs
+            elif data_class == "Alarm":
+                self.alarms[key] = defs
+            elif data_class == "ParamSynonym":
+                self.synonyms[key] = defs
+            else:
+                self.unexpected.append(data_class)
+
+        # Populate 7201 parameter list index
+        self.params_7201 = {}
+        for key in self.messages["7201"]["KeyID"]:
+            if "_" not in key or "_N" in key:
+                key = key.split('_')[0]
+                self.params_7201[key] = self.parameters[key]
+
+    def apply(self, em: ErrorManager, data: VOCSNData):
+        """
+        Reference metadata from data container. Definition indexes accumulate across versions.
+        :param em: Error manager.
+        :param data: VOCSN data container.
+        """
+        data.metadata_raw = self.raw
+        data.metadata_grouping = self.grouping
+        data.metadata_messages = self.messages
+        data.metadata_parameters = self.parameters
+        data.metadata_t_start = self.t_start
+        data.metadata_t_stop = self.t_stop
+        data.metadata_ctrl_types = self.ctrl_types
+        data.metadata_monitors.update(self.monitors)
+        data.metadata_settings.update(self.settings)
+        data.metadata_alarms.update(self.alarms)
+        data.metadata_synonyms.update(self.synonyms)
+        data.metadata_7201.update(self.params_7201)
+        for data_class in self.unexpected:
+            em.log_warning("Unexpected parameter class", val=data_class)
+
+
+def _find_definitions(keys: list, name: str, label: str):
+    """
+    Find a type definition dictionary in a message key list.
+    :param keys: Message key list.
+    :param name: Definition name.
+    :param label: Description used in error message.
+    :return: Type definitions.
+    """
+    defs = None
+    for x in range(0, len(keys)):
+        if type(keys[x]) is dict:
+            defs = keys[x]
+    if not defs or name not in defs:
+        raise Exception("Unable to locate {} definitions in metadata".format(label))
+    return defs[name]
+
+
+def _missing_section(md: dict):
+    """ Return the first required section missing from metadata, or None. """
+    for section in REQUIRED_SECTIONS:
+        if section not in md:
+            return section
+    return None
+
+
+def parse_metadata_file(fn: str):
+    """
+    Load and index a metadata JSON file.
+    :param fn: Metadata file path.
+    :return: Indexed metadata bundle.
+    """
+    with open(fn, 'r') as file:
+        md = json.load(file)
+    section = _missing_section(md)
+    if section:
+        raise Exception("Metadata is missing section: {}".format(section))
+    return MetadataBundle(md)
+
+
+def load_metadata_bundle(fn: str, ver: str):
+    """
+    Lookup indexed metadata, reusing cached or compiled metadata if available.
+    :param fn: Metadata file path.
+    :param ver: VOCSN software version name.
+    :return: Indexed metadata bundle.
+    """
+    key = os.path.abspath(fn)
+    bundle = metadata_cache.get(key)
+    if bundle is None:
+        bundle = load_compiled(ver, "metadata", fn, METADATA_SALT)
+        if bundle is None:
+            bundle = parse_metadata_file(fn)
+        metadata_cache.put(key, bundle)
+    return bundle
 
 
 def read_metadata(em: ErrorManager, data: VOCSNData, use_int_md: bool):
@@ -51,7 +195,7 @@ def read_metadata(em: ErrorManager, data: VOCSNData, use_int_md: bool):
         if not data.gen_version:
             raise Exception("No valid VOCSN version found")
 
-        # Import metadata JSON
+        # Lookup cached or compiled internal metadata, keyed by file path
         if use_int_md:
             ver = data.gen_version
             fn = os.path.join("definitions", "metadata", "TrendMetaData_{}.json".format(ver))
@@ -59,77 +203,22 @@ def read_metadata(em: ErrorManager, data: VOCSNData, use_int_md: bool):
                 fn = os.path.join("..", fn)
             if not os.path.exists(fn):
                 raise Exception("No metadata file for version")
-            with open(fn, 'r') as file:
-                md = json.load(file)
+            bundle = load_metadata_bundle(fn, ver)
+
+        # Lookup cached metadata from file, keyed by content hash
         else:
             raw_md = data.tar_manager.metadata
-            md = json.loads(raw_md)
-
-        # Validate required sections
-        for section in ["Groupings", "METADATA_VERSION", "Messages", "Parameters"]:
-            if section not in md:
-                val = section
-                raise Exception("Metadata is missing section")
-
-        # Store pre-organized records
-        data.metadata_raw = md
-        data.metadata_grouping = md['Groupings']
-        data.metadata_messages = md['Messages']
-        data.metadata_parameters = md['Parameters']
-
-        # Add custom definitions to parameter list
-        for key, val in ve.custom_metadata_parameters.items():
-            data.metadata_parameters[key] = val
-
-        # Lookup therapy start definitions
-        start_keys = data.metadata_messages[ve.EventIDs.THERAPY_START]["KeyID"]
-        start_defs = None
-        for x in range(0, len(start_keys)):
-            if type(start_keys[x]) is dict:
-                start_defs = start_keys[x]
-        if not start_defs or "TherapyStartTypes" not in start_defs:
-            raise Exception("Unable to locate therapy start definitions in metadata")
-        data.metadata_t_start = start_defs["TherapyStartTypes"]
-
-        # Lookup therapy stop definitions
-        stop_keys = data.metadata_messages[ve.EventIDs.THERAPY_END]["KeyID"]
-        stop_defs = None
-        for x in range(0, len(stop_keys)):
-            if type(stop_keys[x]) is dict:
-                stop_defs = stop_keys[x]
-        if not stop_defs or "TherapyStopTypes" not in stop_defs:
-            raise Exception("Unable to locate therapy stop definitions in metadata")
-        data.metadata_t_stop = stop_defs["TherapyStopTypes"]
-
-        # Lookup control data types
-        ctrl_def = data.metadata_messages[ve.EventIDs.SETTINGS_CHANGE]["KeyID"]
-        ctrl_type_defs = None
-        for x in range(0, len(ctrl_def)):
-            if type(ctrl_def[x]) is dict:
-                ctrl_type_defs = ctrl_def[x]
-        if not ctrl_type_defs or "ControlChangeTypes" not in ctrl_type_defs:
-            raise Exception("Unable to locate control data type definitions in metadata")
-        data.metadata_ctrl_types = ctrl_type_defs["ControlChangeTypes"]
-
-        # Organize data definitions
-        for key, defs in md['Parameters'].items():
-            data_class = defs['data_class']
-            if data_class == "Monitor":
-                data.metadata_monitors[key] = defs
-            elif data_class in ["Setting", "Alarm"]:
-                data.metadata_settings[key] = defs
-            elif data_class == "Alarm":
-                data.metadata_alarms[key] = defs
-            elif data_class == "ParamSynonym":
-                data.metadata_synonyms[key] = defs
-            else:
-                em.log_warning("Unexpected parameter class", val=data_class)
-
-        # Populate 7201 parameter list index
-        for key in data.metadata_messages["7201"]["KeyID"]:
-            if "_" not in key or "_N" in key:
-                key = key.split('_')[0]
-                data.metadata_7201[key] = data.metadata_parameters[key]
+            key = hashlib.sha1(raw_md.encode('utf-8')).hexdigest()
+            bundle = metadata_cache.get(key)
+            if bundle is None:
+                md = json.loads(raw_md)
+                val = _missing_section(md)
+                if val:
+                    raise Exception("Metadata is missing section")
+                bundle = metadata_cache.put(key, MetadataBundle(md))
+
+        # Reference organized metadata
+        bundle.apply(em, data)
 
     # Handle errors
     except Exception as e:
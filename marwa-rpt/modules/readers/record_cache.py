@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+"""
+On-disk cache of ingested TAR files. The record store and archive index built when a TAR file is first read are saved
+under a key made from a hash of the TAR file contents and the versions of the ingest code. Later reports on the same
+export load the records from the cache instead of downloading and decoding the TAR file again.
+
+Remote data files are mapped to content hashes by small alias files, so that a cached export can be found before it is
+downloaded. Entries are marked as used on every hit, and the least recently used files are removed by evict().
+
+    Version Notes:
+        1.0.0.0 - 10/17/2026 - Created file with record cache entries, aliases and LRU eviction.
+        1.0.0.1 - 10/17/2026 - Entries include the read log, and are keyed by the error model version.
+
+"""
+
+__author__ = "John Dorian for Sai Systems Technologies"
+__copyright__ = "Copyright 2026"
+__version__ = "1.0.0.1"
+
+# Built-in modules
+import os
+import time
+import pickle
+import hashlib
+
+# Cache folder and entry format, incremented whenever entry contents change
+CACHE = "cache"
+CACHE_FORMAT = 2
+
+# File handling
+HASH_CHUNK = 1 << 20        # Read size used when hashing TAR files
+STALE_TEMP = 86400          # Seconds before an unfinished temporary file may be removed
+
+
+def cache_path():
+    """ Locate cache folder, relative to the current directory or its parent. """
+    context = ""
+    if not os.path.exists(os.path.join(context, "modules")):
+        context = ".."
+    return os.path.join(context, CACHE)
+
+
+def file_hash(filename: str):
+    """
+    Hash file contents.
+    :param filename: File path.
+    :return: SHA-256 hex digest.
+    """
+    checksum = hashlib.sha256()
+    with open(filename, 'rb') as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK), b""):
+            checksum.update(chunk)
+    return checksum.hexdigest()
+
+
+def cache_key(content_hash: str):
+    """
+    Build entry key from TAR contents and ingest code versions.
+    :param content_hash: SHA-256 of TAR file contents.
+    :return: Key string.
+    """
+
+    # Import here to prevent circular reference
+    from modules.readers import tar
+    from modules.processing import crc, utilities
+    from modules.models import records, errors
+
+    # Combine content and versions
+    parts = [content_hash, CACHE_FORMAT, tar.__version__, records.__version__, crc.__version__, utilities.__version__,
+             errors.__version__]
+    return hashlib.sha256("|".join(str(part) for part in parts).encode()).hexdigest()
+
+
+def lookup(identity: str):
+    """
+    Find the content hash of a remote data file with a cache entry.
+    :param identity: Remote file identity, including anything that changes when the file changes.
+    :return: Content hash, or None if the file has no cache entry.
+    """
+    fn = _alias_file(identity)
+    try:
+        with open(fn, 'r') as file:
+            content_hash = file.read().strip()
+    except OSError:
+        return None
+    if not _touch(_entry_file(cache_key(content_hash))):
+        return None
+    _touch(fn)
+    return content_hash
+
+
+def remember(identity: str, content_hash: str):
+    """
+    Map a remote data file to its content hash.
+    :param identity: Remote file identity.
+    :param content_hash: SHA-256 of file contents.
+    """
+    _write(_alias_file(identity), content_hash.encode())
+
+
+def load(content_hash: str):
+    """
+    Read a cache entry. Entries that can't be read are removed.
+    :param content_hash: SHA-256 of TAR file contents.
+    :return: Entry dictionary, or None if not cached.
+    """
+    fn = _entry_file(cache_key(content_hash))
+    if not _touch(fn):
+        return None
+    try:
+        with open(fn, 'rb') as file:
+            entry = pickle.load(file)
+        if entry.get("format") == CACHE_FORMAT:
+            return entry
+    except Exception as e:
+        print("Warning: Removing unreadable record cache entry.", str(e))
+    try:
+        os.remove(fn)
+    except OSError:
+        pass
+    return None
+
+
+def save(content_hash: str, entry: dict):
+    """
+    Write a cache entry.
+    :param content_hash: SHA-256 of TAR file contents.
+    :param entry: Entry dictionary.
+    """
+    entry = dict(entry, format=CACHE_FORMAT)
+    _write(_entry_file(cache_key(content_hash)), pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def evict(limit: float):
+    """
+    Remove least recently used cache files until the cache fits its size limit.
+    :param limit: Size limit in MB.
+    :return: Files removed, MB remaining.
+    """
+
+    # List cache files, oldest use first
+    path = cache_path()
+    if not os.path.exists(path):
+        return 0, 0
+    now = time.time()
+    files = []
+    for name in os.listdir(path):
+        fn = os.path.join(path, name)
+        try:
+            stat = os.stat(fn)
+        except OSError:
+            continue
+        if name.endswith(".tmp") and now - stat.st_mtime < STALE_TEMP:
+            continue
+        files.append((stat.st_mtime, stat.st_size, fn))
+    files.sort()
+
+    # Remove files until under limit
+    removed = 0
+    size = sum(file[1] for file in files)
+    for _, file_size, fn in files:
+        if size <= limit * 1048576:
+            break
+        try:
+            os.remove(fn)
+            removed += 1
+            size -= file_size
+        except OSError:
+            pass
+    return removed, size / 1048576
+
+
+def _entry_file(key: str):
+    """ Path of a cache entry. """
+    return os.path.join(cache_path(), "{}.pickle".format(key))
+
+
+def _alias_file(identity: str):
+    """ Path of a remote file alias. """
+    return os.path.join(cache_path(), "{}.alias".format(hashlib.sha256(identity.encode()).hexdigest()))
+
+
+def _touch(fn: str):
+    """ Mark a cache file as used. Returns False if it does not exist. """
+    try:
+        os.utime(fn)
+        return True
+    except OSError:
+        return False
+
+
+def _write(fn: str, contents: bytes):
+    """ Write a cache file. Write to a temporary name, then rename so that readers never see a partial file. """
+    path = os.path.dirname(fn)
+    if not os.path.exists(path):
+        os.makedirs(path, exist_ok=True)
+    temp_fn = "{}.{}.tmp".format(fn, os.getpid())
+    with open(temp_fn, 'wb') as file:
+        file.write(contents)
+    os.replace(temp_fn, fn)
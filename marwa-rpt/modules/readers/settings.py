@@ -15,18 +15,24 @@ Functions for reading settings files.
         1.0.1.2 - 04/01/2020 - Added version-only update prior to parsing record to allow for simultaneous version/model
                                change in synthetic data.
         1.0.1.3 - 04/13/2020 - Added support for modifications needed for combined log.
+        1.0.2.0 - 10/17/2026 - Patient start scan uses record store columns instead of another pass over the data.
+        1.0.2.1 - 10/17/2026 - Report settings are cached per version and read from compiled definition bundles when
+                               up to date.
 
 """
 
 __author__ = "John Dorian for Sai Systems Technologies"
 __copyright__ = "Copyright 2019"
-__version__ = "1.0.1.3"
+__version__ = "1.0.2.1"
 
 # Built-in modules
 import os
 import json
 from datetime import datetime, timedelta
 
+# 3rd party modules
+import numpy as np
+
 # VOCSN modules
 from modules.models.report import Report
 from modules.readers.tar import TarManager
@@ -34,6 +40,8 @@ from modules.models import vocsn_enum as ve
 from modules.models.errors import ErrorManager
 from modules.models.vocsn_data import VOCSNData
 from modules.processing.events import create_event_record
+from modules.readers.definitions import settings_cache, load_compiled
+from modules.models.records import INVALID, REPLAY, DECODED, CRC_PASS, CRC_FAIL, SYN_TIME
 
 
 def read_software_version(em: ErrorManager, data: VOCSNData, tar: TarManager):
@@ -60,7 +68,8 @@ def read_software_version(em: ErrorManager, data: VOCSNData, tar: TarManager):
 
 def load_settings_by_ver(ver: str):
     """
-    Load settings file that corresponds with a specified VOCSN software version.
+    Load settings file that corresponds with a specified VOCSN software version. Settings are shared between reports
+    in the same process, so they must not be modified.
     :param ver: VOCSN software version number.
     :return: Settings file loaded as JSON object.
     """
@@ -76,9 +85,15 @@ def load_settings_by_ver(ver: str):
     if not os.path.exists(fn):
         raise Exception("No settings file for version {}.".format(ver))
 
-    # Access file
-    with open(fn, 'r') as file:
-        settings = json.load(file)
+    # Lookup cached or compiled settings before accessing file
+    key = os.path.abspath(fn)
+    settings = settings_cache.get(key)
+    if settings is None:
+        settings = load_compiled(ver, "settings", fn)
+        if settings is None:
+            with open(fn, 'r') as file:
+                settings = json.load(file)
+        settings_cache.put(key, settings)
     return settings
 
 
@@ -96,53 +111,46 @@ def check_patient_start(em: ErrorManager, report: Report, data: VOCSNData, tar:
     try:
 
         # Variables and references
-        started = False
         r = report.range
-        tm = data.time_manager
+        store = tar.records
         start_fence = (report.range.start - timedelta(hours=25)).timestamp()
 
         # Disable error tracking while handling potentially out-dated data
         em.disable_tracking()
 
-        # Read all lines
-        while tar.more_lines:
-            line, _, _ = tar.read_line(em, silent=True)
-
-            # Skip invalid lines
-            if line and len(line) > 3:
-
-                # Catch errors
-                try:
+        # Valid lines with synthetic times
+        width = store.width + store.has(CRC_PASS | CRC_FAIL)
+        usable = store.has(REPLAY) & store.has(DECODED) & store.has(SYN_TIME) & (width > 3)
 
-                    # Check for user time change
-                    tm.check_user_time_change(line)
+        # Patient change records - those without sequence numbers are skipped entirely
+        patient = usable & (store.message_id == int(ve.EventIDs.PATIENT_CHANGE))
+        usable &= ~(patient & (store.sequence == INVALID))
+        patient &= usable
 
-                    # Check for power failure/device reset
-                    tm.check_power_loss_reset(line)
+        # First record no earlier than a day before the report range
+        fenced = np.flatnonzero(usable & (store.syn_time >= start_fence))
+        fence_idx = fenced[0] if len(fenced) else None
 
-                    # Set synthetic time
-                    tm.set_synthetic_time(line)
-                    c_line = line
+        # Apply in record order
+        for idx in np.flatnonzero(patient | (np.arange(len(store)) == fence_idx)):
 
-                    # Check for patient change record
-                    timestamp = int(line[2])
-                    if line and line[4] == ve.EventIDs.PATIENT_CHANGE:
+            # Catch errors
+            try:
+                c_line = store.parts(idx)
+                seq = int(store.sequence[idx])
+                dt = datetime.utcfromtimestamp(int(store.syn_time[idx]))
 
-                        # Update the patient start time
-                        seq = int(line[0])
-                        dt = datetime.utcfromtimestamp(timestamp)
-                        r.set_data_start(dt, seq)
+                # Update the patient start time
+                if patient[idx]:
+                    r.set_data_start(dt, seq)
 
-                    # Set data processing start no earlier than a day before the report range (sequence only)
-                    if timestamp >= start_fence and not started:
-                        started = True
-                        seq = int(line[0])
-                        dt = datetime.utcfromtimestamp(timestamp)
-                        r.set_data_start(dt, seq, seq_only=True)
+                # Set data processing start no earlier than a day before the report range (sequence only)
+                if idx == fence_idx and seq != INVALID:
+                    r.set_data_start(dt, seq, seq_only=True)
 
-                # Ignore individual errors at this state
-                except Exception as e:
-                    e.ignore = True
+            # Ignore individual errors at this state
+            except Exception as e:
+                e.ignore = True
 
         # Disable error tracking while handling potentially out-dated data
         em.enable_tracking()
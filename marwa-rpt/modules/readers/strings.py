@@ -7,12 +7,14 @@ Load string definitions from file.
         1.0.0.1 - 12/21/2019 - Integrated error management.
         1.0.0.2 - 01/24/2020 - Changed to generalized form of version.
         1.0.0.3 - 02/01/2020 - Updated to new log format.
+        1.0.1.0 - 10/17/2026 - Label strings are held in the process-wide definition cache.
+        1.0.1.1 - 10/17/2026 - Read label strings from compiled definition bundles when up to date.
 
 """
 
 __author__ = "John Dorian for Sai Systems Technologies"
 __copyright__ = "Copyright 2019"
-__version__ = "1.0.0.3"
+__version__ = "1.0.1.1"
 
 # Built-in modules
 import os
@@ -21,6 +23,7 @@ import json
 # VOCSN modules
 from modules.models import vocsn_enum as ve
 from modules.models.errors import ErrorManager
+from modules.readers.definitions import labels_cache, load_compiled
 
 
 def load_labels(em: ErrorManager, data, new_ver: str = None):
@@ -50,15 +53,29 @@ def load_labels(em: ErrorManager, data, new_ver: str = None):
             val = data.version
             raise Exception("No string definition file for version")
 
-        # Access file
-        with open(fn, 'r') as file:
-            strings = json.load(file)
-
         # Reference JSON definition
-        data.label_strings = strings["ParameterLabel"]
+        data.label_strings = load_label_strings(fn, ver)
 
     # Handle exceptions
     except Exception as e:
         message = "Unable to load report string definitions"
         em.log_error(ve.Programs.REPORTING, ve.ErrorCat.PROCESS_ERROR, ve.ErrorSubCat.METADATA_ERROR, message, e,
                      val=val)
+
+
+def load_label_strings(fn: str, ver: str):
+    """
+    Load parameter labels from a string definition file, reusing cached or compiled labels if available.
+    :param fn: String definition file path.
+    :param ver: VOCSN software version name.
+    :return: Parameter label definitions.
+    """
+    key = os.path.abspath(fn)
+    labels = labels_cache.get(key)
+    if labels is None:
+        labels = load_compiled(ver, "labels", fn)
+        if labels is None:
+            with open(fn, 'r') as file:
+                labels = json.load(file)["ParameterLabel"]
+        labels_cache.put(key, labels)
+    return labels
@@ -21,37 +21,69 @@ Classes and functions for handling TAR files.
         1.0.2.4 - 03/27/2020 - Improved aberrant line detection. Added additional context in error logging.
         1.0.3.0 - 03/29/2020 - Added indexing for maintenance file.
         1.0.4.0 - 04/13/2020 - Added modifications for combined log processing: track CRC results and file source.
+        1.0.5.0 - 10/17/2026 - Batch records are decoded, CRC checked and split once into a record table at load time.
+                               All later passes read from the table.
+        1.0.5.1 - 10/17/2026 - Keep one archive handle open with a member index built at load time. Member data is read
+                               by direct seek, and the handle is released with close().
+        1.0.5.2 - 10/17/2026 - Added memory-mapped reader mode for uncompressed archives. Batch lines are sliced from the
+                               map instead of copying each batch file.
+        1.0.5.3 - 10/17/2026 - CRC of all records in a batch file is verified with one batch call.
+        1.0.6.0 - 10/17/2026 - Replaced record table with columnar record store. Records are decoded on read and config
+                               lookup only visits config and version records.
+        1.0.6.1 - 10/17/2026 - Unmapped batch files are streamed through a fixed-size buffer. System log series are
+                               read into one preallocated buffer.
+        1.0.6.2 - 10/17/2026 - Memoized parameter values are dropped when a version change swaps metadata.
+        1.0.7.0 - 10/17/2026 - Ingested records and archive index are loaded from and saved to the record cache when
+                               the TAR content hash is known.
+        1.0.7.1 - 10/17/2026 - Cached records are passed in by the caller, which has already checked the entry, instead
+                               of being looked up after the TAR download was skipped.
+        1.0.7.2 - 10/17/2026 - Mapped batch files that only need trailing characters trimmed keep their lines as views
+                               of the map, so each record is copied once, into the record store.
+        1.0.7.3 - 10/17/2026 - Errors and warnings logged while reading a TAR file are saved in its record cache entry
+                               and logged again when the entry is loaded, so exports with warnings are also cached.
 
 """
 
 __author__ = "John Dorian for Sai Systems Technologies"
 __copyright__ = "Copyright 2019"
-__version__ = "1.0.4.0"
+__version__ = "1.0.7.3"
 
 # Built-in modules
 import os
 import sys
+import mmap
 import tarfile
 import hashlib
 
 # 3rd party modules
-import crc16
+import numpy as np
 
 # VOCSN modules
 from modules.models import vocsn_enum as ve
 from modules.models.errors import ErrorManager
+from modules.readers import record_cache
 from modules.readers.strings import load_labels
+from modules.processing.crc import check_crc
 from modules.processing.versions import check_ver
+from modules.processing.values import clear_value_cache
 from modules.readers.metadata import read_metadata
 from modules.processing.utilities import get_record_type
 from modules.processing.applicability import lookup_applicability
+from modules.models.records import RecordStore, VALID, REPLAY, DECODED, CRC_PASS, CRC_FAIL, NEXT_7203
+
+# Read size used when streaming member files
+READ_CHUNK = 1 << 16
+
+# Archive index values stored in the record cache
+CACHED_INDEX = ["data_found", "metadata", "batch_files", "slogger_1_files", "slogger_2_files", "device_config",
+                "crash_log", "usage_mon", "file_count", "last_sequence", "bad_records"]
 
 
 class TarManager:
     """ Container for managing contents of TAR file. """
 
     def __init__(self, em: ErrorManager, data, report, path: str, temp_dir: str, file: str, orig_hash: str = None,
-                 combo_log=False):
+                 combo_log=False, mmap_read=True, content_hash: str = None, cache_entry: dict = None):
         """
         Load a TAR file and populate the manager.
         :param em: Error manager.
@@ -62,6 +94,10 @@ class TarManager:
         :param file: TAR file name/path.
         :param orig_hash: Original MD5 file hash to ensure integrity.
         :param combo_log: Modify error management behavior for combined log processing.
+        :param mmap_read: Memory-map uncompressed archives and read batch records without copying member data.
+        :param content_hash: SHA-256 of TAR file contents. When given, ingested records are saved to the record cache.
+        :param cache_entry: Record cache entry loaded by the caller. When given, the TAR file is not opened, and member
+                            files can't be read.
         """
 
         # References
@@ -77,6 +113,16 @@ class TarManager:
         self.path = path
         self.temp_path = temp_dir
         self.combo_log = combo_log
+        self.content_hash = None if combo_log else content_hash
+        self.cache_entry = None if combo_log else cache_entry
+
+        # Archive handle and member index
+        self.archive = None
+        self.archive_file = None
+        self.archive_map = None
+        self.direct_read = False
+        self.mmap_read = mmap_read
+        self.members = {}
 
         # Files
         self.metadata = None
@@ -92,14 +138,14 @@ class TarManager:
         # Config record
         self.config_line = None
 
+        # Record store
+        self.records = RecordStore()
+
         # Reader values
         self.more_lines = False
-        self.file_data = None
-        self.current_file_idx = 0
-        self.current_line_idx = 0
+        self.current_record_idx = 0
+        self.record_idx = None
         self.current_file_name = ""
-        self.file_line_count = 0
-        self.last_file = False
         self.bad_records = 0
         self.first = True
         self.valid_version = False
@@ -108,18 +154,30 @@ class TarManager:
         self.first_valid_sequence = None
         self.last_sequence = 0
 
-        # Open and check tar file
-        self._check_files()
-        self._get_config()
+        # Load cached records, or open and check tar file, then read all batch records once
+        cached = self._load_cache()
+        if not cached:
+            checkpoint = em.checkpoint()
+            self._check_files()
+        try:
+            if not cached:
+                self._ingest()
+                self._save_cache(em.changes(checkpoint))
+            self._get_config()
+        except Exception:
+            self.close()
+            raise
 
     def _get_config(self):
         """ Locate and store initial config record. """
 
-        # Open file and step through lines
-        while self.more_lines:
+        # Step through config and version records only
+        store = self.records
+        candidates = (store.type_code == ord('C')) | (store.message_id == 7000)
+        for idx in np.flatnonzero(candidates):
 
             # Read each line
-            line, _, _ = self.read_line(self.em)
+            line, _, _ = self.read_record(self.em, idx)
 
             # Check valid lines only
             if len(line) < 3:
@@ -158,57 +216,61 @@ class TarManager:
             #     print("Error: File failed MD5 hash check.")
             #     return
 
-            # Open file
+            # Open file and keep handle for the life of the manager
+            #   Uncompressed archives are read by seeking directly to member data offsets
             file_path = os.path.join(self.path, self.temp_path, self.tar)
-            with tarfile.open(file_path) as tar:
-
-                # Identify required file
-                for member in tar.getmembers():
-
-                    # Get name and stats
-                    name = member.name
-                    low_name = name.lower()
-                    ext = name.split('.')[-1]
-                    self.last_accessed = os.stat(file_path).st_atime
-
-                    # Metadata
-                    if "trendmetadata" in low_name:
-                        f = tar.extractfile(member)
-                        self.metadata = f.read().decode('UTF-8')
-
-                    # Crash log
-                    elif "crashlog" in low_name:
-                        self.crash_log = name
-
-                    # Usage monitor data
-                    elif "usagemonitors" in low_name:
-                        self.usage_mon = name
-
-                    # Device config
-                    elif "deviceconfig" in low_name:
-                        self.device_config = name
-
-                    # System logger files
-                    elif "slogger" in low_name:
-                        if "log1" in low_name:
-                            self.slogger_1_files.append(name)
-                        elif "log2" in low_name:
-                            self.slogger_2_files.append(name)
-
-                    # Data files
-                    elif ext == "csv":
-                        name = member.name
-                        self.file_count += 1
-                        batch_str = name.split('.')[0].split('_')[-1]
-                        batch = int(batch_str)
-                        if max_batch == 0:
-                            limit_batch = _get_max_batch(batch_str)
-                        min_batch = min(min_batch, batch)
-                        max_batch = max(max_batch, batch)
-                        self.batch_files.append({
-                            "batch": batch,
-                            "name": name
-                        })
+            self.last_accessed = os.stat(file_path).st_atime
+            self.archive_file = open(file_path, 'rb')
+            self.archive = tarfile.open(fileobj=self.archive_file)
+            self.direct_read = self.archive.fileobj is self.archive_file
+            if self.direct_read and self.mmap_read:
+                self.archive_map = mmap.mmap(self.archive_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+            # Identify required file
+            for member in self.archive.getmembers():
+
+                # Index member and get name
+                name = member.name
+                low_name = name.lower()
+                ext = name.split('.')[-1]
+                self.members[name] = member
+
+                # Metadata
+                if "trendmetadata" in low_name:
+                    self.metadata = self.read_bin_file(name).decode('UTF-8')
+
+                # Crash log
+                elif "crashlog" in low_name:
+                    self.crash_log = name
+
+                # Usage monitor data
+                elif "usagemonitors" in low_name:
+                    self.usage_mon = name
+
+                # Device config
+                elif "deviceconfig" in low_name:
+                    self.device_config = name
+
+                # System logger files
+                elif "slogger" in low_name:
+                    if "log1" in low_name:
+                        self.slogger_1_files.append(name)
+                    elif "log2" in low_name:
+                        self.slogger_2_files.append(name)
+
+                # Data files
+                elif ext == "csv":
+                    self.file_count += 1
+                    batch_str = name.split('.')[0].split('_')[-1]
+                    batch = int(batch_str)
+                    if max_batch == 0:
+                        limit_batch = _get_max_batch(batch_str)
+                    min_batch = min(min_batch, batch)
+                    max_batch = max(max_batch, batch)
+                    self.batch_files.append({
+                        "batch": batch,
+                        "name": name
+                    })
 
             # Sort log file lists
             self.slogger_1_files.sort(key=lambda file: int(file[17:-4]))
@@ -219,8 +281,6 @@ class TarManager:
             if len(self.batch_files) == 0:
                 self.data_found = False
                 raise Exception("TAR file contains no batch files.")
-            else:
-                self.more_lines = True
 
             # Handle batch number rollover
             middle_batch = limit_batch * 0.5
@@ -242,112 +302,264 @@ class TarManager:
         except Exception as e:
             message = "Error while reading and indexing files"
             self.em.log_error(ve.Programs.REPORTING, ve.ErrorCat.FILE_ERROR, ve.ErrorSubCat.INVALID_TAR, message, e)
+            if not self.data_found:
+                self.close()
                 
+    def _ingest(self):
+        """
+        Decode, CRC check and split every batch record exactly once into the record store. All later passes over the
+        data are served from this store by read_line.
+        """
+
+        # Variables
+        em = self.em
+        store = self.records = RecordStore()
+        if not self.data_found:
+            store.finish()
+            return
+
+        # Read each batch file in order
+        for file_idx, batch_file in enumerate(self.batch_files):
+            self.current_file_name = batch_file["name"]
+
+            # Clean lines, keeping line numbers for error references
+            #   Lines of plain mapped files stay views of the map until stored
+            clean_lines = []
+            line_nums = []
+            trim_only = self._plain_member(self.current_file_name)
+            lines = self._iter_member_lines(self.current_file_name)
+            try:
+                for line_idx, line in enumerate(lines):
+                    line = _clean_line(line, trim_only)
+                    if line:
+                        clean_lines.append(line)
+                        line_nums.append(line_idx + 1)
+            finally:
+                lines.close()
+
+            # Verify CRC of all records in file at once, then parse
+            crc_passed, _ = check_crc(clean_lines)
+            for idx, line in enumerate(clean_lines):
+                parts, flags = self._parse_line(em, line, bool(crc_passed[idx]), file_idx, line_nums[idx])
+                store.append(line, parts, file_idx, flags)
+
+        # Build columns
+        store.finish()
+
+        # Ready for first pass
+        self.current_record_idx = 0
+        self.more_lines = len(store) > 0
+
+    def _load_cache(self):
+        """
+        Load records and archive index from the record cache entry, and log the errors and warnings of the first read.
+        :return: True if loaded.
+        """
+        entry = self.cache_entry
+        if not entry:
+            return False
+        self.cache_entry = None
+        for name in CACHED_INDEX:
+            setattr(self, name, entry[name])
+        self.em.replay(entry["log"])
+        self.records = RecordStore.from_columns(entry["records"])
+        self.current_record_idx = 0
+        self.more_lines = len(self.records) > 0
+        return True
+
+    def _save_cache(self, log: dict):
+        """
+        Save records, archive index and read log to the record cache.
+        :param log: Errors and warnings logged while reading the TAR file.
+        """
+        if not self.content_hash or not self.data_found:
+            return
+
+        # Catch errors, since the report does not depend on the cache
+        try:
+            entry = {name: getattr(self, name) for name in CACHED_INDEX}
+            entry["records"] = self.records.columns()
+            entry["log"] = log
+            record_cache.save(self.content_hash, entry)
+        except Exception as e:
+            print("Warning: Unable to save record cache entry.", str(e))
+
+    def _plain_member(self, filename: str):
+        """
+        Check if the lines of a mapped member file only need trailing characters trimmed. This is the case when carriage
+        returns only appear at line ends and no comma-space separators are used.
+        :param filename: Name of file to check.
+        :return: True if lines can be trimmed in place.
+        """
+
+        # Only mapped members are read as views
+        if not self.archive_map:
+            return False
+        member = self.members[filename]
+        if member.size == 0:
+            return True
+
+        # Scan member bytes in place
+        data = np.frombuffer(self.archive_map, dtype=np.uint8, count=member.size, offset=member.offset_data)
+        cr = np.flatnonzero(data == ord('\r'))
+        follow = data[np.minimum(cr + 1, member.size - 1)]
+        if not np.all((cr + 1 == member.size) | (follow == ord('\n'))):
+            return False
+        return not np.any((data[:-1] == ord(',')) & (data[1:] == ord(' ')))
+
+    def _iter_member_lines(self, filename: str):
+        """
+        Step through the lines of a member file. Memory-mapped archives yield memoryview slices over the member byte
+        range, and other archives are read through a fixed-size buffer, so member data is never copied as a whole.
+        :param filename: Name of file to access.
+        :return: Line iterator.
+        """
+
+        # Archive not mapped - stream member in chunks, carrying partial lines to the next chunk
+        if not self.archive_map:
+            stream = self.archive.extractfile(self.members[filename])
+            try:
+                pending = b''
+                chunk = stream.read(READ_CHUNK)
+                while chunk:
+                    lines = (pending + chunk).split(b'\n')
+                    pending = lines.pop()
+                    yield from lines
+                    chunk = stream.read(READ_CHUNK)
+                yield pending
+            finally:
+                stream.close()
+            return
+
+        # Step through member byte range
+        member = self.members[filename]
+        start = member.offset_data
+        end = start + member.size
+        view = memoryview(self.archive_map)
+        try:
+            while start <= end:
+                stop = self.archive_map.find(b'\n', start, end)
+                if stop < 0:
+                    stop = end
+                yield view[start:stop]
+                start = stop + 1
+        finally:
+            view.release()
+
+    def _parse_line(self, em: ErrorManager, line: bytes, crc_passed: bool, file_idx: int, line_num: int):
+        """
+        Decode and split a single cleaned batch file line.
+        :param em: Error manager.
+        :param line: Cleaned line from batch file.
+        :param crc_passed: Result of batch CRC check for this line.
+        :param file_idx: Index of source batch file.
+        :param line_num: Line number within source batch file.
+        :return: Split record values, record flags.
+        """
+
+        # Required variables
+        flags = 0
+        line_parts = []
+        r_type = ve.RecordType.UNKNOWN
+        sub_cat = ve.ErrorSubCat.INVALID_REC
+
+        # Catch errors during line parsing
+        try:
+
+            # Decode and split line to parts
+            line_parts = str(line, 'utf-8').split(',')
+            flags |= DECODED
+            r_type = get_record_type((line_parts[2]), line_parts[3])
+
+            # Check sequence numbering
+            seq = int(line_parts[0])
+            last_seq = self.last_sequence
+            self.last_sequence = seq
+            if last_seq + 1 != seq and seq > 1:
+                missing = str(self.last_sequence-1)
+                em.log_warning("Missing sequence number", ref_id=missing)
+
+            # Apply CRC result
+            int(line_parts[-1])
+            crc_result = CRC_PASS
+            if not crc_passed:
+                crc_result = CRC_FAIL
+                self.bad_records += 1
+                if not self.combo_log:
+                    sub_cat = ve.ErrorSubCat.CRC_FAILED
+                    raise Exception("Data record failed CRC check")
+
+            # Record passed all checks
+            return line_parts, flags | crc_result | VALID | REPLAY
+
+        # Handle line parsing errors
+        except Exception as e:
+            if self.bad_records >= 20:
+                raise Exception("Too many lines failed CRC check - Aborting")
+            mock_line = None
+            if line_parts and len(line_parts) > 4:
+                mock_line = line_parts.copy()
+                mock_line.insert(2, line_parts[1])
+            ref_message = "file: {} line: {}".format(self.batch_files[file_idx]["name"], line_num)
+            message = "Error while reading line from batch file"
+            em.log_error(ve.Programs.REPORTING, ve.ErrorCat.RECORD_ERROR, sub_cat, message, e, r_type,
+                         line=mock_line, r_id=ref_message)
+
+            # Failed CRC records are only surfaced on the first pass
+            if sub_cat != ve.ErrorSubCat.CRC_FAILED:
+                flags |= REPLAY
+            return line_parts, flags
+
     def read_line(self, em: ErrorManager, silent: bool = False):
         """
-        Batch file reader. Automatically continues from one batch file to the nex in the tar file.
+        Batch record reader. Steps through the record store built at load time, tracking software version changes.
+        :param em: Error manager.
+        :param silent: If true, no errors are logged to avoid redundant entries.
+        """
+
+        # Advance to next record
+        idx = self.current_record_idx
+        self.current_record_idx += 1
+
+        # Mark when at end of data
+        if self.current_record_idx >= len(self.records):
+            self.more_lines = False
+
+        # Read record
+        return self.read_record(em, idx, silent)
+
+    def read_record(self, em: ErrorManager, idx: int, silent: bool = False):
+        """
+        Read a single record from the record store by index, tracking software version changes.
         :param em: Error manager.
+        :param idx: Record index.
         :param silent: If true, no errors are logged to avoid redundant entries.
         """
-        
-        # Load new file
-        def _load_file(t: TarManager):
-            """ Load new CSV file into memory. """
-            file_path = os.path.join(t.path, t.temp_path, t.tar)
-            with tarfile.open(file_path) as tar_file:
-                t.current_file_name = t.batch_files[t.current_file_idx]["name"]
-                file_member = tar_file.extractfile(t.current_file_name)
-                file_bytes = file_member.read()
-                file_bytes = file_bytes.replace(b'\r', b'')
-                t.file_data = file_bytes.split(b'\n')
-                t.current_line_idx = 0
-                t.current_file_idx += 1
-                t.file_line_count = len(t.file_data)
-            if t.current_file_idx >= t.file_count:
-                t.last_file = True
 
         # Required variables
         d = self.data
         line_parts = None
         next_is_7203 = False
-        r_type = ve.RecordType.UNKNOWN
-        sub_cat = ve.ErrorSubCat.INVALID_REC
 
-        # Catch errors during file read
+        # Catch errors during record read
         try:
 
-            # First line - load first file
-            if not self.file_data and self.current_file_idx < self.file_count:
-                _load_file(self)
-
-            # Advance to next file
-            elif self.current_line_idx >= self.file_line_count:
-                if self.current_file_idx < self.file_count:
-                    _load_file(self)
+            # Read record
+            store = self.records
+            flags = store.flags[idx]
+            self.record_idx = idx
+            self.current_file_name = self.batch_files[store.file_idx[idx]]["name"]
 
-            # Read next line
-            line = self.file_data[self.current_line_idx]
-            self.current_line_idx += 1
+            # Skip failed records after the first pass
+            if not self.first and not flags & REPLAY:
+                return None, None, self.current_file_name
 
-            # Skip blank line
-            line_parts = []
-            if line != b'':
-
-                # Strip extra commas
-                line = line.replace(b', ', b',')
-                while len(line) > 0:
-                    if line[-1] == 44:
-                        line = line[:-1]
-                    else:
-                        break
-
-                # Decode and split line to parts
-                if line != b'' and len(line) > 4 and line[:4] != b'\x00\x00\x00\x00':
-                    line_parts = line.decode('utf-8').split(',')
-                    r_type = get_record_type((line_parts[2]), line_parts[3])
-
-                    # Check sequence numbering
-                    seq = int(line_parts[0])
-                    last_seq = self.last_sequence
-                    self.last_sequence = seq
-                    if last_seq + 1 != seq and seq > 1:
-                        # e = Exception("Missing sequence number")
-                        missing = str(self.last_sequence-1)
-                        em.log_warning("Missing sequence number", ref_id=missing)
-                        # em.log_error(ve.Programs.REPORTING, ve.ErrorCat.RECORD_ERROR, sub_cat,
-                        #              "Missing sequence number", e, ve.RecordType.UNKNOWN,
-                        #              line=[missing, "", "", "", ""], r_id=missing)
-
-                    # Check CRC
-                    crc_orig = int(line_parts[-1])
-                    crc_new = crc16.crc16xmodem(line[:-5], 0xffff)
-                    crc_result = "PASS"
-                    if crc_orig != crc_new:
-                        crc_result = "FAIL"
-                        self.bad_records += 1
-                        if not self.combo_log:
-                            sub_cat = ve.ErrorSubCat.CRC_FAILED
-                            if self.first:
-                                raise Exception("Data record failed CRC check")
-                            else:
-                                return None, None
-                    line_parts.append(crc_result)
-
-            # Mark when at end of data
-            if self.last_file:
-                if self.current_line_idx >= self.file_line_count:
-                    self.more_lines = False
-
-            # Check if next record is therapy state
-            next_is_7203 = False
-            if self.current_line_idx < self.file_line_count:
-                next_line = self.file_data[self.current_line_idx]
-                if len(next_line) >= 4:
-                    if next_line[3] == "7203":
-                        next_is_7203 = True
+            # Decode parts
+            line_parts = store.parts(idx)
+            next_is_7203 = bool(flags & NEXT_7203)
 
             # Check for new versions and re-index metadata if valid
-            if len(line_parts) > 4 and line_parts[3] == "7000":
+            if flags & VALID and len(line_parts) > 4 and line_parts[3] == "7000":
                 new_ver = str(line_parts[4]).strip('"')
                 gen_ver = new_ver.replace('"', '').replace('.', '')
                 if gen_ver and gen_ver[-1] in {"R", "D"}:
@@ -357,7 +569,10 @@ class TarManager:
                     self.no_valid_version = False
                     self.found_version = valid_ver
                     d.set_version_only(new_ver)
+                    parameters = d.metadata_parameters
                     read_metadata(em, d, use_int_md)
+                    if d.metadata_parameters is not parameters:
+                        clear_value_cache()
                     load_labels(em, d, valid_ver)
                     d.applicability_tracker = lookup_applicability(d, valid_ver)
                     if not self.valid_version:
@@ -370,23 +585,17 @@ class TarManager:
                     if self.first:
                         d.first_version = d.version
 
-        # Handle file read errors
+        # Handle record read errors
         except Exception as e:
-            if self.bad_records >= 20:
-                raise Exception("Too many lines failed CRC check - Aborting")
             if not silent:
                 mock_line = None
                 if line_parts and len(line_parts) > 4:
                     mock_line = line_parts.copy()
                     mock_line.insert(2, line_parts[1])
-                try:
-                    ref_message = "file: {} line: {}".format(self.batch_files[self.current_file_idx]["name"],
-                                                             self.current_line_idx)
-                except Exception as e2:
-                    ref_message = str(e2)
+                ref_message = "record: {}".format(idx)
                 message = "Error while reading line from batch file"
-                em.log_error(ve.Programs.REPORTING, ve.ErrorCat.RECORD_ERROR, sub_cat, message, e, r_type,
-                             line=mock_line, r_id=ref_message)
+                em.log_error(ve.Programs.REPORTING, ve.ErrorCat.RECORD_ERROR, ve.ErrorSubCat.INVALID_REC, message, e,
+                             ve.RecordType.UNKNOWN, line=mock_line, r_id=ref_message)
 
         # Return line
         return line_parts, next_is_7203, self.current_file_name
@@ -398,45 +607,107 @@ class TarManager:
         :return: Binary contents of file.
         """
 
-        # Read file
-        file_path = os.path.join(self.path, self.temp_path, self.tar)
-        with tarfile.open(file_path, 'r:') as tar_file:
-            file_member = tar_file.extractfile(filename)
-            return file_member.read()
+        # Read directly from member data offset when possible
+        member = self.members[filename]
+        if self.archive_map:
+            return self.archive_map[member.offset_data:member.offset_data + member.size]
+        if self.direct_read:
+            self.archive_file.seek(member.offset_data)
+            return self.archive_file.read(member.size)
+        return self.archive.extractfile(member).read()
 
     def read_log_file_series(self, series: int):
         """
+        Read all system log files of a series into one buffer, allocated once from the member sizes.
         :param series: Log file series.
         :return: Concatenated binary data, filename index by byte address.
         """
 
-        # Read each file into memory
-        bin_data = b''
+        # Index files by start address
         filenames = []
         addr = 0
         files = getattr(self, "slogger_{}_files".format(series))
-        file_path = os.path.join(self.path, self.temp_path, self.tar)
-        with tarfile.open(file_path) as tar_file:
-            for file in files:
-                filenames.append([addr, file])
-                file_member = tar_file.extractfile(file)
-                file_data = file_member.read()
-                addr += len(file_data)
-                bin_data += file_data
+        for file in files:
+            filenames.append([addr, file])
+            addr += self.members[file].size
+
+        # Read each file into its place in the buffer
+        bin_data = bytearray(addr)
+        view = memoryview(bin_data)
+        try:
+            for (start, file) in filenames:
+                self._read_member_into(file, view[start:start + self.members[file].size])
+        finally:
+            view.release()
         return bin_data, filenames
 
+    def _read_member_into(self, filename: str, view: memoryview):
+        """
+        Copy member data into a buffer without intermediate copies of the whole file.
+        :param filename: Name of file to access.
+        :param view: Writable buffer view, sized to the member.
+        """
+        member = self.members[filename]
+        if self.archive_map:
+            view[:] = self.archive_map[member.offset_data:member.offset_data + member.size]
+            return
+        if self.direct_read:
+            self.archive_file.seek(member.offset_data)
+            stream = self.archive_file
+        else:
+            stream = self.archive.extractfile(member)
+        filled = 0
+        while filled < member.size:
+            count = stream.readinto(view[filled:])
+            if not count:
+                raise Exception("Unexpected end of file: {}".format(filename))
+            filled += count
+
+    def close(self):
+        """ Close archive handle. Batch records already read remain available. """
+        if self.archive_map:
+            try:
+                self.archive_map.close()
+            except BufferError:
+                pass  # Line views held by an error traceback, map is closed when they are released
+            self.archive_map = None
+        if self.archive:
+            self.archive.close()
+            self.archive = None
+        if self.archive_file:
+            self.archive_file.close()
+            self.archive_file = None
+        self.members = {}
+
     def reset(self):
         """ Reset reader to beginning of batch records. """
         self.first = False
-        self.bad_records = 0
-        self.file_data = None
-        self.last_file = False
-        self.more_lines = True
-        self.current_file_idx = 0
-        self.current_line_idx = 0
+        self.more_lines = len(self.records) > 0
+        self.current_record_idx = 0
+        self.record_idx = None
         self.valid_version = False
 
 
+def _clean_line(line, trim_only: bool=False):
+    """
+    Remove line endings and extra commas from a raw batch file line.
+    :param line: Raw line from batch file, as bytes or memoryview.
+    :param trim_only: Line only has trailing characters to remove, so a memoryview is sliced instead of copied.
+    :return: Cleaned line, or None for blank and aberrant lines.
+    """
+    if trim_only:
+        end = len(line)
+        while end and line[end - 1] in (13, 44):
+            end -= 1
+        line = line[:end]
+    else:
+        line = bytes(line).replace(b'\r', b'')
+        line = line.replace(b', ', b',').rstrip(b',')
+    if len(line) <= 4 or line[:4] == b'\x00\x00\x00\x00':
+        return None
+    return line
+
+
 def _get_max_batch(batch: str):
     """ Determine maximum possible batch number. """
     max_str = ""
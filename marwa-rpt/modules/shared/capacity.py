@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+"""
+Worker admission control for the report generator daemon. Worker memory and CPU use are sampled from /proc, and new
+jobs are only started when their predicted memory fits under the configured ceiling. Concurrency is kept between a
+floor and a ceiling worker count. Where /proc is not available, only the worker count limits apply.
+
+    Version Notes:
+        1.0.0.0 - 10/17/2026 - Created file with CapacityController class and /proc readers.
+
+"""
+
+__author__ = "John Dorian for Sai Systems Technologies"
+__copyright__ = "Copyright 2026"
+__version__ = "1.0.0.0"
+
+# Built-in modules
+import os
+import time
+
+# Memory model, in MB
+BASE_MB = 300               # Predicted memory for a job with no cost
+MB_PER_COST = 0.5           # Initial predicted memory for each report hour of cost, refined from finished jobs
+LEARN_RATE = 0.3            # Weight of each finished job in the memory model
+RESERVE_MB = 256            # System memory always left available
+DEFAULT_LIMIT = 0.8         # Fraction of system memory used for workers when no limit is configured
+
+# System constants
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+class CapacityController:
+    """ Decide whether another worker can be started. """
+
+    def __init__(self, floor: int, ceiling: int, memory_limit: float = None):
+        """
+        Initialize.
+        :param floor: Workers always allowed to run.
+        :param ceiling: Maximum workers.
+        :param memory_limit: Total worker memory in MB. Defaults to a fraction of system memory.
+        """
+
+        # Limits
+        self.floor = max(1, min(floor, ceiling))
+        self.ceiling = ceiling
+        self.memory_limit = memory_limit
+        if not self.memory_limit:
+            total = read_meminfo("MemTotal")
+            self.memory_limit = total * DEFAULT_LIMIT if total else None
+
+        # Memory model
+        self.mb_per_cost = MB_PER_COST
+
+    def predict(self, cost: float) -> float:
+        """
+        Predict peak memory of a job.
+        :param cost: Expected job cost.
+        :return: Memory in MB.
+        """
+        return BASE_MB + cost * self.mb_per_cost
+
+    def sample(self, jobs: list):
+        """
+        Sample memory and CPU use of running jobs.
+        :param jobs: Running jobs.
+        """
+        now = time.time()
+        for job in jobs:
+
+            # Memory
+            rss = read_rss(job.process.pid)
+            if rss is not None:
+                job.rss = rss
+                job.peak_rss = max(job.peak_rss, rss)
+
+            # CPU, as a fraction of one core since the last sample
+            ticks = read_cpu_ticks(job.process.pid)
+            if ticks is not None:
+                if job.cpu_ticks is not None and now > job.sample_time:
+                    job.cpu = (ticks - job.cpu_ticks) / CLOCK_TICKS / (now - job.sample_time)
+                job.cpu_ticks = ticks
+                job.sample_time = now
+
+    def finish(self, job):
+        """
+        Refine memory model from a finished job.
+        :param job: Finished job.
+        """
+        if job.cost > 0 and job.peak_rss > BASE_MB:
+            observed = (job.peak_rss - BASE_MB) / job.cost
+            self.mb_per_cost += (observed - self.mb_per_cost) * LEARN_RATE
+
+    def admit(self, cost: float, jobs: list) -> bool:
+        """
+        Check if a new job fits.
+        :param cost: Expected cost of new job.
+        :param jobs: Running jobs.
+        :return: True if the job may start.
+        """
+
+        # Worker count limits
+        running = len(jobs)
+        if running >= self.ceiling:
+            return False
+        if running < self.floor:
+            return True
+
+        # Predicted memory of running jobs, which may not have reached their peak, and new job
+        need = self.predict(cost)
+        if self.memory_limit:
+            committed = sum(max(job.rss, self.predict(job.cost)) for job in jobs)
+            if committed + need > self.memory_limit:
+                return False
+
+        # System memory still available
+        available = read_meminfo("MemAvailable")
+        if available is not None and need > available - RESERVE_MB:
+            return False
+
+        # CPU headroom
+        cpus = os.cpu_count() or 1
+        if sum(job.cpu for job in jobs) >= cpus:
+            return False
+        return True
+
+
+def read_meminfo(name: str):
+    """
+    Read a system memory value.
+    :param name: Field name in /proc/meminfo.
+    :return: Value in MB, or None if not available.
+    """
+    try:
+        with open("/proc/meminfo", 'r') as f:
+            for line in f:
+                if line.startswith(name + ":"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def read_rss(pid: int):
+    """
+    Read memory use of a process. Proportional set size is used where available, so pages shared with the daemon after
+    fork are split between processes.
+    :param pid: Process ID.
+    :return: Memory in MB, or None if not available.
+    """
+
+    # Proportional set size
+    try:
+        with open("/proc/{}/smaps_rollup".format(pid), 'r') as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+
+    # Resident set size
+    try:
+        with open("/proc/{}/statm".format(pid), 'r') as f:
+            return int(f.read().split()[1]) * PAGE_SIZE / 1048576
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def read_cpu_ticks(pid: int):
+    """
+    Read total user and system CPU time of a process.
+    :param pid: Process ID.
+    :return: Clock ticks, or None if not available.
+    """
+    try:
+        with open("/proc/{}/stat".format(pid), 'r') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        return int(fields[11]) + int(fields[12])
+    except (OSError, ValueError, IndexError):
+        return None
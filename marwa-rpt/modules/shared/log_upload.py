@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+"""
+Asynchronous upload of error log lines to Azure tables. Workers write log entities to a local outbox file and return
+immediately. The daemon drains the outbox, committing each partition in concurrent batches with bounded retries. Files
+that can't be uploaded stay in the outbox and are retried on later passes.
+
+The uploader only calls commit_batch on its table service, so a local stand-in with the same method can be used in
+place of an Azure TableService.
+
+    Version Notes:
+        1.0.0.0 - 10/17/2026 - Created file with outbox spill files and LogUploader.
+        1.0.0.1 - 10/17/2026 - Failed file times are only changed under the uploader lock.
+        1.0.0.2 - 10/17/2026 - Row keys are prefixed with the spill time and process, so a second log stored for the
+                               same record doesn't replace the first. Removed unused close function.
+
+"""
+
+__author__ = "John Dorian for Sai Systems Technologies"
+__copyright__ = "Copyright 2026"
+__version__ = "1.0.0.2"
+
+# Built-in modules
+import os
+import json
+import time
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+# Azure modules
+from azure.cosmosdb.table import TableBatch
+
+# Outbox folder for log entities waiting to be uploaded
+OUTBOX = "outbox"
+
+# Upload limits
+BATCH_SIZE = 100            # Maximum entities in one table batch
+MAX_RETRIES = 3             # Attempts per batch in one outbox pass
+RETRY_DELAY = 2             # Seconds before the first retry, doubled for each attempt
+RETRY_PASS = 60             # Seconds before a failed outbox file is tried again
+UPLOAD_THREADS = 4          # Concurrent batch commits
+
+
+def outbox_path():
+    """ Locate outbox folder, relative to the current directory or its parent. """
+    context = ""
+    if not os.path.exists(os.path.join(context, "modules")):
+        context = ".."
+    return os.path.join(context, OUTBOX)
+
+
+def spill_log(table: str, record_id: str, entities: list):
+    """
+    Write log entities to the outbox for upload by the daemon. Row keys are prefixed with the spill time and process,
+    so that each stored log keeps its own rows.
+    :param table: Destination table name.
+    :param record_id: Report or batch ID.
+    :param entities: Entity property dictionaries.
+    :return: Outbox filename.
+    """
+
+    # Create outbox if needed
+    path = outbox_path()
+    if not os.path.exists(path):
+        os.makedirs(path, exist_ok=True)
+
+    # Make row keys unique to this spill
+    stamp = "{}_{}".format(datetime.utcnow().strftime("%Y%m%d%H%M%S%f"), os.getpid())
+    entities = [dict(entity, RowKey="{}-{}".format(stamp, entity["RowKey"])) for entity in entities]
+
+    # Write to a temporary name, then rename so the daemon never reads a partial file
+    filename = os.path.join(path, "{}_{}_{}.json".format(table, record_id, stamp))
+    with open(filename + ".tmp", 'w') as f:
+        json.dump({"table": table, "entities": entities}, f)
+    os.replace(filename + ".tmp", filename)
+    return filename
+
+
+class LogUploader:
+    """ Upload outbox files one at a time, committing the batches of each file concurrently. """
+
+    def __init__(self, table_service, threads: int = UPLOAD_THREADS, retries: int = MAX_RETRIES,
+                 delay: float = RETRY_DELAY):
+        """
+        Initialize.
+        :param table_service: Azure TableService, or any object with a matching commit_batch method. Upload threads
+                              share it, so it should not be used by other threads.
+        :param threads: Concurrent batch commits.
+        :param retries: Attempts per batch in one outbox pass.
+        :param delay: Seconds before the first retry.
+        """
+        self.table_service = table_service
+        self.retries = retries
+        self.delay = delay
+        self.files = ThreadPoolExecutor(max_workers=1)
+        self.batches = ThreadPoolExecutor(max_workers=threads)
+        self.pending = set()
+        self.failed = {}
+        self.lock = threading.Lock()
+
+    def drain(self, wait: bool = False):
+        """
+        Start uploads for all outbox files not already in progress.
+        :param wait: If true, block until all started uploads finish.
+        :return: Number of files started.
+        """
+
+        # List complete outbox files
+        path = outbox_path()
+        if not os.path.exists(path):
+            return 0
+        names = sorted(name for name in os.listdir(path) if name.endswith(".json"))
+
+        # Start new files, waiting before trying failed files again
+        started = []
+        now = time.time()
+        for name in names:
+            filename = os.path.join(path, name)
+            with self.lock:
+                if filename in self.pending or now - self.failed.get(filename, 0) < RETRY_PASS:
+                    continue
+                self.pending.add(filename)
+            started.append(self.files.submit(self._upload_file, filename))
+
+        # Optionally wait for results
+        if wait:
+            for future in started:
+                future.result()
+        return len(started)
+
+    def _upload_file(self, filename: str):
+        """
+        Upload one outbox file, removing it once all batches are committed.
+        :param filename: Outbox filename.
+        """
+
+        # Catch errors
+        try:
+
+            # Read entities
+            with open(filename, 'r') as f:
+                contents = json.load(f)
+            table = contents["table"]
+            entities = contents["entities"]
+
+            # Group by partition, since a table batch can only hold one partition
+            partitions = {}
+            for entity in entities:
+                partitions.setdefault(entity["PartitionKey"], []).append(entity)
+
+            # Commit batches concurrently
+            futures = []
+            for _, rows in partitions.items():
+                for x in range(0, len(rows), BATCH_SIZE):
+                    batch = rows[x:x + BATCH_SIZE]
+                    futures.append(self.batches.submit(self._commit, table, batch))
+            committed = all([future.result() for future in futures])
+
+            # Keep failed files for a later pass
+            if committed:
+                os.remove(filename)
+                with self.lock:
+                    self.failed.pop(filename, None)
+            else:
+                with self.lock:
+                    self.failed[filename] = time.time()
+                print("Log upload failed, kept in outbox: {}".format(filename))
+
+        # Handle errors
+        except Exception as e:
+            with self.lock:
+                self.failed[filename] = time.time()
+            print("Log upload error: {} ({})".format(e, filename))
+
+        # Allow file to be retried
+        finally:
+            with self.lock:
+                self.pending.discard(filename)
+
+    def _commit(self, table: str, rows: list):
+        """
+        Commit one batch with bounded retries. Rows are inserted or replaced so that retries are idempotent.
+        :param table: Destination table name.
+        :param rows: Entity property dictionaries from a single partition.
+        :return: True if committed.
+        """
+        delay = self.delay
+        for attempt in range(0, self.retries):
+            try:
+                batch = TableBatch()
+                for row in rows:
+                    batch.insert_or_replace_entity(row)
+                self.table_service.commit_batch(table, batch)
+                return True
+            except Exception as e:
+                if attempt + 1 >= self.retries:
+                    print("Log batch failed after {} attempts: {}".format(self.retries, e))
+                    return False
+                time.sleep(delay)
+                delay *= 2
+        return False
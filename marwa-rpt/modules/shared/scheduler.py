@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+"""
+Job scheduling for the report generator daemon. Queued reports are started shortest expected job first, with credit for
+time spent waiting so that long reports are not starved. Some worker slots are kept free of large reports so that short
+interactive reports can start while long reports are running.
+
+    Version Notes:
+        1.0.0.0 - 10/17/2026 - Created file with Job and JobScheduler classes.
+        1.0.1.0 - 10/17/2026 - Added resource samples to jobs.
+        1.0.2.0 - 10/17/2026 - Added job deadlines scaled by expected cost.
+        1.0.2.1 - 10/17/2026 - Small reports are chosen by report hours. Waiting time is counted from the queue item
+                               upload time, and data file lookups are limited on each check.
+
+"""
+
+__author__ = "John Dorian for Sai Systems Technologies"
+__copyright__ = "Copyright 2026"
+__version__ = "1.0.2.1"
+
+# Built-in modules
+import time
+
+# VOCSN modules
+from modules.processing.utilities import safe_read
+
+# Cost estimates, in report hours
+SMALL_JOB_HOURS = 48        # Reports of up to this many hours may use the small report lane
+COST_PER_MB = 12            # Cost of each MB in the data file
+AGING_PER_MINUTE = 120      # Cost credited for each minute a report waits in the queue
+SMALL_LANE = 1              # Worker slots reserved for small reports
+LOOKUPS_PER_CHECK = 4       # Report and data file lookups made on each queue check, oldest items first
+
+# Job deadlines
+SECONDS_PER_COST = 2        # Time allowed for each report hour of cost, added to the base timeout
+CANCELLED_EXIT = 124        # Worker exit code after recording its own cancellation
+
+
+class Job:
+    """ Running worker process and the queue item it was started for. """
+
+    def __init__(self, process, item, kind: str, cost: float = 0, timeout: float = None, large: bool = False):
+        """
+        Initialize.
+        :param process: Worker process.
+        :param item: Queue item.
+        :param kind: Job type ("report" or "batch").
+        :param cost: Expected cost.
+        :param timeout: Seconds allowed before the job is cancelled, or None for no deadline.
+        :param large: Job may not use the small report lane.
+        """
+        self.process = process
+        self.item = item
+        self.kind = kind
+        self.cost = cost
+        self.large = large
+        self.start = time.time()
+
+        # Watchdog
+        self.deadline = self.start + timeout if timeout else None
+        self.heartbeat = self.start
+        self.cancelled = None
+        self.killed = False
+
+        # Resource samples
+        self.rss = 0
+        self.peak_rss = 0
+        self.cpu = 0
+        self.cpu_ticks = None
+        self.sample_time = self.start
+
+
+class JobScheduler:
+    """ Order queued reports by expected cost and waiting time. """
+
+    def __init__(self, sizer=None):
+        """
+        Initialize.
+        :param sizer: Function returning (report hours, data file bytes) for a report queue item.
+        """
+        self.sizer = sizer
+        self.costs = {}
+        self.hours = {}
+        self.first_seen = {}
+
+    def cost(self, item, lookup: bool = True) -> float:
+        """
+        Estimate report cost from report duration and data file size. Results are kept for the life of the queue item.
+        Without a lookup, the estimate is made from the report hours in the queue item and is not kept.
+        :param item: Report queue item.
+        :param lookup: Look up report and data file records.
+        :return: Expected cost in report hours.
+        """
+
+        # Previous estimate
+        key = (item.PartitionKey, item.RowKey)
+        if key in self.costs:
+            return self.costs[key]
+
+        # Report hours from queue item
+        hours = _read_number(item, "Hours")
+        if not lookup or not self.sizer:
+            return hours or 0
+
+        # Details from report and data file records
+        size = None
+        try:
+            report_hours, size = self.sizer(item)
+            hours = hours if hours is not None else report_hours
+        except Exception as e:
+            print("Unable to look up report size:", str(e))
+
+        # Combine estimates
+        cost = (hours or 0) + (size or 0) / 1e6 * COST_PER_MB
+        self.costs[key] = cost
+        self.hours[key] = hours
+        return cost
+
+    def large(self, item) -> bool:
+        """
+        Check if a report may not use the small report lane. Reports of unknown duration are treated as large.
+        :param item: Report queue item.
+        :return: True if large.
+        """
+        hours = _read_number(item, "Hours")
+        if hours is None:
+            hours = self.hours.get((item.PartitionKey, item.RowKey))
+        return hours is None or hours > SMALL_JOB_HOURS
+
+    def queued_time(self, item, now: float) -> float:
+        """
+        Time a report was added to the queue, from the queue item upload time. Items without one are timed from when
+        they were first seen.
+        :param item: Report queue item.
+        :param now: Current timestamp.
+        :return: Timestamp.
+        """
+        queued = _read_number(item, "UploadDT")
+        if queued is not None:
+            return queued
+        return self.first_seen.setdefault((item.PartitionKey, item.RowKey), now)
+
+    def select(self, items: list, free: int, large_free: int) -> list:
+        """
+        Choose queued reports to start.
+        :param items: Report queue items.
+        :param free: Open worker slots.
+        :param large_free: Open worker slots that may run large reports.
+        :return: List of (item, cost, large) to start, in order.
+        """
+
+        # Waiting time of each item, forgetting items no longer in the queue
+        now = time.time()
+        queued = [self.queued_time(item, now) for item in items]
+        keys = set((item.PartitionKey, item.RowKey) for item in items)
+        for cache in (self.first_seen, self.costs, self.hours):
+            for key in [key for key in cache if key not in keys]:
+                del cache[key]
+
+        # Estimate costs, looking up records for a limited number of the longest waiting items
+        lookups = LOOKUPS_PER_CHECK
+        costs = [0] * len(items)
+        for idx in sorted(range(len(items)), key=lambda i: queued[i]):
+            item = items[idx]
+            lookup = lookups > 0 and (item.PartitionKey, item.RowKey) not in self.costs
+            costs[idx] = self.cost(item, lookup)
+            lookups -= lookup
+
+        # Rank by expected cost less credit for waiting
+        ranked = []
+        for idx, item in enumerate(items):
+            waited = max(0, now - queued[idx]) / 60
+            ranked.append((costs[idx] - waited * AGING_PER_MINUTE, idx, item, costs[idx]))
+        ranked.sort(key=lambda r: r[:2])
+
+        # Fill open slots, keeping the small report lane clear of large reports
+        selected = []
+        for _, _, item, cost in ranked:
+            if len(selected) >= free:
+                break
+            large = self.large(item)
+            if large:
+                if large_free <= 0:
+                    continue
+                large_free -= 1
+            selected.append((item, cost, large))
+        return selected
+
+
+def large_slots(process_count: int) -> int:
+    """
+    Number of worker slots that may run large reports.
+    :param process_count: Total worker slots.
+    :return: Slot count.
+    """
+    return max(1, process_count - SMALL_LANE)
+
+
+def job_timeout(base: float, cost: float = 0) -> float:
+    """
+    Time allowed for a job.
+    :param base: Seconds allowed for a job with no cost.
+    :param cost: Expected job cost.
+    :return: Timeout in seconds.
+    """
+    return base + cost * SECONDS_PER_COST
+
+
+def _read_number(entity, name: str):
+    """ Read a number from an Azure entity, or None if missing or invalid. """
+    try:
+        return float(safe_read(getattr(entity, name)))
+    except (AttributeError, TypeError, ValueError):
+        return None
@@ -21,12 +21,19 @@ Note that stdout and stderr are automatically written to the log file.
         1.1.2.0 - 02/13/2020 - Moved report generator settings to .env file.
         1.1.2.1 - 03/11/2020 - Added queue time.
         1.1.2.2 - 03/31/2020 - Recalculate start time from end time to ensure consistency with web app.
+        1.1.3.0 - 10/17/2026 - Log lines are queued in the upload outbox for the daemon to upload.
+        1.1.4.0 - 10/17/2026 - Stores the session log and exits when the daemon cancels the job.
+        1.1.5.0 - 10/17/2026 - Data files already in the record cache are not downloaded again.
+        1.1.5.1 - 10/17/2026 - Record cache entries are loaded before the download is skipped, and the file is
+                               downloaded when the entry can't be read.
+        1.1.5.2 - 10/17/2026 - Status fields are written with safe write, since Int64 fields are plain integers.
+        1.1.5.3 - 10/17/2026 - Record cache is trimmed to its size limit after each new entry.
 
 """
 
 __author__ = "John Dorian for Sai Systems Technologies"
 __copyright__ = "Copyright 2018"
-__version__ = "1.1.2.2"
+__version__ = "1.1.5.3"
 
 # Built-in
 import os
@@ -35,6 +42,7 @@ import json
 import shutil
 import string
 import random
+import signal
 import socket
 from datetime import datetime, timedelta
 
@@ -43,9 +51,11 @@ from config import config
 from modules.models.report import Report
 from modules.models import vocsn_enum as ve
 from modules.models.errors import ErrorManager
+from modules.readers import record_cache
 from modules.shared import status as status_script
+from modules.shared.scheduler import CANCELLED_EXIT
 from modules.models.vocsn_enum import Sections, ErrorLevel
-from modules.processing.utilities import safe_read, dt_to_ts
+from modules.processing.utilities import safe_read, safe_write, dt_to_ts
 
 # Reports
 from reports.usage import usage_report
@@ -54,7 +64,7 @@ from reports.usage import usage_report
 from azure.cosmosdb.table import TableService, Entity
 from azure.storage.file import FileService, ContentSettings
 
-global DIAG
+DIAG = None
 
 
 def build_reports(queue_item: Entity, prod: bool, diag: bool):
@@ -87,6 +97,7 @@ def build_reports(queue_item: Entity, prod: bool, diag: bool):
     abort = False
     report_file = None
     report_path = None
+    table_service = None
     report_id = queue_item.ReportID
     temp_dir = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
     em = ErrorManager("Report Generator", "R" + temp_dir, DIAG)
@@ -95,6 +106,21 @@ def build_reports(queue_item: Entity, prod: bool, diag: bool):
     status = status_script.StatusMonitorTracker()
     status.start_time = datetime.utcnow()
 
+    # Store session log and exit if the daemon cancels this job. The daemon records the report error.
+    def cancel(signum, frame):
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        message = "Report exceeded its deadline and was cancelled"
+        try:
+            em.log_error(ve.Programs.REPORT_GEN, ve.ErrorCat.PROCESS_ERROR, ve.ErrorSubCat.INTERNAL_ERROR, message,
+                         TimeoutError(message), error_level=ErrorLevel.CRITICAL)
+        except TimeoutError:
+            pass  # Raised in diagnostic mode
+        if os.path.exists(temp_dir):
+            clean_vm(em, temp_dir)
+        store_log(em, table_service, report_id)
+        sys.exit(CANCELLED_EXIT)
+    signal.signal(signal.SIGTERM, cancel)
+
     # Diagnostic output
     d_print("-----------------------")
     d_print("-   Report Generator  -")
@@ -135,7 +161,8 @@ def build_reports(queue_item: Entity, prod: bool, diag: bool):
         return
 
     # Copy file to local VM storage
-    temp_dir, temp_file, err = get_raw_data(em, table_service, file_service, report_entity, temp_dir)
+    temp_dir, temp_file, content_hash, cache_entry, err = get_raw_data(em, table_service, file_service, report_entity,
+                                                                       temp_dir)
     if err and report_entity:
         set_error(em, table_service, report_entity, queue_item)
         store_log(em, table_service, report_id)
@@ -149,7 +176,11 @@ def build_reports(queue_item: Entity, prod: bool, diag: bool):
         # # import cProfile
         # # cProfile.runctx('usage_report(em, report_def, temp_dir, temp_file, diag)', globals(), locals())
         # # exit()
-        report_file, tar, data = usage_report(em, report_def, temp_dir, temp_file, diag)
+        report_file, tar, data = usage_report(em, report_def, temp_dir, temp_file, diag, content_hash, cache_entry)
+
+        # Trim record cache after a new entry
+        if content_hash and not cache_entry:
+            record_cache.evict(settings.cache_limit)
     except Exception as e:
         message = "Encountered an unhandled error while processing a report"
         em.log_error(ve.Programs.REPORT_GEN, ve.ErrorCat.PROCESS_ERROR, ve.ErrorSubCat.INTERNAL_ERROR, message, e)
@@ -204,8 +235,8 @@ def store_log(em: ErrorManager, table_service: TableService, report_id: str):
     # Write log to file
     em.write_log()
 
-    # Write log to database
-    em.upload_log(table_service, "ReportLog", report_id)
+    # Queue log for upload to database
+    em.upload_log("ReportLog", report_id)
 
 
 def set_error(em: ErrorManager, table_service: TableService, report_ent: Entity, queue_ent: Entity):
@@ -292,7 +323,7 @@ def reserve_report(em: ErrorManager, queue_item: Entity, table_service: TableSer
     # Abort processing if record cannot be locked
     try:
         d_print("  Reserving report queue item.")
-        queue_item.Status.value = ve.ProcessingState.PROCESSING.value
+        safe_write(queue_item, "Status", ve.ProcessingState.PROCESSING.value)
         queue_item.StartDT = dt_to_ts(datetime.utcnow())
         etag = queue_item.etag
         table_service.update_entity(table, queue_item, if_match=etag)
@@ -339,7 +370,7 @@ def create_report_def(em: ErrorManager, table_service: TableService, queue_item:
         report_ent = result.items[0]
 
         # Update report status to "Processing"
-        report_ent.Status.value = ve.ProcessingState.PROCESSING.value
+        safe_write(report_ent, "Status", ve.ProcessingState.PROCESSING.value)
         table_service.update_entity(table, report_ent)
 
         # Get update etag back from database
@@ -399,9 +430,13 @@ def get_raw_data(em: ErrorManager, table_service: TableService, file_service: Fi
     :param file_service: Azure file service.
     :param report_ent: Report details from database.
     :param temp_dir: Temporary directory.
-    :return: [Temporary local directory, file name]
+    :return: [Temporary local directory, file name, content hash, record cache entry]
     """
 
+    # Variables
+    content_hash = None
+    cache_entry = None
+
     # Catch errors
     d_print("Get data file for processing")
     try:
@@ -436,11 +471,29 @@ def get_raw_data(em: ErrorManager, table_service: TableService, file_service: Fi
                 if attempts > 10:
                     raise e
 
-        # Copy file from file service to local storage
-        d_print("  Downloading data file")
+        # Look up data file in the record cache, identified by its path and storage properties
         share = "vocsn-data"
-        destination = os.path.join(temp_dir, file_name)
-        file_service.get_file_to_path(share, file_path, file_name, destination)
+        identity = None
+        try:
+            properties = file_service.get_file_properties(share, file_path, file_name).properties
+            identity = "{}/{}/{}:{}:{}".format(share, file_path, file_name, properties.etag,
+                                               properties.content_length)
+            content_hash = record_cache.lookup(identity)
+            if content_hash:
+                cache_entry = record_cache.load(content_hash)
+        except Exception as e:
+            d_print("  Unable to check record cache: {}".format(e))
+
+        # Copy file from file service to local storage, unless its cached records were loaded
+        if cache_entry:
+            d_print("  Using cached data file records")
+        else:
+            d_print("  Downloading data file")
+            destination = os.path.join(temp_dir, file_name)
+            file_service.get_file_to_path(share, file_path, file_name, destination)
+            content_hash = record_cache.file_hash(destination)
+            if identity:
+                record_cache.remember(identity, content_hash)
 
         # Eventually we could check file integrity here
 
@@ -448,9 +501,9 @@ def get_raw_data(em: ErrorManager, table_service: TableService, file_service: Fi
     except Exception as e:
         message = "Failed to copy data file from file storage"
         em.log_error(ve.Programs.REPORT_GEN, ve.ErrorCat.FILE_ERROR, ve.ErrorSubCat.DB_ERROR, message, e)
-        return temp_dir, None, True
+        return temp_dir, None, None, None, True
 
-    return temp_dir, file_name, False
+    return temp_dir, file_name, content_hash, cache_entry, False
 
 
 def upload_report(em: ErrorManager, file_service: FileService, report: Report, temp_dir: str, report_file: str):
@@ -535,7 +588,7 @@ def update_tables(em: ErrorManager, table_service: TableService, report_path: st
         table = "Reports"
         report_entity.FilePath = report_path
         report_entity.FileName = report_name
-        report_entity.Status.value = status
+        safe_write(report_entity, "Status", status)
         report_entity.ErrorLevel = em.status.value
         report_entity.RunTime = run_time
         report_entity.QueueTime = queue_time
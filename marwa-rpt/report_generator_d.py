@@ -11,12 +11,32 @@ Run report generator at regular intervals and, reported errors and optionally se
         1.1.0.2 - 01/27/2020 - Added production variable.
         1.1.0.3 - 01/30/2020 - Shortened timeout when job reservations are released to new workers.
         1.1.1.0 - 02/13/2020 - Moved report generator settings to .env file.
+        1.1.2.0 - 10/17/2026 - Version definitions are loaded once at startup, before workers are forked.
+        1.1.3.0 - 10/17/2026 - Fonts and images are also preloaded, and workers are started with the fork method so
+                               that each job begins from the preloaded state.
+        1.1.4.0 - 10/17/2026 - Uploads worker log lines from the outbox in the background.
+        1.1.5.0 - 10/17/2026 - Queues are queried with server-side filters in bounded pages, only for open worker slots.
+                               The check interval backs off while the queues are idle.
+        1.1.6.0 - 10/17/2026 - Reports are started shortest expected job first with aging, keeping a worker slot for
+                               small reports.
+        1.1.7.0 - 10/17/2026 - Jobs are only started when their predicted memory fits, between a minimum and maximum
+                               worker count.
+        1.1.8.0 - 10/17/2026 - Added a watchdog. Queue reservations of running jobs are refreshed, and jobs that run
+                               past a deadline scaled by expected cost are cancelled and recorded as errors.
+        1.1.9.0 - 10/17/2026 - Daily cleanup trims the record cache to its size limit.
+        1.1.9.1 - 10/17/2026 - Log uploader is created once, with its own table service.
+        1.1.9.2 - 10/17/2026 - Log uploads run in a separate process, so the daemon has no threads when it forks
+                               workers.
+        1.1.9.3 - 10/17/2026 - Queue filters match every numeric type the queue fields are stored with.
+        1.1.9.4 - 10/17/2026 - Queue status is read with safe read, since Int64 fields are returned as plain integers.
+        1.1.9.5 - 10/17/2026 - Default check intervals are time intervals.
+        1.1.9.6 - 10/17/2026 - Report jobs take their small or large lane from the scheduler.
 
 """
 
 __author__ = "John Dorian for Sai Systems Technologies"
 __copyright__ = "Copyright 2018"
-__version__ = "1.1.1.0"
+__version__ = "1.1.9.6"
 
 SYSTEM_VER = "1.01.01"
 REPORT_VER = "1.01.01"
@@ -24,22 +44,33 @@ REPORT_VER = "1.01.01"
 # Built-in
 import gc
 import os
+import math
 import sys
 import time
 import shutil
 import argparse
 import traceback
-from multiprocessing import Process
+import multiprocessing
 from datetime import datetime, timedelta
 
 # Companion Python files
+import download_manager
+import report_generator
 from config import config
 from download_manager import build_batch
 from report_generator import build_reports
 from modules.models import vocsn_enum as ve
+from modules.models.errors import ErrorManager
+from modules.readers import record_cache
+from modules.readers.definitions import warm_definitions
+from modules.shared.log_upload import LogUploader, OUTBOX
+from modules.shared.capacity import CapacityController
+from modules.shared.scheduler import Job, JobScheduler, large_slots, job_timeout, CANCELLED_EXIT
 from modules.processing.utilities import safe_read, dt_to_ts
+from modules.processing.resource_loader import load_fonts, preload_images
 
 # Azure library
+from azure.common import AzureMissingResourceHttpError
 from azure.storage.file import FileService
 from azure.cosmosdb.table import TableService, Entity
 
@@ -49,17 +80,24 @@ from azure.cosmosdb.table import TableService, Entity
 # Daemon vars
 diag = False
 prod = False
-frequency = 1
+frequency = timedelta(seconds=1)
+max_interval = timedelta(seconds=30)
+poll_interval = timedelta(seconds=1)
 settings = None
 operational = True
 credentials = None
 process_count = 2
+base_timeout = 900
+cache_limit = 2048
+capacity = None
 pool = []
 t = None
 
 # Azure vars
 table_service = None
 file_service = None
+uploader_process = None
+scheduler = None
 
 # Daily vars
 did_cleanup = False
@@ -68,6 +106,23 @@ cleanup_hour = 14
 # Monitor statistics
 last_run = datetime(2000, 1, 1)
 
+# Queue queries
+QUEUE_PAGE_SIZE = 100       # Maximum entities per queue query page
+SCHEDULE_WINDOW = 100       # Maximum queued reports considered by the scheduler on each check
+IDLE_BACKOFF = 2            # Check interval multiplier after each check that finds no work
+
+# Watchdog
+HEARTBEAT_INTERVAL = 30     # Seconds between queue reservation refreshes for running jobs
+KILL_GRACE = 30             # Seconds a cancelled worker has to exit before it is killed
+
+# Worker start method - forked workers inherit resources preloaded by the daemon
+#   The daemon must not run threads, since a worker forked while another thread holds a lock would inherit that lock
+#   held. Threaded log uploads run in their own process.
+if "fork" in multiprocessing.get_all_start_methods():
+    worker_context = multiprocessing.get_context("fork")
+else:
+    worker_context = multiprocessing.get_context()
+
 
 def d_print(message: str):
     """ Print if DIAG specified. """
@@ -78,15 +133,17 @@ def d_print(message: str):
 
 def azure_connection():
     """ Create Azure connection handlers. """
-    global table_service, file_service, credentials
+    global table_service, file_service, credentials, scheduler
     table_service = TableService(account_name=credentials['account'], account_key=credentials['key'])
     file_service = FileService(account_name=credentials['account'], account_key=credentials['key'])
+    if scheduler is None:
+        scheduler = JobScheduler(report_size)
 
 
 def read_settings():
     """ Get Azure credentials, setup table service instance, and read settings. """
-    global settings, credentials, frequency, process_count, cleanup_hour
-    global table_service, file_service, prod
+    global settings, credentials, frequency, max_interval, poll_interval, process_count, cleanup_hour
+    global table_service, file_service, prod, capacity, base_timeout, cache_limit
 
     # Output action to log and console in diagnostic mode.
     d_print("Loading settings")
@@ -99,13 +156,82 @@ def read_settings():
 
     # Set global vars
     frequency = settings.frequency
+    max_interval = max(settings.max_interval, frequency)
+    poll_interval = frequency
     process_count = settings.processes
     cleanup_hour = settings.cleanup_hour
+    base_timeout = settings.job_timeout.total_seconds()
+    cache_limit = settings.cache_limit
+    capacity = CapacityController(settings.min_processes, process_count, settings.memory_limit)
+    d_print("  Workers: {}-{}, memory limit: {} MB".format(capacity.floor, capacity.ceiling, capacity.memory_limit))
     azure_connection()
 
 
-def get_report_queue() -> [Entity]:
-    """ Retrieve entire report queue. """
+def query_queue(table: str, expired: float, limit: int) -> [Entity]:
+    """
+    Retrieve queued items and items with expired reservations from a queue table. The table is filtered by the server
+    and read in bounded pages, stopping once enough items are found.
+    :param table: Queue table name.
+    :param expired: Reservations started before this timestamp are expired.
+    :param limit: Maximum number of items to return.
+    :return: Queue items.
+    """
+
+    # Variables
+    queue_items = []
+    queued = ve.ProcessingState.QUEUED.value
+
+    # Server comparisons only match values of the same type, so each stored type is checked
+    #   Status: Int32 from the web system, Int64 from plain Python integers
+    #   StartDT: Int32 from the web system, Double from generator reservations
+    cutoff = math.ceil(expired)
+    query = "Status eq {0} or Status eq {0}L or StartDT lt {1!r} or StartDT lt {2} or StartDT lt {2}L".format(
+        queued, float(expired), cutoff)
+
+    # Read pages until enough items are found
+    marker = None
+    while len(queue_items) < limit:
+        result = table_service.query_entities(table, filter=query, num_results=QUEUE_PAGE_SIZE, marker=marker)
+        for item in result:
+
+            # Check for items in "Queued" status or with an expired reservation
+            if safe_read(item.Status) == queued or safe_read(item.StartDT) < expired:
+                queue_items.append(item)
+
+        # Next page
+        marker = result.next_marker
+        if not marker:
+            break
+
+    # Return queue list
+    return queue_items[:limit]
+
+
+def report_size(queue_item: Entity) -> (float, int):
+    """
+    Look up report duration and data file size for a report queue item.
+    :param queue_item: Report queue item.
+    :return: Report hours, data file size in bytes.
+    """
+
+    # Report details
+    filters = "PartitionKey eq '{}' and RowKey eq '{}'".format(queue_item.PartitionKey, queue_item.ReportID)
+    report_ent = table_service.query_entities("Reports", filters).items[0]
+    hours = safe_read(report_ent.ReportHours)
+
+    # Data file details
+    filters = "PartitionKey eq '{}' and RowKey eq '{}'".format(report_ent.PartitionKey, report_ent.DataFileID)
+    file_ent = table_service.query_entities("DataFiles", filters).items[0]
+    file = file_service.get_file_properties("vocsn-data", file_ent.FilePath[1:], file_ent.FileName)
+    return hours, file.properties.content_length
+
+
+def get_report_queue(limit: int) -> [Entity]:
+    """
+    Retrieve items ready to run from the report queue.
+    :param limit: Maximum number of items to return.
+    :return: Queue items.
+    """
     global diag
 
     # Variables
@@ -115,21 +241,7 @@ def get_report_queue() -> [Entity]:
 
     # Catch errors
     try:
-
-        # Retrieve items in report queue (no filters needed)
-        table = "ReportQueue"
-        result = table_service.query_entities(table)
-
-        # Check for unprocessed items
-        for item in result:
-
-            # Check for items in "Queued" status
-            if item.Status.value == ve.ProcessingState.QUEUED.value:
-                queue_items.append(item)
-
-            # Check for expired reservation
-            elif safe_read(item.StartDT) < expired:
-                queue_items.append(item)
+        queue_items = query_queue("ReportQueue", expired, limit)
 
     # Handle errors
     except Exception as e:
@@ -142,8 +254,12 @@ def get_report_queue() -> [Entity]:
     return queue_items
 
 
-def get_batch_queue() -> [Entity]:
-    """ Retrieve entire batch queue. """
+def get_batch_queue(limit: int) -> [Entity]:
+    """
+    Retrieve items ready to run from the batch queue.
+    :param limit: Maximum number of items to return.
+    :return: Queue items.
+    """
     global diag
 
     # Variables
@@ -153,21 +269,7 @@ def get_batch_queue() -> [Entity]:
 
     # Catch errors
     try:
-
-        # Retrieve items in batch queue (no filters needed)
-        table = "BatchQueue"
-        result = table_service.query_entities(table)
-
-        # Check for unprocessed items
-        for item in result:
-
-            # Check for items in "Queued" status
-            if item.Status.value == ve.ProcessingState.QUEUED.value:
-                queue_items.append(item)
-
-            # Check for expired reservation
-            elif safe_read(item.StartDT) < expired:
-                queue_items.append(item)
+        queue_items = query_queue("BatchQueue", expired, limit)
 
     # Handle errors
     except Exception as e:
@@ -222,6 +324,143 @@ def run_batch(queue_item: Entity, use_prod: bool, use_diag: bool):
     sys.stderr = sys_err
 
 
+def record_id(job: Job) -> str:
+    """ Report or batch ID of a job. """
+    return job.item.RowKey if job.kind == "batch" else job.item.ReportID
+
+
+def refresh_reservation(job: Job):
+    """
+    Move the queue reservation start time of a running job forward, so that the queue item is not released to another
+    worker while the job is still running. The first refresh is made after the worker has reserved the item.
+    :param job: Running job.
+    """
+    table = "BatchQueue" if job.kind == "batch" else "ReportQueue"
+    entity = {"PartitionKey": job.item.PartitionKey, "RowKey": job.item.RowKey, "StartDT": dt_to_ts(datetime.utcnow())}
+
+    # Catch errors
+    try:
+        table_service.merge_entity(table, entity)
+
+    # Queue item already removed by the worker
+    except AzureMissingResourceHttpError:
+        pass
+
+    # Handle errors
+    except Exception as e:
+        print("Warning: Unable to refresh queue reservation.", str(e))
+
+
+def watch_jobs():
+    """ Refresh queue reservations of running jobs, and cancel jobs that run past their deadline. """
+    now = time.time()
+    for job in pool:
+        if not job.process.is_alive():
+            continue
+
+        # Ask overrunning workers to record their log and exit
+        if job.cancelled is None and job.deadline and now > job.deadline:
+            print("Warning: Cancelling {} {} after {:.0f} seconds.".format(job.kind, record_id(job), now - job.start))
+            job.cancelled = now
+            job.process.terminate()
+
+        # Kill cancelled workers that don't exit
+        elif job.cancelled is not None and not job.killed and now - job.cancelled > KILL_GRACE:
+            print("Warning: Killing {} {}.".format(job.kind, record_id(job)))
+            job.killed = True
+            job.process.kill()
+
+        # Hold reservation until the job is cleared, including while cancelled
+        if now - job.heartbeat >= HEARTBEAT_INTERVAL:
+            job.heartbeat = now
+            refresh_reservation(job)
+
+
+def fail_job(job: Job):
+    """
+    Record a cancelled job as an error and remove its queue item so that it is not run again. The session log is stored
+    here when the worker did not store its own.
+    :param job: Cancelled job that has exited.
+    """
+
+    # Job details
+    if job.kind == "batch":
+        module, program, table, name = download_manager, ve.Programs.FILE_MAN, "Batches", "Download Manager"
+    else:
+        module, program, table, name = report_generator, ve.Programs.REPORT_GEN, "Reports", "Report Generator"
+    job_id = record_id(job)
+    em = ErrorManager(name, job.kind[0].upper() + str(job.process.pid), diag, ignore_crit=True)
+    em.record = em.filename = job_id
+    message = "{} exceeded its deadline and was cancelled".format(job.kind.capitalize())
+    em.log_error(program, ve.ErrorCat.PROCESS_ERROR, ve.ErrorSubCat.INTERNAL_ERROR, message, TimeoutError(message),
+                 error_level=ve.ErrorLevel.CRITICAL)
+
+    # Catch errors
+    try:
+
+        # Set record to error state and delete queue item
+        try:
+            entity = table_service.get_entity(table, job.item.PartitionKey, job_id)
+            module.set_error(em, table_service, entity, job.item)
+        except Exception as e:
+            message = "Unable to set cancelled {} record to error state".format(job.kind)
+            em.log_error(program, ve.ErrorCat.RECORD_ERROR, ve.ErrorSubCat.DB_ERROR, message, e)
+            module.del_queue(em, table_service, job.item)
+
+        # Write session log if the worker was killed before writing its own
+        if job.process.exitcode != CANCELLED_EXIT:
+            module.store_log(em, table_service, job_id)
+
+    # Handle errors
+    except Exception as e:
+        print("Error: Unable to record cancelled {} {}.".format(job.kind, job_id), str(e))
+
+
+def run_uploads(account: str, key: str):
+    """
+    Upload worker logs from the outbox until stopped.
+    :param account: Azure storage account name.
+    :param key: Azure storage account key.
+    """
+    uploader = LogUploader(TableService(account_name=account, account_key=key))
+    while True:
+
+        # Catch errors
+        try:
+            uploader.drain(wait=True)
+
+        # Handle errors
+        except Exception as e:
+            print(e)
+        time.sleep(1)
+
+
+def check_uploads():
+    """ Start the log upload process, or restart it if it stopped. """
+    global uploader_process
+    if uploader_process is None or not uploader_process.is_alive():
+        if uploader_process is not None:
+            print("Warning: Restarting log upload process.")
+        uploader_process = worker_context.Process(target=run_uploads, args=(credentials['account'], credentials['key']),
+                                                  daemon=True)
+        uploader_process.start()
+
+
+def preload():
+    """ Load resources shared by all jobs once, before any workers are started. """
+
+    # Version definitions
+    print("Loading version definitions")
+    versions = warm_definitions()
+    d_print("  Versions: {}".format(", ".join(versions)))
+
+    # Report fonts and images
+    print("Loading report resources")
+    load_fonts("")
+    count = preload_images("")
+    d_print("  Images: {}".format(count))
+
+
 def cleanup_files():
     """ Delete old log and temp files. """
 
@@ -276,13 +515,18 @@ def cleanup_files():
         else:
             print("  {0: <12} Keep".format(folder))
 
+    # Trim record cache, removing least recently used entries
+    print("Cleaning record cache...")
+    removed, size = record_cache.evict(cache_limit)
+    print("  {} files removed, {:.0f} of {} MB used".format(removed, size, cache_limit))
+
 
 # ----- MAIN LOOP ----- #
 
 def main():
     """ Main loop. """
     global settings, t, did_cleanup, cleanup_hour, last_run
-    global prod, diag, pool, process_count, frequency
+    global prod, diag, pool, process_count, frequency, max_interval, poll_interval, capacity, base_timeout
 
     # ----- Run Status Monitor ---- #
 
@@ -290,41 +534,81 @@ def main():
     try:
 
         # Check if run is needed
-        if datetime.utcnow() - last_run >= frequency:
+        if datetime.utcnow() - last_run >= poll_interval:
             start = datetime.utcnow()
             last_run = start
 
             # Clear completed threads
             remove = []
-            for worker in pool:
-                if not worker.is_alive():
-                    remove.append(worker)
-            for worker in remove:
-                worker.terminate()
-                pool.remove(worker)
+            for job in pool:
+                if not job.process.is_alive():
+                    remove.append(job)
+            for job in remove:
+                job.process.terminate()
+                if job.cancelled is not None and job.process.exitcode != 0:
+                    fail_job(job)
+                pool.remove(job)
+                capacity.finish(job)
                 gc.collect()
 
+            # Sample worker memory and CPU use
+            capacity.sample(pool)
+
             # Check for new reports in queue at specified frequency, run up to max threads
             # Batches are run first because they are shorter and their existence is predicated
             # On reports getting processes so they will not block report processing, while
             # the reverse could block batches entirely under high loads.
+            # Jobs are only started while their predicted memory fits.
             if len(pool) < process_count:
+                found = False
 
                 # Get batch queue
-                queue = get_batch_queue()
+                queue = get_batch_queue(process_count - len(pool))
+                found = found or len(queue) > 0
                 for item in queue:
-                    if len(pool) < process_count:
-                        p = Process(target=run_batch, args=(item, prod, diag))
+                    if capacity.admit(0, pool):
+                        p = worker_context.Process(target=run_batch, args=(item, prod, diag))
                         p.start()
-                        pool.append(p)
-
-                # Get report queue
-                queue = get_report_queue()
-                for item in queue:
-                    if len(pool) < process_count:
-                        p = Process(target=run_report, args=(item, prod, diag))
+                        pool.append(Job(p, item, "batch", timeout=job_timeout(base_timeout)))
+
+                # Get report queue, starting reports by expected cost and time waited
+                # Large reports may not use the slots reserved for small reports
+                if len(pool) < process_count:
+                    queue = get_report_queue(SCHEDULE_WINDOW)
+                    found = found or len(queue) > 0
+                    large_free = large_slots(process_count) - len([job for job in pool if job.large])
+                    for item, cost, large in scheduler.select(queue, process_count - len(pool), large_free):
+                        if not capacity.admit(cost, pool):
+                            break
+                        p = worker_context.Process(target=run_report, args=(item, prod, diag))
                         p.start()
-                        pool.append(p)
+                        pool.append(Job(p, item, "report", cost, job_timeout(base_timeout, cost), large))
+
+                # Check again soon when work is found, otherwise back off while idle
+                if found:
+                    poll_interval = frequency
+                else:
+                    poll_interval = min(poll_interval * IDLE_BACKOFF, max_interval)
+
+    # Handle errors
+    except Exception as e:
+        print(e)
+
+    # ----- Watchdog ---- #
+
+    # Refresh reservations and cancel overrunning jobs
+    try:
+        watch_jobs()
+
+    # Handle errors
+    except Exception as e:
+        print(e)
+
+    # ----- Log Uploads ---- #
+
+    # Keep background uploads of logs queued by workers running
+    try:
+        check_uploads()
 
     # Handle errors
     except Exception as e:
@@ -386,13 +670,16 @@ if __name__ == "__main__":
 
     # Ensure directories exist
     print("Checking directories")
-    for path in ["logs", "temp"]:
+    for path in ["logs", "temp", OUTBOX, record_cache.CACHE]:
         if not os.path.exists(path):
             os.mkdir(path)
 
     # Initial file cleanup
     cleanup_files()
 
+    # Preload shared resources so that forked workers start with them
+    preload()
+
     # Start main loop
     print("")
     print("--- Report Generator System Ready ---")
@@ -25,12 +25,13 @@ Monitor data graph.
         1.0.0.17 - 01/15/2020 - Expanded single samples to half sample resolution. Added thickness to cough dots.
         1.0.1.0  - 02/04/2020 - Added alternate Usage Timer section for VC models.
         1.0.1.1  - 02/09/2020 - Corrected cough trend value routing.
+        1.0.1.2  - 10/17/2026 - Usage timer events are fetched from the event index.
 
 """
 
 __author__ = "John Dorian for Sai Systems Technologies"
 __copyright__ = "Copyright 2019"
-__version__ = "1.0.1.1"
+__version__ = "1.0.1.2"
 
 # Built-in
 from enum import Enum
@@ -581,21 +582,20 @@ class UsageTimerGraph(Flowable):
         # o2_pm_due = ["---", "---"]
         o2_therapy = ["---", "---"]
         vpsa = ["---", "---"]
-        for event in d.events_all:
-            if event.id == "6022":
-                for val in event.values:
-                    if val.key == "12004":
-                        sys_pm_due = val.str.split(' ')
-                    elif val.key == "12001":
-                        sys_usage = val.str.split(' ')
-                    elif val.key == "12003":
-                        pump_use = val.str.split(' ')
-                    # elif val.key == "12005":
-                    #     o2_pm_due = val.str.split(' ')
-                    elif val.key == "14506":
-                        o2_therapy = val.str.split(' ')
-                    elif val.key == "12002":
-                        vpsa = val.str.split(' ')
+        for event in d.events_with_id("6022"):
+            for val in event.values:
+                if val.key == "12004":
+                    sys_pm_due = val.str.split(' ')
+                elif val.key == "12001":
+                    sys_usage = val.str.split(' ')
+                elif val.key == "12003":
+                    pump_use = val.str.split(' ')
+                # elif val.key == "12005":
+                #     o2_pm_due = val.str.split(' ')
+                elif val.key == "14506":
+                    o2_therapy = val.str.split(' ')
+                elif val.key == "12002":
+                    vpsa = val.str.split(' ')
 
         # Title
         c.setFont(s.Fonts.title, 14)
@@ -34,12 +34,13 @@ Event log report section.
         1.0.1.13 - 03/11/2020 - Standardized use of label filters.
         1.0.1.14 - 04/06/2020 - Added handling for insp. hold events.
         1.0.2.0  - 04/10/2020 - Removed handling for insp. hold events. (data type changed)
+        1.0.2.1  - 10/17/2026 - Events in report range are fetched from the event index.
 
 """
 
 __author__ = "John Dorian for Sai Systems Technologies"
 __copyright__ = "Copyright 2019"
-__version__ = "1.0.2.0"
+__version__ = "1.0.2.1"
 
 # Built-in libraries
 from datetime import datetime, timedelta
@@ -119,7 +120,8 @@ def event_log_section(em: ErrorManager, w_dir: str, doc: BaseDocTemplate, report
     # Generate lines
     line = 0
     lines = []
-    for event in data.events_all:
+    r_range = report.range
+    for event in data.events_in_range(r_range.data_start, r_range.end):
 
         # Skip unwanted events
         synthetic = "-" in event.id
@@ -127,10 +129,7 @@ def event_log_section(em: ErrorManager, w_dir: str, doc: BaseDocTemplate, report
         if no_display or event.id == "6022":
             continue
 
-        # Only include events in report range and sequence restrictions
-        r_range = report.range
-        if not r_range.data_start <= event.syn_time <= r_range.end:
-            continue
+        # Only include events in sequence restrictions
         if r_range.data_sequence and 0 < int(event.sequence) < int(r_range.data_sequence) and \
                 (event.id not in {eID.VENT_START, eID.THERAPY_START}):
             continue
@@ -29,12 +29,15 @@ PDF format with customizable sections.
         1.0.6.1 - 01/12/2020 - Created an explicit reference allocation so it can't be skipped.
         1.0.7.0 - 01/16/2020 - Consolidated time and data scans into one function. Added diagnostic lines.
         1.0.7.1 - 03/29/2020 - Return tar and data references.
+        1.0.7.2 - 10/17/2026 - Close TAR file handle when the report finishes.
+        1.0.8.0 - 10/17/2026 - Pass TAR content hash to the TAR manager for the record cache.
+        1.0.8.1 - 10/17/2026 - Pass record cache entry loaded by the report generator to the TAR manager.
 
 """
 
 __author__ = "John Dorian for Sai Systems Technologies"
 __copyright__ = "Copyright 2019"
-__version__ = "1.0.7.1"
+__version__ = "1.0.8.1"
 
 # Built-in
 from datetime import datetime
@@ -80,7 +83,8 @@ def _critical(em: ErrorManager):
     return crit
 
 
-def usage_report(em: ErrorManager, report: r.Report, temp_dir: str, data_file: str, diag: bool = False):
+def usage_report(em: ErrorManager, report: r.Report, temp_dir: str, data_file: str, diag: bool = False,
+                 content_hash: str = None, cache_entry: dict = None):
     """
     Create a usage report in PDF format.
     :param em: Error manager.
@@ -88,6 +92,8 @@ def usage_report(em: ErrorManager, report: r.Report, temp_dir: str, data_file: s
     :param temp_dir: Temporary working directory.
     :param data_file: Tar file name/path.
     :param diag: Raises errors immediately for diagnostics.
+    :param content_hash: SHA-256 of TAR file contents, used to save ingested records to the record cache.
+    :param cache_entry: Record cache entry to load instead of reading the TAR file.
     :return: Completed report path.
     """
     global START
@@ -125,7 +131,9 @@ def usage_report(em: ErrorManager, report: r.Report, temp_dir: str, data_file: s
         #   Load metadata, applicability, and labels based on initial VOCSN software version
         #   Read and validate presence of metadata in file
         #   Organize and index metadata
-        TarManager(em, data, report, DIR, temp_dir, data_file, orig_hash=None)
+        #   Load ingested records from the record cache entry if this export was read before
+        TarManager(em, data, report, DIR, temp_dir, data_file, orig_hash=None, content_hash=content_hash,
+                   cache_entry=cache_entry)
         tar = data.tar_manager
         if _critical(em):
             return out_file, tar, data
@@ -250,5 +258,10 @@ def usage_report(em: ErrorManager, report: r.Report, temp_dir: str, data_file: s
         message = "Caught top-level report error"
         em.log_error(ve.Programs.REPORTING, ve.ErrorCat.PROCESS_ERROR, ve.ErrorSubCat.INTERNAL_ERROR, message, e)
 
+    # Release TAR file handle
+    finally:
+        if tar:
+            tar.close()
+
     # Return file name
     return out_file, tar, data
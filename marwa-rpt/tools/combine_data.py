@@ -8,12 +8,13 @@ Consolidate all available data and return populated data containers.
         1.1.0.0  - 04/07/2020 - Rearranged files and changed the function of this file to return data container, not
                                 generate a report.
         1.1.0.1  - 04/13/2020 - Added flags to tell MVR modules to adjust behavior for combined log.
+        1.1.0.2  - 10/17/2026 - Close TAR file handle after reading log data.
 
 """
 
 __author__ = "John Dorian for Sai Systems Technologies"
 __copyright__ = "Copyright 2020"
-__version__ = "1.1.0.1"
+__version__ = "1.1.0.2"
 
 # Built-in modules
 import os
@@ -114,6 +115,7 @@ def combine_data(work_dir: str, temp_dir: str, data_file: str, diag: bool = Fals
     if diag:
         print("  Reading log data")
     _process_log_data(em, tar, vent_data, log_records)
+    tar.close()
 
     # Return data
     return log_records, vent_data
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+"""
+Compile version definitions into pre-indexed bundles. Provides a command line entry point for the build step.
+
+    Version Notes:
+        1.0.0.0 - 10/17/2026 - Created main with working directory option.
+
+"""
+
+__author__ = "John Dorian for Sai Systems Technologies"
+__copyright__ = "Copyright 2026"
+__version__ = "1.0.0.0"
+
+# Built-in
+import os
+import sys
+import argparse
+
+# Contextualize
+DIR = ".."
+sys.path.append(DIR)
+
+# VOCSN modules
+from modules.readers.definitions import compile_definitions
+
+
+if __name__ == "__main__":
+    """
+    Entry point from command line.
+
+    Optional Parameters:
+        w_dir      (str): Report generator directory containing "definitions" and "config". Default is parent directory.
+    """
+
+    # Define arguments and options
+    parser = argparse.ArgumentParser(prog="compile_definitions.py",
+                                     description="Compile metadata, label and settings definitions into versioned "
+                                                 "bundles.")
+    parser.add_argument('-w', '--w_dir', type=str, default=DIR, help="Report generator directory. Default: ..")
+
+    # Process arguments and options
+    a = parser.parse_args(sys.argv[1:])
+
+    # Check directory
+    if not os.path.exists(os.path.join(a.w_dir, "definitions")):
+        print("No definitions found in {}".format(os.path.abspath(a.w_dir)))
+        exit(1)
+
+    # Compile bundles
+    for fn in compile_definitions(a.w_dir):
+        print("Compiled {}".format(fn))